@@ -1,16 +1,131 @@
+import argparse
 import json
-import re
-from collections import defaultdict
+import os
+from collections import OrderedDict
 from typing import List, Dict, Any
 
+import numpy as np
+
+from job_archive import ARCHIVE_FILE, JobArchive
+from job_record import Job, load_records
+from job_store import STORE_FILE, TEXT_FILE, load_full_texts, posting_id
+from keyword_index import INDEX_FILE, KeywordIndex
+from ranking_cache import RANKINGS_FILE, RankingCache
+from search_index import SEARCH_FILE, SearchIndex
+from scoring import (
+    INTEREST_CATEGORIES, INDEX_KEYWORDS, HOURS_OPTIONS, PAY_OPTIONS, TYPE_OPTIONS, EXPERIENCE_OPTIONS,
+    JobFeatures, score_job, score_jobs
+)
+from similarity_index import NEIGHBORS_FILE, SimilarJobsIndex
+
+# Recent preference sets whose scores and ranking are kept for paging
+RANKING_CACHE_SIZE = 16
+
+
 class JobRecommender:
-    def __init__(self, jobs_file='brown_jobs_2025_final.json'):
-        with open(jobs_file, 'r') as f:
-            data = json.load(f)
-        self.jobs = data['jobs']
-        self.departments = list(set(job.get('department', '') for job in self.jobs))
-        self.departments.sort()
+    def __init__(self, jobs_file=STORE_FILE):
+        # Full posting text lives in a separate file and is only read when asked for
+        self.text_file = os.path.join(os.path.dirname(jobs_file), TEXT_FILE)
+        self._full_texts = None
+        
+        if os.path.basename(jobs_file) == ARCHIVE_FILE:
+            # Records stay on disk and are read as results are shown
+            self.jobs = JobArchive(jobs_file)
+            self.departments = set(department or '' for department in self.jobs.values['department'])
+            if (self.jobs.records['department'] < 0).any():
+                self.departments.add('')
+            self.departments = sorted(self.departments)
+            self.features = self.jobs.features()
+            self.keyword_index = self.features.keyword_index
+            self._rows = self.jobs.rows
+        else:
+            data = load_records(jobs_file)
+            self.jobs = data['jobs']
+            self.departments = list(set(job.department or '' for job in self.jobs))
+            self.departments.sort()
+            
+            index_file = os.path.join(os.path.dirname(jobs_file), INDEX_FILE)
+            self.keyword_index = KeywordIndex.for_jobs(self.jobs, INDEX_KEYWORDS, index_file)
+            self.features = JobFeatures(self.jobs, self.keyword_index)
+            self._rows = {id(job): i for i, job in enumerate(self.jobs)}
+        
+        # Base scores per questionnaire answer, from the saved cache or built as answers come in
+        self.ranking_cache = RankingCache(self.features)
+        if not isinstance(self.jobs, JobArchive):
+            self.ranking_cache.load(os.path.join(os.path.dirname(jobs_file), RANKINGS_FILE))
+        self._rankings = OrderedDict()
+        
+        # Similar-jobs engine is built on first use
+        self.neighbors_file = os.path.join(os.path.dirname(jobs_file), NEIGHBORS_FILE)
+        self.similar_index = None
+        
+        # Full-text search index is loaded (and brought up to date) on first search
+        self.search_file = os.path.join(os.path.dirname(jobs_file), SEARCH_FILE)
+        self.search_index = None
+        self._posting_rows = None
+    
+    def score_jobs(self, preferences: Dict[str, Any]) -> np.ndarray:
+        """Match percentage of every job, as defined by the scoring spec"""
+        return score_jobs(self.features, preferences)
+    
+    def top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k best scores, ties kept in job order like a stable sort"""
+        n = len(scores)
+        if k >= n:
+            chosen = np.arange(n)
+        elif k <= 0:
+            return np.arange(0)
+        else:
+            kth = scores[np.argpartition(-scores, k - 1)[:k]].min()
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[:k - len(above)]
+            chosen = np.concatenate([above, ties])
+        return chosen[np.lexsort((chosen, -scores[chosen]))]
+    
+    def get_full_text(self, job: Job) -> str:
+        if job.full_text is not None:
+            return job.full_text
+        if isinstance(self.jobs, JobArchive):
+            row = self._rows.get(id(job))
+            if row is None:
+                row = self.posting_rows().get(posting_id(job.url))
+            return self.jobs.full_text(row) if row is not None else ''
+        if self._full_texts is None:
+            texts = load_full_texts(self.text_file)
+            self._full_texts = {id(j): text for j, text in zip(self.jobs, texts)}
+        return self._full_texts.get(id(job), '')
+    
+    def posting_rows(self) -> Dict[str, int]:
+        """Row of every posting ID, the first one if a posting is listed twice"""
+        if self._posting_rows is None:
+            pids = self.features.posting_ids
+            self._posting_rows = {}
+            for row, pid in enumerate(pids):
+                self._posting_rows.setdefault(pid, row)
+        return self._posting_rows
+    
+    def search(self, query: str, num_results: int = 10) -> List[Dict[str, Any]]:
+        """Free-text search over titles, descriptions and full text, best BM25 match first"""
+        if self.search_index is None:
+            self.search_index = SearchIndex.for_jobs(self.jobs, self.search_file, self.get_full_text)
         
+        rows = self.posting_rows()
+        return [
+            {'score': score, 'job': self.jobs[rows[pid]]}
+            for pid, score in self.search_index.search(query, num_results)
+            if pid in rows
+        ]
+    
+    def display_search_results(self, query: str, results: List[Dict[str, Any]]):
+        print(f"\n🔎 {len(results)} RESULTS FOR '{query}'")
+        print("=" * 60)
+        for i, result in enumerate(results, 1):
+            job = result['job']
+            print(f"{i}. {job.get('job_title', 'Unknown Title')} (relevance {result['score']:.1f})")
+            print(f"   {job.get('department', 'Unknown Department')}")
+            print(f"   {job.get('scheduled_weekly_hours', '?')} hrs/week, {job.get('hourly_range', 'Pay TBD')}")
+            print(f"   {job.get('url', '')}")
+    
     def ask_preferences(self):
         print("🎯 BROWN JOB FINDER - Let's find your perfect job!")
         print("=" * 55)
@@ -18,74 +133,28 @@ class JobRecommender:
         
         preferences = {}
         print("1. How many hours per week do you want to work?")
-        print("   a) Light commitment (1-8 hours)")
-        print("   b) Moderate commitment (9-15 hours)")  
-        print("   c) Heavy commitment (16+ hours)")
-        print("   d) I'm flexible")
+        for letter, _, label, _ in HOURS_OPTIONS:
+            print(f"   {letter}) {label}")
         
         hours_choice = input("\nYour choice (a/b/c/d): ").lower().strip()
-        hours_map = {
-            'a': (1, 8), 'b': (9, 15), 'c': (16, 40), 'd': (0, 40)
-        }
+        hours_map = {letter: hours_range for letter, _, _, hours_range in HOURS_OPTIONS}
         preferences['hours_range'] = hours_map.get(hours_choice, (0, 40))
         print("\n2. What's your preferred hourly pay range?")
-        print("   a) Budget-friendly ($15-16/hr)")
-        print("   b) Fair wage ($16-17/hr)")
-        print("   c) Premium pay ($17+/hr)")
-        print("   d) Pay doesn't matter")
+        for letter, _, label, _ in PAY_OPTIONS:
+            print(f"   {letter}) {label}")
         
         pay_choice = input("\nYour choice (a/b/c/d): ").lower().strip()
-        pay_map = {
-            'a': (15, 16), 'b': (16, 17), 'c': (17, 25), 'd': (0, 25)
-        }
+        pay_map = {letter: pay_range for letter, _, _, pay_range in PAY_OPTIONS}
         preferences['pay_range'] = pay_map.get(pay_choice, (0, 25))
         print("\n3. What type of work interests you most?")
-        print("   a) Research (labs, data analysis, experiments)")
-        print("   b) Teaching/Tutoring (helping other students)")
-        print("   c) Administrative (office work, organization)")
-        print("   d) Technical/IT (computers, web, software)")
-        print("   e) Creative/Library (writing, media, books)")
-        print("   f) I'm open to anything")
+        for letter, _, label, _ in TYPE_OPTIONS:
+            print(f"   {letter}) {label}")
         
         type_choice = input("\nYour choice (a/b/c/d/e/f): ").lower().strip()
-        type_map = {
-            'a': 'research', 'b': 'teaching', 'c': 'administrative', 
-            'd': 'technical', 'e': 'creative', 'f': 'any'
-        }
+        type_map = {letter: job_type for letter, _, _, job_type in TYPE_OPTIONS}
         preferences['job_type'] = type_map.get(type_choice, 'any')
         print("\n4. What academic areas interest you? (Select multiple)")
         
-        interest_categories = {
-            "STEM & Sciences": {
-                'a': ['biology', 'life sciences', 'neuroscience'],
-                'b': ['chemistry', 'chemical'],
-                'c': ['physics', 'astronomy'],
-                'd': ['computer science', 'computational'],
-                'e': ['engineering', 'applied'],
-                'f': ['mathematics', 'statistics'],
-                'g': ['earth', 'environmental', 'planetary'],
-                'h': ['medicine', 'health', 'medical']
-            },
-            "Social Sciences & Humanities": {
-                'i': ['psychology', 'cognitive'],
-                'j': ['history', 'historical'],
-                'k': ['english', 'literature', 'writing'],
-                'l': ['philosophy', 'religious'],
-                'm': ['sociology', 'anthropology'],
-                'n': ['political science', 'international'],
-                'o': ['economics', 'business'],
-                'p': ['art', 'visual arts', 'studio'],
-                'q': ['music', 'theatre', 'performing']
-            },
-            "Professional & Applied": {
-                'r': ['education', 'teaching'],
-                's': ['public health', 'community'],
-                't': ['library', 'information'],
-                'u': ['athletics', 'sports', 'recreation'],
-                'v': ['administration', 'student services'],
-                'w': ['research', 'institute', 'center']
-            }
-        }
         
         print("\n   📚 STEM & Sciences:")
         print("      a) Biology/Life Sciences    b) Chemistry           c) Physics/Astronomy")
@@ -107,124 +176,45 @@ class JobRecommender:
         dept_keywords = []
         if 'x' not in selected_interests:
             selections = [s.strip() for s in selected_interests.split(',') if s.strip()]
-            for category in interest_categories.values():
+            for category in INTEREST_CATEGORIES.values():
                 for letter, keywords in category.items():
                     if letter in selections:
                         dept_keywords.extend(keywords)
         
         preferences['department_keywords'] = dept_keywords
         print("\n5. What's your experience level?")
-        print("   a) Beginner (new to work/research)")
-        print("   b) Some experience (done similar work before)")
-        print("   c) Experienced (confident in my abilities)")
+        for letter, _, label, _ in EXPERIENCE_OPTIONS:
+            print(f"   {letter}) {label}")
         
         exp_choice = input("\nYour choice (a/b/c): ").lower().strip()
         preferences['experience_level'] = exp_choice
         
         return preferences
     
-    def calculate_job_score(self, job: Dict[str, Any], preferences: Dict[str, Any]) -> float:
-        score = 0
-        max_score = 0
-        hours_weight = 25
-        max_score += hours_weight
-        try:
-            job_hours = int(job.get('scheduled_weekly_hours', '0'))
-            pref_min, pref_max = preferences['hours_range']
-            if pref_min <= job_hours <= pref_max:
-                score += hours_weight
-            elif job_hours < pref_min:
-                penalty = min(hours_weight, (pref_min - job_hours) * 3)
-                score += max(0, hours_weight - penalty)
-            else:
-                penalty = min(hours_weight, (job_hours - pref_max) * 2)
-                score += max(0, hours_weight - penalty)
-        except:
-            score += hours_weight * 0.5
-        
-        pay_weight = 20
-        max_score += pay_weight
-        hourly_range = job.get('hourly_range', '$0 - $0')
-        match = re.search(r'\$(\d+(?:\.\d+)?)', hourly_range)
-        if match:
-            job_min_pay = float(match.group(1))
-            pref_min_pay, pref_max_pay = preferences['pay_range']
-            if pref_min_pay <= job_min_pay <= pref_max_pay:
-                score += pay_weight
-            else:
-                distance = min(abs(job_min_pay - pref_min_pay), abs(job_min_pay - pref_max_pay))
-                score += max(0, pay_weight - (distance * 5))
-        else:
-            score += pay_weight * 0.5
-        
-        type_weight = 30
-        max_score += type_weight
-        job_title = job.get('job_title', '').lower()
-        job_desc = job.get('job_description', '').lower()
-        pref_type = preferences['job_type']
-        
-        if pref_type == 'any':
-            score += type_weight * 0.7
-        else:
-            type_keywords = {
-                'research': ['research', 'ra ', 'lab', 'experiment', 'data', 'analysis'],
-                'teaching': ['teaching', 'tutor', 'ta ', 'grader', 'mentor', 'peer'],
-                'administrative': ['admin', 'assistant', 'coordinator', 'clerk', 'office'],
-                'technical': ['tech', 'it', 'computer', 'web', 'software', 'digital'],
-                'creative': ['library', 'writing', 'media', 'creative', 'design', 'art']
-            }
-            
-            keywords = type_keywords.get(pref_type, [])
-            matches = sum(1 for keyword in keywords if keyword in job_title or keyword in job_desc)
-            if matches > 0:
-                score += type_weight * min(1.0, matches * 0.4)
-            else:
-                score += type_weight * 0.2
-        
-        dept_weight = 15
-        max_score += dept_weight
-        job_dept = job.get('department', '').lower()
-        dept_keywords = preferences['department_keywords']
+    def calculate_job_score(self, job: Job, preferences: Dict[str, Any]) -> float:
+        return float(score_job(job, preferences))
+    
+    def rank(self, preferences: Dict[str, Any], k: int):
+        """Scores and the k best rows, reusing recent rankings so paging never rescores"""
+        key = json.dumps(preferences, sort_keys=True)
+        cached = self._rankings.pop(key, None)
         
-        if not dept_keywords:
-            score += dept_weight * 0.7
+        if cached is None:
+            ranked, scores = self.ranking_cache.top_k(preferences, k)
         else:
-            matches = sum(1 for keyword in dept_keywords if keyword in job_dept)
-            if matches > 0:
-                score += dept_weight
-            else:
-                score += dept_weight * 0.3
-        
-        exp_weight = 10
-        max_score += exp_weight
-        exp_level = preferences.get('experience_level', 'b')
-        desc_text = (job.get('job_description', '') + ' ' + job.get('job_title', '')).lower()
+            scores, ranked = cached
+            if len(ranked) < min(k, len(scores)):
+                ranked = self.top_k(scores, k)
         
-        if exp_level == 'a':
-            if any(word in desc_text for word in ['entry', 'beginner', 'training', 'learn']):
-                score += exp_weight
-            elif any(word in desc_text for word in ['experience required', 'advanced', 'expert']):
-                score += exp_weight * 0.3
-            else:
-                score += exp_weight * 0.7
-        elif exp_level == 'c':
-            if any(word in desc_text for word in ['advanced', 'independent', 'leadership', 'manage']):
-                score += exp_weight
-            else:
-                score += exp_weight * 0.8
-        else:
-            score += exp_weight * 0.8
-        return (score / max_score) * 100 if max_score > 0 else 0
+        self._rankings[key] = (scores, ranked)
+        if len(self._rankings) > RANKING_CACHE_SIZE:
+            self._rankings.popitem(last=False)
+        return scores, ranked[:k]
     
     def get_recommendations(self, preferences: Dict[str, Any], num_recommendations: int = 10) -> List[Dict[str, Any]]:
-        scored_jobs = []
-        
-        for job in self.jobs:
-            score = self.calculate_job_score(job, preferences)
-            scored_jobs.append((score, job))
-        scored_jobs.sort(key=lambda x: x[0], reverse=True)
+        scores, top = self.rank(preferences, num_recommendations)
         
-        return [{'score': score, 'job': job} for score, job in scored_jobs[:num_recommendations]]
+        return [{'score': float(scores[i]), 'job': self.jobs[i]} for i in top]
     
     def display_recommendations(self, recommendations: List[Dict[str, Any]]):
         print(f"\n🌟 YOUR TOP {len(recommendations)} JOB RECOMMENDATIONS")
@@ -248,43 +238,19 @@ class JobRecommender:
             if i < len(recommendations):
                 print("-" * 40)
     
-    def find_similar_jobs(self, selected_job: Dict[str, Any], num_similar: int = 5) -> List[Dict[str, Any]]:
-        selected_dept = selected_job.get('department', '')
-        selected_title = selected_job.get('job_title', '').lower()
-        selected_hours = selected_job.get('scheduled_weekly_hours', '0')
+    def find_similar_jobs(self, selected_job: Job, num_similar: int = 5) -> List[Job]:
+        if self.similar_index is None:
+            self.similar_index = SimilarJobsIndex(self.jobs)
+            self.similar_index.load_neighbors(self.neighbors_file)
         
-        similar_jobs = []
+        row = self._rows.get(id(selected_job))
+        if row is None:
+            selected_id = Job.coerce(selected_job).id
+            row = next((i for i, job in enumerate(self.jobs) if job.id == selected_id), None)
+            if row is None or selected_id is None:
+                return []
         
-        for job in self.jobs:
-            if job == selected_job:
-                continue
-                
-            similarity_score = 0
-            
-            if job.get('department', '') == selected_dept:
-                similarity_score += 40
-            
-            job_title = job.get('job_title', '').lower()
-            title_words = set(selected_title.split())
-            job_title_words = set(job_title.split())
-            common_words = title_words.intersection(job_title_words)
-            similarity_score += len(common_words) * 10
-            try:
-                job_hours = int(job.get('scheduled_weekly_hours', '0'))
-                selected_hours_int = int(selected_hours)
-                hour_diff = abs(job_hours - selected_hours_int)
-                if hour_diff <= 2:
-                    similarity_score += 20
-                elif hour_diff <= 5:
-                    similarity_score += 10
-            except:
-                pass
-            
-            if similarity_score > 20:
-                similar_jobs.append((similarity_score, job))
-        similar_jobs.sort(key=lambda x: x[0], reverse=True)
-        
-        return [job for score, job in similar_jobs[:num_similar]]
+        return [self.jobs[i] for i in self.similar_index.query(row, num_similar)]
     
     def interactive_session(self):
         preferences = self.ask_preferences()
@@ -298,13 +264,18 @@ class JobRecommender:
             print("2. Find jobs similar to one above (enter job number)")
             print("3. Adjust preferences")
             print("4. Exit")
+            print("Or search all postings: s <words>  (e.g. 's marine biology lab')")
             
             choice = input("\nWhat would you like to do? ").strip()
             
-            if choice == '1':
+            if choice.lower().startswith('s '):
+                query = choice[2:].strip()
+                self.display_search_results(query, self.search(query))
+            
+            elif choice == '1':
                 recommendations = self.get_recommendations(preferences, 20)
                 self.display_recommendations(recommendations[10:])
-                
+            
             elif choice.isdigit():
                 job_num = int(choice) - 1
                 if 0 <= job_num < len(recommendations):
@@ -324,26 +295,33 @@ class JobRecommender:
                         print("No similar jobs found.")
                 else:
                     print("Invalid job number.")
-                    
+            
             elif choice == '3':
                 preferences = self.ask_preferences()
-                
+            
             elif choice == '4':
                 print("\n👋 Good luck with your job search!")
                 break
-                
+            
             else:
                 print("Invalid choice. Please try again.")
 
-def main():
+def main(query=None):
     try:
-        recommender = JobRecommender()
-        recommender.interactive_session()
+        # The archive opens in the same time however many jobs it holds
+        recommender = JobRecommender(ARCHIVE_FILE if os.path.exists(ARCHIVE_FILE) else STORE_FILE)
+        if query:
+            recommender.display_search_results(query, recommender.search(query))
+        else:
+            recommender.interactive_session()
     except FileNotFoundError:
-        print("❌ Error: brown_jobs_2025_final.json not found!")
+        print(f"❌ Error: {STORE_FILE} not found!")
+        print("Build it with: python job_store.py brown_jobs_2025_final.json")
         print("Make sure the file is in the same directory as this script.")
     except Exception as e:
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Find Brown student jobs that fit you")
+    parser.add_argument("--search", metavar="WORDS", help="search every posting for these words instead of the questionnaire")
+    main(parser.parse_args().search)
\ No newline at end of file
@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import time
+
+from brown_job_finder import JobRecommender
+from job_store import STORE_FILE
+from scoring import TYPE_KEYWORDS, INTEREST_CATEGORIES, INTEREST_NAMES, TYPE_OPTIONS
+
+CATEGORIZED_FILE = 'brown_jobs_categorized.json'
+
+# Bucket names follow the questionnaire options in scoring.py. Hours come from
+# the typed weekly_hours, so datasets re-extracted since reextract.py put
+# 2.5 and 37.5 hour postings in Light and Heavy; the original file counted
+# them as unknown (bundled data: Light 87 -> 88, Heavy 3 -> 7, Unknown 6 -> 1).
+HOURS_BUCKETS = [
+    ('Light commitment (1-8 hours)', 1, 8),
+    ('Moderate commitment (9-15 hours)', 9, 15),
+    ('Heavy commitment (16+ hours)', 16, float('inf'))
+]
+UNKNOWN_HOURS = 'Flexible/Unknown hours'
+
+PAY_BUCKETS = [
+    ('Budget-friendly ($15-16/hr)', float('-inf'), 16),
+    ('Fair wage ($16-17/hr)', 16, 17),
+    ('Premium pay ($17+/hr)', 17, float('inf'))
+]
+UNKNOWN_PAY = 'Pay not specified'
+
+TYPE_BUCKETS = {job_type: label for _, _, label, job_type in TYPE_OPTIONS if job_type != 'any'}
+OTHER_TYPE = 'Other work types'
+
+GENERAL_INTEREST = 'Interdisciplinary/General'
+
+QUESTIONS = {
+    'Q1: Hours Commitment': [name for name, _, _ in HOURS_BUCKETS] + [UNKNOWN_HOURS],
+    'Q2: Pay Preference': [name for name, _, _ in PAY_BUCKETS] + [UNKNOWN_PAY],
+    'Q3: Work Type': list(TYPE_BUCKETS.values()) + [OTHER_TYPE],
+    'Q4: Academic Interests': [
+        f"{category} - {INTEREST_NAMES[letter][1]}"
+        for category, letters in INTEREST_CATEGORIES.items() for letter in letters
+    ] + [GENERAL_INTEREST]
+}
+
+
+def job_summary(job):
+    """The fields a bucket listing shows for one job"""
+    return {
+        'title': job.get('job_title', ''),
+        'department': job.get('department', ''),
+        'hours': job.get('scheduled_weekly_hours', ''),
+        'pay': job.get('hourly_range', ''),
+        'location': job.get('location', ''),
+        'url': job.get('url', ''),
+        'index': job.get('index')
+    }
+
+
+def categorize(recommender):
+    """
+    Put every job into all of its Q1-Q4 buckets in one pass over the jobs
+
+    Hours, pay and work type come from the features JobRecommender already
+    parsed; academic interests match the department against the
+    questionnaire keywords, once per distinct department.
+    """
+    buckets = {question: {name: [] for name in names} for question, names in QUESTIONS.items()}
+    hours_buckets = buckets['Q1: Hours Commitment']
+    pay_buckets = buckets['Q2: Pay Preference']
+    type_buckets = buckets['Q3: Work Type']
+    interest_buckets = buckets['Q4: Academic Interests']
+    
+    features = recommender.features
+    hours = features.hours.tolist()
+    hours_valid = features.hours_valid.tolist()
+    min_pay = features.min_pay.tolist()
+    pay_valid = features.pay_valid.tolist()
+    type_hits = {pref_type: (matches > 0).tolist() for pref_type, matches in features.type_matches.items()}
+    
+    interests_by_department = {}
+    
+    for row, department in enumerate(features.job_departments):
+        if hours_valid[row]:
+            name = next((name for name, low, high in HOURS_BUCKETS if low <= hours[row] <= high), UNKNOWN_HOURS)
+        else:
+            name = UNKNOWN_HOURS
+        hours_buckets[name].append(row)
+        
+        if pay_valid[row]:
+            name = next(name for name, low, high in PAY_BUCKETS if low <= min_pay[row] < high)
+        else:
+            name = UNKNOWN_PAY
+        pay_buckets[name].append(row)
+        
+        matched_type = False
+        for pref_type in TYPE_KEYWORDS:
+            if type_hits[pref_type][row]:
+                type_buckets[TYPE_BUCKETS[pref_type]].append(row)
+                matched_type = True
+        if not matched_type:
+            type_buckets[OTHER_TYPE].append(row)
+        
+        if department not in interests_by_department:
+            interests_by_department[department] = [
+                f"{category} - {INTEREST_NAMES[letter][1]}"
+                for category, letters in INTEREST_CATEGORIES.items()
+                for letter, keywords in letters.items()
+                if any(keyword in department for keyword in keywords)
+            ] or [GENERAL_INTEREST]
+        for name in interests_by_department[department]:
+            interest_buckets[name].append(row)
+    
+    return buckets
+
+
+def build_categorized(recommender):
+    """Shared job table plus every bucket as a list of rows into it"""
+    buckets = categorize(recommender)
+    return {
+        'metadata': {
+            'total_jobs': len(recommender.jobs),
+            'analysis_date': time.strftime('%Y-%m-%d'),
+            'note': 'Jobs categorized by 4 questionnaire questions - overlapping groups allowed. '
+                    'Bucket job IDs are positions in the jobs list.'
+        },
+        'jobs': [job_summary(job) for job in recommender.jobs],
+        'question_based_categories': {
+            question: {name: {'count': len(rows), 'jobs': rows} for name, rows in question_buckets.items()}
+            for question, question_buckets in buckets.items()
+        }
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate the questionnaire categories for the job dataset")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    parser.add_argument("--out", help=f"output path (default: {CATEGORIZED_FILE} next to source)")
+    args = parser.parse_args()
+    
+    out = args.out or os.path.join(os.path.dirname(args.source), CATEGORIZED_FILE)
+    old_size = os.path.getsize(out) if os.path.exists(out) else None
+    
+    start = time.perf_counter()
+    recommender = JobRecommender(args.source)
+    load_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    categorized = build_categorized(recommender)
+    categorize_time = time.perf_counter() - start
+    
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(categorized, f, ensure_ascii=False, separators=(',', ':'))
+    
+    print(f"Loaded {len(recommender.jobs)} jobs in {load_time*1000:.0f} ms")
+    print(f"Categorized in {categorize_time*1000:.1f} ms -> {out} ({os.path.getsize(out)/1024:.0f} KB)")
+    if old_size:
+        print(f"  Previous file: {old_size/1024:.0f} KB")
+    for question, question_buckets in categorized['question_based_categories'].items():
+        print(f"\n{question}")
+        for name, bucket in question_buckets.items():
+            print(f"  {name}: {bucket['count']}")
@@ -1,5 +1,10 @@
+import argparse
 import json
+import queue
+import threading
 import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -7,206 +12,927 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 
+from http_fetcher import SessionExpired
+from job_extractor import extract_fields
+from job_record import Job
+from job_store import posting_id
+from resource_blocking import DEFAULT_BLOCK, enable_blocking
+from scrape_journal import ScrapeJournal
+from scrape_metrics import ScrapeMetrics
+from scrape_pipeline import ScrapePipeline
+from workday_waits import AdaptiveWaiter
+
+WORKDAY_URL = "https://wd5.myworkday.com/brown"
+TASK_MARKER = "1422$7750"
+LOGIN_URL = WORKDAY_URL + "/login.flex"
+TASK_URL = WORKDAY_URL + "/d/task/" + TASK_MARKER + ".htmld"
+LISTING_SELECTOR = "div[data-automation-id='promptOption']"
+SEARCH_SELECTOR = "input[data-automation-id='searchBox']"
+SEARCH_TERM = "2025"
+
+# Page text Workday shows once a session has timed out
+SESSION_EXPIRED_MARKERS = ("session has expired", "session expired", "signed out")
+
+# Identifies a listing row across scrolls and re-renders: its aria-posinset,
+# the position a virtualized list keeps on each row, else its link target,
+# else its order among the rendered rows. Never its text, which different
+# postings with the same title share.
+ROW_KEY_JS = """
+function rowKey(row, position) {
+    const option = row.closest('[aria-posinset]');
+    if (option) return 'pos:' + (Number(option.getAttribute('aria-posinset')) - 1);
+    const link = row.closest('a[href]') || row.querySelector('a[href]');
+    if (link) return 'url:' + link.href;
+    return 'pos:' + position;
+}
+
+function listingRows(selector) {
+    const header = document.querySelector(selector);
+    return Array.from(document.querySelectorAll(selector)).filter(row => row !== header);
+}
+
+function rowPreview(row) {
+    return (row.innerText || '').trim().slice(0, 50);
+}
+
+// back() can restore the list scrolled halfway, with the rows above unmounted
+function scrollListingToTop(selector) {
+    const row = listingRows(selector)[0];
+    for (let el = row && row.parentElement; el; el = el.parentElement) {
+        if (el.scrollTop) el.scrollTop = 0;
+    }
+    window.scrollTo(0, 0);
+}
+"""
+
+# Scrolls the listing from the top and collects every row's key, position,
+# preview text and link target in the page, calling back once with the whole
+# snapshot. Rows are kept by key as they render, so rows the list unmounts
+# again still count. The position is the row's aria-posinset where the list
+# has one, else the order the rows appeared in from the top.
+HARVEST_SCRIPT = ROW_KEY_JS + """
+const [selector, target, idleMs, maxMs, done] = arguments;
+const seen = new Map();
+const deadline = Date.now() + maxMs;
+let idleRounds = 0;
+
+function collect() {
+    let added = 0;
+    listingRows(selector).forEach((row, position) => {
+        const key = rowKey(row, position);
+        if (!seen.has(key)) {
+            const link = row.closest('a[href]') || row.querySelector('a[href]');
+            const option = row.closest('[aria-posinset]');
+            seen.set(key, {
+                key: key,
+                position: option ? Number(option.getAttribute('aria-posinset')) - 1 : seen.size,
+                preview: rowPreview(row),
+                url: link ? link.href : null
+            });
+            added++;
+        }
+    });
+    return added;
+}
+
+function finish() {
+    done(Array.from(seen.values()));
+}
+
+function step() {
+    if (seen.size >= target || Date.now() > deadline) return finish();
+    const rows = listingRows(selector);
+    if (rows.length) rows[rows.length - 1].scrollIntoView({block: 'end'});
+    window.scrollTo(0, document.body.scrollHeight);
+    
+    const scrolledAt = Date.now();
+    (function poll() {
+        if (collect() > 0) {
+            idleRounds = 0;
+            return setTimeout(step, 0);
+        }
+        if (Date.now() - scrolledAt < idleMs) return setTimeout(poll, 50);
+        // A few scrolls in a row without new rows means the end of the list
+        if (++idleRounds >= 3) return finish();
+        step();
+    })();
+}
+
+scrollListingToTop(selector);
+collect();
+step();
+"""
+
+# Finds the listing row with a harvested key, looking where the list is first,
+# then from the top down until it renders, and calls back with it and its
+# preview text, or null after maxMs
+ROW_SCRIPT = ROW_KEY_JS + """
+const [selector, key, maxMs, done] = arguments;
+const deadline = Date.now() + maxMs;
+let fromTop = false;
+
+(function find() {
+    const rows = listingRows(selector);
+    const row = rows.find((row, position) => rowKey(row, position) === key);
+    if (row) {
+        row.scrollIntoView(true);
+        return done([row, rowPreview(row)]);
+    }
+    if (Date.now() > deadline) return done(null);
+    if (!fromTop) {
+        scrollListingToTop(selector);
+        fromTop = true;
+    } else {
+        if (rows.length) rows[rows.length - 1].scrollIntoView({block: 'end'});
+        window.scrollTo(0, document.body.scrollHeight);
+    }
+    setTimeout(find, 100);
+})();
+"""
+
+def posting_key(url):
+    """What identifies a posting across listing reloads: its Workday ID, else its URL"""
+    return posting_id(url) or url
+
+
+def plan_incremental(previous, links):
+    """
+    Compare a fresh listing snapshot against the previous scrape
+    
+    Returns (to_fetch, carried, removed): links whose posting is new or whose
+    preview changed, previous job records still listed (re-indexed), and
+    tombstones for postings that are no longer listed.
+    """
+    previous_jobs = {posting_id(job.get('url')): job for job in previous.get('jobs', [])}
+    listed = set()
+    to_fetch = []
+    carried = []
+    
+    for link in links:
+        job_id = posting_id(link['url'])
+        listed.add(job_id)
+        old = previous_jobs.get(job_id)
+        
+        if old is None or old.get('preview', '') != link['preview']:
+            to_fetch.append(link)
+        else:
+            job = Job.from_dict(old)
+            job.index = link['index']
+            carried.append(job)
+    
+    now = datetime.now().isoformat()
+    removed = [job for job in previous.get('removed_jobs', []) if job['posting_id'] not in listed]
+    for job_id, job in previous_jobs.items():
+        if job_id is not None and job_id not in listed:
+            removed.append({
+                'posting_id': job_id,
+                'url': job.get('url'),
+                'job_title': job.get('job_title'),
+                'scraped_at': job.get('scraped_at'),
+                'removed_at': now
+            })
+    
+    return to_fetch, carried, removed
+
+
 class BatchWorkdayScraper:
-    def __init__(self):
-        """Initialize the scraper"""
+    def __init__(self, journal=None, headless=False, base_url=WORKDAY_URL, metrics=None, extract_workers=2,
+                 queue_size=16, block=()):
+        """
+        Initialize the scraper
+        
+        Args:
+            journal: ScrapeJournal that receives every scraped job
+            headless: run Chrome without a window
+            base_url: Workday tenant URL, e.g. a local replay server for benchmarks
+            metrics: ScrapeMetrics to record into, shared with parallel workers
+            extract_workers: threads that extract and store pages while the browser moves on
+            queue_size: captured pages allowed to wait for them before the browser blocks
+            block: resource_blocking categories to stop loading, e.g. DEFAULT_BLOCK
+        """
         self.jobs_data = []
+        self.removed_jobs = []
+        self.journal = journal
+        self.extract_workers = extract_workers
+        self.queue_size = queue_size
+        self.pipeline = None
+        # Rows in the listing, once a harvest has reached its end
+        self.listing_size = None
+        # The last harvest, and the index recorded for a row position where it
+        # isn't position + 1 because postings closed mid-run
+        self.listing_rows = []
+        self.row_indices = {}
+        # Postings that could not be scraped, listing index -> URL if known
+        self.failed = {}
+        self._processed = set()
+        self._indices = {}
+        self._record_lock = threading.Lock()
+        self.headless = headless
+        self.base_url = base_url
+        self.login_url = base_url + "/login.flex"
+        self.task_url = base_url + "/d/task/" + TASK_MARKER + ".htmld"
         
         chrome_options = Options()
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        if headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
         
         self.driver = webdriver.Chrome(options=chrome_options)
         self.driver.maximize_window()
         self.wait = WebDriverWait(self.driver, 10)
+        
+        self.block = block
+        if block:
+            enable_blocking(self.driver, block)
+        
+        # Per-phase durations of the most recent waits
+        self.timings = {}
+        self.metrics = metrics if metrics is not None else ScrapeMetrics()
+        self.waiter = AdaptiveWaiter(self.driver, self.timings, metrics=self.metrics)
     
     def login_and_navigate(self):
         """Handle login and navigation"""
         print("Opening Brown Workday login page...")
-        self.driver.get("https://wd5.myworkday.com/brown/login.flex")
+        self.driver.get(self.login_url)
         
         print("\n" + "="*50)
         print("MANUAL STEPS:")
         print("1. Log in")
         print("2. Navigate to job listings")
-        print("3. Search for '2025' to get 312 jobs")
+        print(f"3. Search for '{SEARCH_TERM}' to get 312 jobs")
         print("="*50)
         
-        input("\nPress ENTER after searching for '2025'...")
+        input(f"\nPress ENTER after searching for '{SEARCH_TERM}'...")
         
-        if "1422$7750" not in self.driver.current_url:
-            self.driver.get("https://wd5.myworkday.com/brown/d/task/1422$7750.htmld")
-            time.sleep(5)
+        if TASK_MARKER not in self.driver.current_url:
+            self.driver.get(self.task_url)
+            self.waiter.element_count('listing', LISTING_SELECTOR, 2)
     
-    def scroll_until_count(self, target_count):
-        """Scroll until we have at least target_count jobs visible"""
-        selector = "div[data-automation-id='promptOption']"
-        last_count = 0
+    def export_session(self):
+        """Return the cookies of the logged-in session"""
+        return self.driver.get_cookies()
+    
+    def import_session(self, cookies):
+        """Reuse another browser's login by copying its cookies"""
+        # Cookies can only be set for the domain we're currently on
+        self.driver.get(self.login_url)
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except:
+                pass
         
-        for _ in range(20):  # Max 20 scrolls
-            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-            current_count = len(elements) - 1 if len(elements) > 0 else 0
-            
-            if current_count >= target_count:
-                return current_count
+        self.driver.get(self.task_url)
+        if self.session_expired():
+            raise SessionExpired(self.task_url)
+        self.waiter.element_count('listing', LISTING_SELECTOR, 2)
+    
+    def session_expired(self):
+        """True when Workday has sent us back to sign in"""
+        if 'login' in self.driver.current_url:
+            return True
+        try:
+            text = self.driver.execute_script("return document.body ? document.body.innerText.slice(0, 2000) : ''")
+        except:
+            return False
+        return any(marker in text.lower() for marker in SESSION_EXPIRED_MARKERS)
+    
+    def refresh_listing(self, search_term, expected, attempts=3):
+        """
+        Reload the listing, re-apply the search and return how many jobs it lists
+        
+        A listing that comes back shorter is reloaded, up to attempts times.
+        If two reloads in a row agree on the shorter count, postings have
+        closed since the run started and that count is returned. Raises
+        SessionExpired if Workday wants a new login, which needs a person;
+        the journal keeps the run resumable with --resume.
+        """
+        counts = []
+        for attempt in range(1, attempts + 1):
+            self.driver.get(self.task_url)
+            if self.session_expired():
+                raise SessionExpired(self.task_url)
+            self.waiter.element_count('listing', LISTING_SELECTOR, 2)
             
-            if current_count == last_count:
-                return current_count
+            if search_term:
+                self.apply_search(search_term)
+            self.listing_size = None
+            count = self.scroll_until_count(expected)
+            if count >= expected:
+                print(f"Listing back with {count} jobs")
+                return count
+            if count and counts and counts[-1] == count:
+                print(f"Listing back with {count} jobs, {expected - count} fewer than before")
+                return count
+            counts.append(count)
             
-            last_count = current_count
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1.5)
+            self.metrics.count('retries', 'refresh')
+            print(f"  Listing shows {count} of {expected} jobs (attempt {attempt}/{attempts})")
         
-        return last_count
+        raise RuntimeError(f"Listing did not come back with {expected} jobs after {attempts} refreshes")
     
-    def scrape_job_page(self):
-        """Extract job details quickly"""
-        job_data = {
+    def apply_search(self, search_term):
+        """Type the search term into the listing's search box"""
+        search_box = self.wait.until(
+            lambda driver: driver.find_element(By.CSS_SELECTOR, SEARCH_SELECTOR)
+        )
+        search_box.clear()
+        search_box.send_keys(search_term)
+        search_box.send_keys(Keys.ENTER)
+        self.waiter.dom_quiet('search', quiet_time=0.5)
+    
+    def harvest_listing(self, target_count, idle_time=1.5, max_time=120):
+        """
+        Scroll the listing in the browser and return its rows in one call
+        
+        Returns [{'key', 'position', 'preview', 'url'}] sorted by position
+        in the listing, header excluded; key finds the row again with
+        ROW_SCRIPT. Stops at
+        target_count rows, after a few scrolls that load nothing new
+        (idle_time seconds each), or after max_time seconds. A harvest
+        that runs out of rows first records the listing's size, so later
+        batches don't wait for rows past the end.
+        """
+        self.driver.set_script_timeout(max_time + 10)
+        start = time.time()
+        rows = self.driver.execute_async_script(
+            HARVEST_SCRIPT, LISTING_SELECTOR, target_count, int(idle_time * 1000), int(max_time * 1000)
+        )
+        self.timings['harvest'] = time.time() - start
+        self.metrics.observe('scroll', self.timings['harvest'])
+        rows.sort(key=lambda row: row['position'])
+        self.listing_rows = rows
+        if len(rows) < target_count:
+            self.listing_size = len(rows)
+        return rows
+    
+    def scroll_until_count(self, target_count):
+        """Scroll until we have at least target_count jobs loaded"""
+        return len(self.harvest_listing(target_count))
+    
+    def find_row(self, key, max_time=10):
+        """The listing row with a harvested key and its preview, or None if it doesn't render"""
+        with self.metrics.time('find'):
+            return self.driver.execute_async_script(ROW_SCRIPT, LISTING_SELECTOR, key, int(max_time * 1000))
+    
+    def capture_job_page(self):
+        """Grab the open posting's raw text, the only step that needs the browser"""
+        page = {
             'url': self.driver.current_url,
             'scraped_at': datetime.now().isoformat()
         }
         
         try:
-            full_text = self.driver.find_element(By.TAG_NAME, "main").text
+            page['full_text'] = self.driver.find_element(By.TAG_NAME, "main").text
         except:
-            full_text = self.driver.find_element(By.TAG_NAME, "body").text
+            page['full_text'] = self.driver.find_element(By.TAG_NAME, "body").text
         
-        job_data['full_text'] = full_text
-        lines = full_text.split('\n')
+        return page
+    
+    def extract_job_page(self, job_data):
+        """Parse the fields out of a captured page's text"""
+        with self.metrics.time('extract'):
+            job_data.update(extract_fields(job_data['full_text']))
+        return job_data
+    
+    def scrape_job_page(self):
+        """Extract job details quickly"""
+        return self.extract_job_page(self.capture_job_page())
+    
+    def record_job(self, job_data):
+        """Keep a scraped job as a Job record and append it to the journal"""
+        job = Job.coerce(job_data)
+        with self._record_lock:
+            self.jobs_data.append(job)
+            self.failed.pop(job.index, None)
+            # A posting that moved up in the listing may have failed under another index
+            for index in [index for index, url in self.failed.items() if url == job.url]:
+                del self.failed[index]
+            if self.journal:
+                with self.metrics.time('journal'):
+                    self.journal.append(job.to_dict())
+    
+    def process_page(self, page):
+        """Extract, deduplicate and store one captured page"""
+        with self._record_lock:
+            if page['url'] in self._processed:
+                print(f"    = [{page['index']}] already scraped, skipping")
+                return
+            holder = self._indices.get(page['index'])
+            if holder is not None and holder != page['url']:
+                # Postings closed and this one moved up onto a row already scraped
+                index = max(self._indices) + 1
+                print(f"    = [{page['index']}] is another posting now, stored as {index}")
+                page['index'] = index
+            self._processed.add(page['url'])
+            self._indices[page['index']] = page['url']
         
-        # Quick extraction
-        for i in range(len(lines) - 1):
-            line = lines[i]
-            next_line = lines[i + 1]
-            
-            if line == 'Job Posting Title:':
-                job_data['job_title'] = next_line
-            elif line == 'Job Description:':
-                job_data['job_description'] = next_line
-            elif line == 'Recruiting Start Date:':
-                job_data['recruiting_start_date'] = next_line
-            elif line == 'Location' and 'location' not in job_data:
-                job_data['location'] = next_line
-            elif line == 'Department:':
-                job_data['department'] = next_line
-            elif line == 'Scheduled Weekly Hours:':
-                job_data['scheduled_weekly_hours'] = next_line
-            elif line == 'Hourly Rate:':
-                job_data['hourly_range'] = next_line
-            elif line == 'Hourly Range:':
-                for j in range(i+1, min(i+7, len(lines))):
-                    if lines[j] == 'Minimum:' and j + 1 < len(lines):
-                        min_val = lines[j + 1]
-                    elif lines[j] == 'Maximum:' and j + 1 < len(lines):
-                        max_val = lines[j + 1]
-                        job_data['hourly_range'] = f"${min_val} - ${max_val}"
-                        break
+        try:
+            job_data = self.extract_job_page(page)
+            self.record_job(job_data)
+        except:
+            # Not stored, so a retry of this posting mustn't be skipped
+            with self._record_lock:
+                self._processed.discard(page['url'])
+                self._indices.pop(page['index'], None)
+            raise
         
-        if 'job_title' not in job_data and len(lines) > 3:
-            job_data['job_title'] = lines[2]
+        title = job_data.get('job_title', 'Unknown')[:30]
+        print(f"    ✓ [{page['index']}] {title}")
+    
+    def submit_page(self, page):
+        """Hand a captured page to the pipeline, or process it right away without one"""
+        if self.pipeline:
+            self.pipeline.submit(page)
+            return
+        try:
+            self.process_page(page)
+        except Exception as e:
+            self.metrics.count('failures', 'extract')
+            print(f"    ✗ Could not process {page['url']}: {e}")
+            self.mark_failed(page['index'], page['url'])
+    
+    def mark_failed(self, index, url=None):
+        with self._record_lock:
+            self.failed[index] = url
+    
+    def collect_failed(self, wait=False):
+        """
+        Move pages the pipeline could not store into self.failed
         
-        return job_data
+        Returns their listing indices. With wait, pages still queued are
+        handled first, so none of them can fail afterwards unnoticed.
+        """
+        if not self.pipeline:
+            return []
+        if wait:
+            self.pipeline.flush()
+        failed = self.pipeline.take_failed()
+        for page in failed:
+            self.mark_failed(page['index'], page['url'])
+        return [page['index'] for page in failed]
+    
+    @contextmanager
+    def pipelined(self):
+        """Extract and store pages on worker threads while the browser keeps navigating"""
+        self._processed = {job.url for job in self.jobs_data}
+        self._indices = {job.index: job.url for job in self.jobs_data}
+        self.pipeline = ScrapePipeline(self.process_page, self.extract_workers, self.queue_size, self.metrics)
+        try:
+            yield self.pipeline
+        finally:
+            # Pages already captured still get stored, even after an interrupt
+            self.pipeline.close()
+            self.collect_failed()
+            self.pipeline = None
+            self.jobs_data.sort(key=lambda job: job.index or 0)
+    
+    def resume_from_journal(self):
+        """Reload jobs from an interrupted run"""
+        self.jobs_data = [Job.from_dict(job) for job in self.journal.replay()]
+        self.journal.open(resume=True)
+        print(f"Resuming with {len(self.jobs_data)} jobs from {self.journal.path}")
+    
+    def row_index(self, position):
+        """The listing index to record for the row at a position"""
+        return self.row_indices.get(position, position + 1)
+    
+    def row_position(self, index):
+        """The row position a recorded listing index belongs to"""
+        for position, row_index in self.row_indices.items():
+            if row_index == index:
+                return position
+        return index - 1
     
     def scrape_batch(self, start_index, batch_size=40):
-        """Scrape a batch of jobs"""
-        selector = "div[data-automation-id='promptOption']"
-        scraped_in_batch = 0
-        
+        """Scrape a batch of jobs, returns how many were opened"""
         print(f"\n--- Batch starting at job {start_index + 1} ---")
+        opened, failed = self.scrape_rows(range(start_index, start_index + batch_size))
+        return len(opened)
+    
+    def scrape_rows(self, indices):
+        """
+        Open the listing rows at the given positions, in order
+        
+        Returns (opened, failed): rows whose page was handed on, and rows
+        whose posting didn't open. Stops at a row the listing no longer
+        shows, leaving it and the rest for the caller to try again.
+        """
+        selector = LISTING_SELECTOR
+        indices = list(indices)
+        opened, failed = [], []
         
         # Make sure enough jobs are loaded
-        print(f"Scrolling to load jobs {start_index + 1} to {start_index + batch_size}...")
-        self.scroll_until_count(start_index + batch_size + 1)
+        target = max(indices) + 1
+        if self.listing_size is not None:
+            target = min(target, self.listing_size)
+        print(f"Scrolling to load jobs {min(indices) + 1} to {target}...")
+        rows = {row['position']: row for row in self.harvest_listing(target)}
         
-        for i in range(batch_size):
-            job_index = start_index + i
+        for job_index in indices:
+            row = rows.get(job_index)
+            if row is None:
+                print(f"  Job {job_index + 1}: Not found (reached end)")
+                break
             
-            # Re-find elements
-            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-            if len(elements) > 1:
-                elements = elements[1:]  # Skip header
+            job_start = time.time()
             
-            if job_index >= len(elements):
+            # Look the row up by its key; the listing is re-rendered after every back()
+            found = self.find_row(row['key'])
+            if not found:
                 print(f"  Job {job_index + 1}: Not found (reached end)")
                 break
             
-            # Scroll to and click job
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", elements[job_index])
-            time.sleep(0.3)
-            
-            preview = elements[job_index].text[:50] if elements[job_index].text else ""
+            element, preview = found
             print(f"  [{job_index + 1}] {preview}...")
             
-            try:
-                elements[job_index].click()
-            except:
-                self.driver.execute_script("arguments[0].click();", elements[job_index])
-            
-            time.sleep(3)
+            with self.metrics.time('click'):
+                try:
+                    element.click()
+                except:
+                    self.metrics.count('retries', 'click')
+                    self.driver.execute_script("arguments[0].click();", element)
             
             # Check if we navigated
-            if "1422$7750" not in self.driver.current_url:
-                job_data = self.scrape_job_page()
-                job_data['index'] = job_index + 1
-                job_data['preview'] = preview
-                
-                self.jobs_data.append(job_data)
-                scraped_in_batch += 1
-                
-                title = job_data.get('job_title', 'Unknown')[:30]
-                print(f"    ✓ {title}")
+            wait_start = time.time()
+            if self.waiter.url_leaves('page_load', TASK_MARKER):
+                if not self.waiter.text_present('render', 'Job Posting Title:') and self.session_expired():
+                    raise SessionExpired(self.driver.current_url)
+                self.metrics.observe('page_wait', time.time() - wait_start)
+                page = self.capture_job_page()
+                page['index'] = self.row_index(job_index)
+                page['preview'] = preview
+                self.submit_page(page)
+                opened.append(job_index)
                 
                 # Go back
-                self.driver.back()
-                time.sleep(2)
+                with self.metrics.time('back'):
+                    self.driver.back()
+                    self.waiter.url_contains('back', TASK_MARKER)
+                    self.waiter.element_count('listing', selector, 2)
+                
+                self.metrics.count('jobs')
+                self.metrics.observe('job', time.time() - job_start)
             else:
+                self.metrics.count('failures', 'page_wait')
+                self.mark_failed(self.row_index(job_index), row['url'])
+                failed.append(job_index)
                 print(f"    ✗ Failed to navigate")
         
-        return scraped_in_batch
+        return opened, failed
     
-    def scrape_all_in_batches(self, total_target=312):
-        """Scrape all jobs in batches of 40"""
+    def harvest_job_links(self, total_target=312):
+        """Scroll the listing once and collect every posting's URL"""
+        print(f"Loading listing to collect {total_target} job links...")
+        rows = self.harvest_listing(total_target)
+        
+        links = []
+        for row in rows[:total_target]:
+            if not row['url']:
+                print(f"  Job {row['position'] + 1}: no link target, skipping")
+                continue
+            links.append({'index': row['position'] + 1, 'preview': row['preview'], 'url': row['url']})
+        
+        print(f"Collected {len(links)} job links in {self.timings['harvest']:.1f}s")
+        return links
+    
+    def save_job_links(self, links, filename):
+        """Save a listing snapshot in the scraper's output format, for --links-from"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({
+                'metadata': {
+                    'scrape_date': datetime.now().isoformat(),
+                    'total_jobs': len(links),
+                    'listing_only': True
+                },
+                'jobs': links
+            }, f, indent=2, ensure_ascii=False)
+        print(f"Saved {len(links)} job links to {filename}")
+    
+    def load_job_links(self, filename):
+        """Read job links from a previously saved scrape"""
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        return [
+            {'index': job.get('index', i + 1), 'preview': job.get('preview', ''), 'url': job['url']}
+            for i, job in enumerate(data['jobs'])
+            if job.get('url')
+        ]
+    
+    def scrape_job_urls(self, links):
+        """Open each job posting by URL, no listing navigation needed"""
+        print(f"\n{'='*50}")
+        print(f"SCRAPING {len(links)} JOBS BY URL")
+        print(f"{'='*50}")
+        
+        start_time = time.time()
+        
+        with self.pipelined():
+            for link in links:
+                self.scrape_job_url(link)
+            
+            # Postings that didn't load or couldn't be stored get one more try
+            self.collect_failed(wait=True)
+            retry = [link for link in links if link['index'] in self.failed]
+            if retry:
+                print(f"\nRetrying {len(retry)} postings...")
+                self.metrics.count('retries', 'job', len(retry))
+                for link in retry:
+                    self.scrape_job_url(link)
+        
+        total_time = time.time() - start_time
+        print(f"\nCompleted in {total_time/60:.1f} minutes")
+        print(f"Average: {total_time/max(len(links),1):.1f} seconds per job")
+    
+    def scrape_job_url(self, link):
+        """Open one posting by URL and hand its page on"""
+        print(f"  [{link['index']}] {link['preview']}...")
+        job_start = time.time()
+        self.driver.get(link['url'])
+        
+        if not self.waiter.text_present('render', 'Job Posting Title:'):
+            if self.session_expired():
+                raise SessionExpired(link['url'])
+            self.metrics.count('failures', 'page_wait')
+            self.mark_failed(link['index'], link['url'])
+            print(f"    ✗ Posting did not load")
+            return
+        self.metrics.observe('page_wait', time.time() - job_start)
+        
+        page = self.capture_job_page()
+        page['index'] = link['index']
+        page['preview'] = link['preview']
+        self.submit_page(page)
+        self.metrics.count('jobs')
+        self.metrics.observe('job', time.time() - job_start)
+    
+    def scrape_links(self, links, backend="selenium", connections=8):
+        """Fetch job postings by URL with the chosen backend"""
+        done = {job.url for job in self.jobs_data}
+        links = [link for link in links if link['url'] not in done]
+        
+        if backend == "http":
+            from http_fetcher import HttpJobFetcher
+            fetcher = HttpJobFetcher.from_driver(self.driver, max_workers=connections, metrics=self.metrics)
+            try:
+                # Each posting is journaled as it arrives, so an expired session loses none
+                for job_data in fetcher.fetch_all(links):
+                    self.record_job(job_data)
+                    self.metrics.count('jobs')
+            finally:
+                fetcher.close()
+                self.jobs_data.sort(key=lambda job: job.index or 0)
+                fetched = {job.url for job in self.jobs_data}
+                for link in links:
+                    if link['url'] not in fetched:
+                        self.mark_failed(link['index'], link['url'])
+        else:
+            self.scrape_job_urls(links)
+    
+    def scrape_incremental(self, previous_file, total_target=312, backend="selenium", connections=8):
+        """Only fetch postings that are new or changed since the previous scrape"""
+        with open(previous_file, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        
+        links = self.harvest_job_links(total_target)
+        if not links:
+            raise RuntimeError("Listing came back empty, refusing to tombstone every posting")
+        
+        to_fetch, carried, removed = plan_incremental(previous, links)
+        
+        # Jobs already fetched by an interrupted run count as done
+        fetch_urls = {link['url'] for link in to_fetch}
+        self.jobs_data = [job for job in self.jobs_data if job.url in fetch_urls]
+        
+        print(f"\n{'='*50}")
+        print(f"INCREMENTAL: {len(to_fetch)} new/changed, {len(carried)} unchanged, "
+              f"{len(removed) - len(previous.get('removed_jobs', []))} newly removed")
+        print(f"{'='*50}")
+        
+        if to_fetch:
+            self.scrape_links(to_fetch, backend, connections)
+        
+        self.jobs_data = sorted(carried + self.jobs_data, key=lambda job: job.index)
+        self.removed_jobs = removed
+    
+    def scrape_all_in_batches(self, total_target=312, search_term=SEARCH_TERM, max_attempts=3):
+        """
+        Scrape all jobs in batches of 40, refreshing the listing without help when it needs it
+        
+        Rows are tracked by position, apart from how many succeeded: a row
+        that fails to open or to be stored goes back in the queue, up to
+        max_attempts tries, and only rows not yet scraped are clicked. When
+        postings close mid-run, the rows that still need scraping are worked
+        out from their links where the listing has them, and each keeps the
+        index it had in the first harvest, so no index is recorded twice.
+        """
         print(f"\n{'='*50}")
         print(f"SCRAPING {total_target} JOBS IN BATCHES")
         print(f"{'='*50}")
         
         start_time = time.time()
         batch_size = 40
-        jobs_scraped = 0
         
-        while jobs_scraped < total_target:
-            # Scrape next batch
-            scraped = self.scrape_batch(jobs_scraped, batch_size)
-            jobs_scraped += scraped
-            
-            print(f"\nTotal scraped so far: {jobs_scraped}/{total_target}")
-            
-            if scraped == 0:
-                print("No jobs scraped in last batch. Stopping.")
-                break
-            
-            # Save backup
-            if jobs_scraped % 50 == 0 or jobs_scraped >= total_target:
-                self.save_to_json(f"backup_{jobs_scraped}.json")
-                print(f"💾 Backup saved")
-            
-            # Check if we're done
-            if jobs_scraped >= total_target:
-                print(f"\n✅ Target reached: {jobs_scraped} jobs!")
-                break
-            
-            # Reload the page every 2 batches to reset
-            if jobs_scraped % 80 == 0:
-                print("\nRefreshing page...")
-                self.driver.get("https://wd5.myworkday.com/brown/d/task/1422$7750.htmld")
-                time.sleep(3)
-                print("Re-apply the '2025' filter if needed")
-                input("Press ENTER when ready...")
+        # Every refresh has to bring the listing back to this many jobs
+        expected = self.scroll_until_count(total_target)
+        print(f"Listing has {expected} jobs")
+        if expected < total_target:
+            print(f"Scraping those {expected} instead of {total_target}")
+            total_target = expected
+        first_indices = {}
+        for row in self.listing_rows:
+            if row['url']:
+                first_indices.setdefault(posting_key(row['url']), row['position'] + 1)
+        
+        # Rows still to open, 0-based; a resumed journal's jobs are done already
+        done = {job.index for job in self.jobs_data}
+        pending = deque(i for i in range(total_target) if i + 1 not in done)
+        attempts = {}
+        since_refresh = 0
+        refreshed = False
+        
+        def retry(indices):
+            for job_index in indices:
+                if attempts.get(job_index, 0) < max_attempts and job_index < total_target:
+                    pending.append(job_index)
+        
+        with self.pipelined():
+            while pending:
+                batch = sorted(pending.popleft() for _ in range(min(batch_size, len(pending))))
+                print(f"\n--- Batch starting at job {batch[0] + 1} ---")
+                opened, failed = self.scrape_rows(batch)
+                for job_index in opened + failed:
+                    attempts[job_index] = attempts.get(job_index, 0) + 1
+                
+                # Rows the listing lost go first, failed ones at the back
+                tried = set(opened + failed)
+                pending.extendleft(reversed([i for i in batch if i not in tried]))
+                retry(failed)
+                retry(self.row_position(index) for index in self.collect_failed())
+                
+                print(f"\nTotal scraped so far: {len(self.jobs_data)}/{total_target}, {len(pending)} rows to go")
+                
+                if not pending:
+                    # Pages still being extracted may fail and need another click
+                    retry(self.row_position(index) for index in self.collect_failed(wait=True))
+                    continue
+                
+                # A batch that stops short means the session or the search was lost
+                if len(tried) < len(batch):
+                    if not tried and refreshed:
+                        print("No jobs scraped right after a refresh. Stopping.")
+                        break
+                    print("\nListing lost, refreshing...")
+                    count = self.refresh_listing(search_term, expected)
+                    refreshed = True
+                    since_refresh = 0
+                elif since_refresh + len(tried) >= 80:
+                    # Reload the page every 2 batches to reset
+                    print("\nRefreshing page...")
+                    count = self.refresh_listing(search_term, expected)
+                    refreshed = False
+                    since_refresh = 0
+                else:
+                    refreshed = False
+                    since_refresh += len(tried)
+                    continue
+                
+                if count < expected:
+                    closed = expected - count
+                    expected = total_target = count
+                    rows = self.listing_rows
+                    if rows and all(row['url'] for row in rows) and first_indices:
+                        # Every page still queued is stored or failed before the rows are matched up
+                        self.collect_failed(wait=True)
+                        stored = {posting_key(job.url) for job in self.jobs_data}
+                        spare = max(first_indices.values())
+                        self.row_indices = {}
+                        for row in rows:
+                            key = posting_key(row['url'])
+                            if key not in first_indices:
+                                spare += 1
+                                first_indices[key] = spare
+                            self.row_indices[row['position']] = first_indices[key]
+                        pending = deque(row['position'] for row in rows if posting_key(row['url']) not in stored)
+                        attempts = {}
+                    else:
+                        # Without links, each pending posting may now sit up to that many
+                        # rows earlier; scraped postings among those are dropped by URL
+                        pending = deque(sorted({
+                            i for job_index in pending for i in range(job_index - closed, job_index + 1)
+                            if 0 <= i < count
+                        }))
+        
+        if pending:
+            for job_index in pending:
+                self.mark_failed(self.row_index(job_index))
+        
+        total_time = time.time() - start_time
+        scraped = len(self.jobs_data)
+        print(f"\nCompleted in {total_time/60:.1f} minutes")
+        print(f"Average: {total_time/max(scraped,1):.1f} seconds per job")
+        if self.failed:
+            print(f"{len(self.failed)} of {total_target} jobs failed after {max_attempts} tries")
+    
+    def scrape_all_parallel(self, total_target=312, num_workers=4, chunk_size=10, search_term=SEARCH_TERM,
+                            max_attempts=3):
+        """
+        Scrape jobs with several browsers that share this session's login
+        
+        Rows a resumed journal already has are skipped one by one. Rows that
+        fail in a worker go back on the queue, up to max_attempts tries, as
+        in scrape_all_in_batches.
+        """
+        print(f"\n{'='*50}")
+        print(f"SCRAPING {total_target} JOBS WITH {num_workers} WORKERS")
+        print(f"{'='*50}")
+        
+        start_time = time.time()
+        cookies = self.export_session()
+        
+        # Shared work queue of chunks of row positions the journal doesn't have yet
+        done = {job.index for job in self.jobs_data}
+        stored = {job.url for job in self.jobs_data}
+        pending = [i for i in range(total_target) if i + 1 not in done]
+        work = queue.Queue()
+        for start in range(0, len(pending), chunk_size):
+            work.put(pending[start:start + chunk_size])
+        
+        attempts = {}
+        lock = threading.Lock()
+        
+        def run_worker(worker_id):
+            worker = BatchWorkdayScraper(headless=self.headless, base_url=self.base_url, metrics=self.metrics,
+                                         block=self.block)
+            try:
+                worker.import_session(cookies)
+                if search_term:
+                    worker.apply_search(search_term)
+                
+                while True:
+                    try:
+                        chunk = work.get_nowait()
+                    except queue.Empty:
+                        break
+                    
+                    worker.jobs_data = []
+                    try:
+                        worker.scrape_rows(chunk)
+                    except Exception as e:
+                        print(f"  Worker {worker_id}: batch at {chunk[0] + 1} failed ({e})")
+                    
+                    with lock:
+                        for index, url in worker.failed.items():
+                            self.mark_failed(index, url)
+                        worker.failed = {}
+                        for job in worker.jobs_data:
+                            # Listings repeat postings and retried rows may have been stored already
+                            if job.index in done or job.url in stored:
+                                continue
+                            done.add(job.index)
+                            stored.add(job.url)
+                            self.record_job(job)
+                        
+                        retry = []
+                        for job_index in chunk:
+                            if job_index + 1 in done:
+                                continue
+                            attempts[job_index] = attempts.get(job_index, 0) + 1
+                            if attempts[job_index] < max_attempts:
+                                retry.append(job_index)
+                            else:
+                                self.mark_failed(job_index + 1, self.failed.get(job_index + 1))
+                        if retry:
+                            self.metrics.count('retries', 'job', len(retry))
+                            work.put(retry)
+                        print(f"  Worker {worker_id}: {len(self.jobs_data)}/{total_target} jobs collected")
+            except Exception as e:
+                print(f"  Worker {worker_id} stopped: {e}")
+            finally:
+                worker.cleanup()
+        
+        threads = [threading.Thread(target=run_worker, args=(n + 1,)) for n in range(num_workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Rows no worker got to, e.g. because every worker stopped
+        while not work.empty():
+            for job_index in work.get_nowait():
+                self.mark_failed(job_index + 1, self.failed.get(job_index + 1))
+        
+        self.jobs_data.sort(key=lambda job: job.index or 0)
         
         total_time = time.time() - start_time
         print(f"\nCompleted in {total_time/60:.1f} minutes")
-        print(f"Average: {total_time/max(jobs_scraped,1):.1f} seconds per job")
+        print(f"Average: {total_time/max(len(self.jobs_data),1):.1f} seconds per job")
+        if self.failed:
+            print(f"{len(self.failed)} of {total_target} jobs failed after {max_attempts} tries")
     
     def save_to_json(self, filename="jobs.json"):
         """Save data to JSON"""
@@ -216,11 +942,14 @@ class BatchWorkdayScraper:
                 "total_jobs": len(self.jobs_data),
                 "source": "Brown Workday"
             },
-            "jobs": self.jobs_data
+            "jobs": [job.to_dict() for job in self.jobs_data]
         }
+        if self.removed_jobs:
+            output["removed_jobs"] = self.removed_jobs
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        with self.metrics.time('save'):
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
         
         print(f"  Saved to {filename}")
     
@@ -230,26 +959,125 @@ class BatchWorkdayScraper:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Brown Workday job postings")
+    parser.add_argument("--target", type=int, default=312, help="number of jobs to scrape")
+    parser.add_argument("--workers", type=int, default=1, help="number of parallel browser sessions")
+    parser.add_argument("--direct", action="store_true", help="collect job URLs first, then open each one directly")
+    parser.add_argument("--links-from", metavar="FILE", help="take job URLs from a previous scrape (implies --direct)")
+    parser.add_argument("--save-links", metavar="FILE",
+                        help="only harvest the listing (previews and URLs) into FILE, without opening any posting")
+    parser.add_argument("--backend", choices=["selenium", "http"], default="selenium",
+                        help="how --direct fetches posting pages after login")
+    parser.add_argument("--connections", type=int, default=8, help="concurrent requests for the http backend")
+    parser.add_argument("--incremental", metavar="FILE",
+                        help="previous scrape; only fetch postings that are new or changed since then")
+    parser.add_argument("--journal", default="brown_jobs_journal.jsonl", help="append-only log of scraped jobs")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted run from its journal")
+    parser.add_argument("--fresh", action="store_true",
+                        help="start over even if the journal holds an interrupted run (it is kept, renamed)")
+    parser.add_argument("--search", default=SEARCH_TERM, help="search term the listing is filtered by")
+    parser.add_argument("--save-cookies", metavar="FILE", help="after logging in, save the session for --cookies")
+    parser.add_argument("--cookies", metavar="FILE",
+                        help="reuse a saved session instead of logging in, so the run needs nobody at the keyboard")
+    parser.add_argument("--history", metavar="DB", help="also add the finished scrape to this posting history database")
+    parser.add_argument("--extract-workers", type=int, default=2,
+                        help="threads that extract and save pages while the browser moves on")
+    parser.add_argument("--queue-size", type=int, default=16,
+                        help="captured pages that may wait for extraction before the browser pauses")
+    parser.add_argument("--block-resources", action="store_true",
+                        help="don't load images, fonts, media or analytics, which postings don't need")
+    parser.add_argument("--metrics", default="brown_jobs_metrics.json", help="where to write the run's timing metrics")
+    parser.add_argument("--prometheus", metavar="FILE", help="keep Prometheus text metrics in FILE during the run")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this local port during the run")
+    args = parser.parse_args()
+    
     print("BATCH WORKDAY SCRAPER")
-    print("This scrapes jobs in batches of 40")
+    if args.workers > 1:
+        print(f"This scrapes jobs with {args.workers} parallel browsers")
+    else:
+        print("This scrapes jobs in batches of 40")
     print("-" * 50)
     
-    scraper = BatchWorkdayScraper()
+    journal = ScrapeJournal(args.journal)
+    exit_code = 0
+    if not args.resume:
+        # Before the browser starts, so a forgotten --resume costs nothing
+        try:
+            journal.open(fresh=args.fresh)
+        except FileExistsError as e:
+            raise SystemExit(str(e))
+    
+    metrics = ScrapeMetrics(args.prometheus)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    scraper = BatchWorkdayScraper(journal, metrics=metrics, extract_workers=args.extract_workers,
+                                  queue_size=args.queue_size, block=DEFAULT_BLOCK if args.block_resources else ())
+    if args.resume:
+        scraper.resume_from_journal()
     
     try:
-        scraper.login_and_navigate()
-        scraper.scrape_all_in_batches(total_target=312)
+        if args.cookies:
+            with open(args.cookies, 'r', encoding='utf-8') as f:
+                scraper.import_session(json.load(f))
+            scraper.apply_search(args.search)
+        else:
+            scraper.login_and_navigate()
+            if args.save_cookies:
+                with open(args.save_cookies, 'w', encoding='utf-8') as f:
+                    json.dump(scraper.export_session(), f)
+                print(f"Session saved to {args.save_cookies}")
+        
+        if args.save_links:
+            scraper.save_job_links(scraper.harvest_job_links(args.target), args.save_links)
+            journal.discard()
+            raise SystemExit
+        if args.incremental:
+            scraper.scrape_incremental(args.incremental, args.target, args.backend, args.connections)
+        elif args.links_from or args.direct:
+            if args.links_from:
+                links = scraper.load_job_links(args.links_from)
+            else:
+                links = scraper.harvest_job_links(args.target)
+            scraper.scrape_links(links, args.backend, args.connections)
+        elif args.workers > 1:
+            scraper.scrape_all_parallel(total_target=args.target, num_workers=args.workers, search_term=args.search)
+        else:
+            scraper.scrape_all_in_batches(total_target=args.target, search_term=args.search)
         scraper.save_to_json("brown_jobs_2025_final.json")
+        if not scraper.failed:
+            journal.discard()
+        
+        if args.history:
+            from posting_history import PostingHistory
+            
+            # Only a scrape that covered the whole listing may close postings it didn't see
+            complete = not scraper.failed and (bool(args.incremental) or len(scraper.jobs_data) >= args.target)
+            with open("brown_jobs_2025_final.json", 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            history = PostingHistory(args.history)
+            scrape_id, upserted, closed = history.ingest(data, "brown_jobs_2025_final.json", complete)
+            history.close()
+            print(f"History: scrape {scrape_id}, {upserted} postings upserted, {closed} closed -> {args.history}")
         
         print(f"\n{'='*50}")
         print(f"COMPLETE! Scraped {len(scraper.jobs_data)} jobs")
         print(f"Saved to: brown_jobs_2025_final.json")
         print(f"{'='*50}")
         
+        if scraper.failed:
+            print(f"\n{len(scraper.failed)} postings could not be scraped: "
+                  + ', '.join(str(index) for index in sorted(scraper.failed)))
+            print("The journal is kept; rerun with --resume to retry them.")
+            exit_code = 1
+    
     except KeyboardInterrupt:
         print("\n\nInterrupted. Saving...")
         scraper.save_to_json("brown_jobs_partial.json")
     
+    except SessionExpired:
+        print("\nWorkday session expired. Log in again (--save-cookies) and rerun with --resume.")
+        scraper.save_to_json("brown_jobs_partial.json")
+    
     except Exception as e:
         print(f"\nError: {e}")
         scraper.save_to_json("brown_jobs_error.json")
@@ -257,4 +1085,11 @@ if __name__ == "__main__":
         traceback.print_exc()
     
     finally:
-        scraper.cleanup()
\ No newline at end of file
+        journal.close()
+        scraper.cleanup()
+        metrics.print_report()
+        metrics.save(args.metrics)
+        metrics.close()
+        print(f"Metrics saved to: {args.metrics}")
+    
+    raise SystemExit(exit_code)
\ No newline at end of file
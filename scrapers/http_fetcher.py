@@ -0,0 +1,260 @@
+import gzip
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from job_extractor import extract_fields
+
+
+class SessionExpired(Exception):
+    """Raised when Workday sends us back to the login page"""
+
+
+class _TextExtractor(HTMLParser):
+    """Turns an HTML page into newline separated text, like element.text"""
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                  'label', 'dt', 'dd', 'section', 'header', 'footer', 'main'}
+    SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skipping = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skipping += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skipping = max(0, self.skipping - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+    
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+    
+    def text(self):
+        lines = (line.strip() for line in ''.join(self.parts).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+
+def html_to_text(html):
+    """Visible text of an HTML page, one block per line"""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def payload_to_text(node, lines=None):
+    """Flatten a Workday JSON page payload into the same label/value lines the browser shows"""
+    if lines is None:
+        lines = []
+    
+    if isinstance(node, dict):
+        label = node.get('label')
+        if isinstance(label, str) and label:
+            lines.append(label)
+        for key in ('value', 'text'):
+            value = node.get(key)
+            if isinstance(value, (str, int, float)) and not isinstance(value, bool) and str(value):
+                lines.append(str(value))
+        for key, value in node.items():
+            if key not in ('label', 'value', 'text') and isinstance(value, (dict, list)):
+                payload_to_text(value, lines)
+    elif isinstance(node, list):
+        for item in node:
+            payload_to_text(item, lines)
+    
+    return lines
+
+
+class HttpJobFetcher:
+    def __init__(self, cookies, max_workers=8, timeout=15, metrics=None):
+        """
+        Fetch job posting pages over plain HTTP using a logged-in browser's cookies
+
+        Args:
+            cookies: list of cookie dicts, as returned by driver.get_cookies()
+            max_workers: maximum number of requests in flight at once
+            timeout: socket timeout in seconds
+            metrics: optional ScrapeMetrics that receives fetch times, retries and failures
+        """
+        self.cookie_header = '; '.join(f"{c['name']}={c['value']}" for c in cookies)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.metrics = metrics
+        
+        # One keep-alive connection per thread and host
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """Build a fetcher that shares a Selenium session's login"""
+        return cls(driver.get_cookies(), **kwargs)
+    
+    def _connection(self, scheme, host):
+        pool = getattr(self._local, 'pool', None)
+        if pool is None:
+            pool = self._local.pool = {}
+        
+        conn = pool.get((scheme, host))
+        if conn is None:
+            if scheme == 'https':
+                conn = http.client.HTTPSConnection(host, timeout=self.timeout)
+            else:
+                conn = http.client.HTTPConnection(host, timeout=self.timeout)
+            pool[(scheme, host)] = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    def _drop_connection(self, scheme, host):
+        conn = self._local.pool.pop((scheme, host), None)
+        if conn:
+            conn.close()
+    
+    def fetch(self, url):
+        """GET a URL, returns (status, content_type, body_text)"""
+        parts = urlsplit(url)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+        headers = {
+            'Cookie': self.cookie_header,
+            'Accept': 'application/json, text/html;q=0.9',
+            'Accept-Encoding': 'gzip',
+            'Connection': 'keep-alive',
+        }
+        
+        # Retry once on a fresh connection if the server closed the old one
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError, OSError):
+                self._drop_connection(parts.scheme, parts.netloc)
+                if attempt:
+                    raise
+                if self.metrics:
+                    self.metrics.count('retries', 'fetch')
+        
+        if response.getheader('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        
+        location = response.getheader('Location') or ''
+        if response.status in (301, 302, 303) and 'login' in location:
+            raise SessionExpired(url)
+        
+        content_type = response.getheader('Content-Type', '')
+        return response.status, content_type, body.decode('utf-8', errors='replace')
+    
+    def page_text(self, url):
+        """Fetch a posting and return its text in the browser's line layout"""
+        status, content_type, body = self.fetch(url)
+        if status != 200:
+            return None
+        
+        if 'json' in content_type:
+            return '\n'.join(payload_to_text(json.loads(body)))
+        return html_to_text(body)
+    
+    def fetch_job(self, link):
+        """Fetch one posting and extract its fields, same schema as the Selenium scraper"""
+        start = time.time()
+        full_text = self.page_text(link['url'])
+        if not full_text:
+            return None
+        
+        job_data = {
+            'url': link['url'],
+            'scraped_at': datetime.now().isoformat(),
+            'full_text': full_text
+        }
+        extract_start = time.time()
+        job_data.update(extract_fields(full_text))
+        if self.metrics:
+            self.metrics.observe('fetch', extract_start - start)
+            self.metrics.observe('extract', time.time() - extract_start)
+            self.metrics.observe('job', time.time() - start)
+        job_data['index'] = link['index']
+        job_data['preview'] = link.get('preview', '')
+        return job_data
+    
+    def fetch_all(self, links):
+        """
+        Fetch postings concurrently, yielding job dicts as they complete
+
+        At most twice max_workers requests are queued at a time, so once
+        Workday ends the session nothing more is submitted. Every posting
+        fetched before that has been yielded when SessionExpired is raised.
+        """
+        print(f"\n{'='*50}")
+        print(f"FETCHING {len(links)} JOBS OVER HTTP ({self.max_workers} connections)")
+        print(f"{'='*50}")
+        
+        start_time = time.time()
+        fetched = 0
+        expired = None
+        
+        def fetch_one(link):
+            try:
+                job_data = self.fetch_job(link)
+            except SessionExpired:
+                raise
+            except Exception as e:
+                print(f"  [{link['index']}] ✗ {e}")
+                job_data = None
+            if job_data is None and self.metrics:
+                self.metrics.count('failures', 'fetch')
+            return job_data
+        
+        remaining = iter(links)
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                while expired is None and len(pending) < self.max_workers * 2:
+                    link = next(remaining, None)
+                    if link is None:
+                        break
+                    pending.add(pool.submit(fetch_one, link))
+                if not pending:
+                    break
+                
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    try:
+                        job_data = future.result()
+                    except SessionExpired as e:
+                        expired = expired or e
+                        continue
+                    if job_data:
+                        fetched += 1
+                        print(f"  [{job_data['index']}] ✓ {job_data.get('job_title', 'Unknown')[:30]}")
+                        yield job_data
+        
+        total_time = time.time() - start_time
+        print(f"\nFetched {fetched} jobs in {total_time:.1f} seconds")
+        print(f"Rate: {fetched/max(total_time, 0.001):.1f} jobs per second")
+        
+        if expired:
+            raise expired
+    
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
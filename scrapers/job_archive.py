@@ -0,0 +1,300 @@
+import argparse
+import json
+import mmap
+import os
+import time
+from functools import cached_property
+
+import numpy as np
+
+from job_record import FIELDS, INTERNED_FIELDS, Job, load_records
+from job_store import STORE_FILE, TEXT_FILE, load_full_texts, posting_id
+from scoring import TYPE_KEYWORDS, ENTRY_LEVEL_WORDS, EXPERIENCE_REQUIRED_WORDS, ADVANCED_WORDS, JobFeatures
+
+ARCHIVE_FILE = 'jobs_archive.json'
+RECORDS_FILE = 'jobs_archive.npy'
+STRINGS_FILE = 'jobs_archive.bin'
+
+# Record layout: codes into the archive's value lists, typed numbers (NaN = missing)
+# and (offset, length) spans into the string file (length -1 = missing)
+CODE_FIELDS = [name for name in FIELDS if name in INTERNED_FIELDS]
+NUMBER_FIELDS = ['weekly_hours', 'pay_min', 'pay_max', 'pay_mid']
+TEXT_FIELDS = ['url', 'scraped_at', 'job_title', 'job_description', 'preview', 'full_text']
+SPAN = np.dtype([('offset', '<u8'), ('length', '<i4')])
+
+RECORD_DTYPE = np.dtype(
+    [('job_id', '<i8'), ('index', '<i4')]
+    + [(name, '<i4') for name in CODE_FIELDS]
+    + [(name, '<f8') for name in NUMBER_FIELDS]
+    + [(name, SPAN) for name in TEXT_FIELDS]
+    # Keyword matches the scorer needs, so nothing is read from the text to rank
+    + [('type_matches', '<u1', (len(TYPE_KEYWORDS),)), ('entry_level', '?'),
+       ('experience_required', '?'), ('advanced', '?')]
+)
+
+# Fields a loaded record leaves to JobArchive.full_text
+LAZY_FIELDS = {'full_text'}
+
+
+def _scoring_words():
+    return {'type': TYPE_KEYWORDS, 'entry_level': ENTRY_LEVEL_WORDS,
+            'experience_required': EXPERIENCE_REQUIRED_WORDS, 'advanced': ADVANCED_WORDS}
+
+
+def write_archive(jobs, metadata, out_dir):
+    """
+    Write jobs as one fixed-size record each plus a shared string file
+
+    jobs need full_text set to keep it; the keyword matches are computed
+    here with the current scoring tables.
+    """
+    features = JobFeatures(jobs)
+    records = np.zeros(len(jobs), dtype=RECORD_DTYPE)
+    records['job_id'] = [job.id if job.id is not None else -1 for job in jobs]
+    records['index'] = [job.index if job.index is not None else -1 for job in jobs]
+    
+    values = {}
+    for name in CODE_FIELDS:
+        lookup = {}
+        records[name] = [lookup.setdefault(value, len(lookup)) if value is not None else -1
+                         for value in (getattr(job, name) for job in jobs)]
+        values[name] = list(lookup)
+    for name in NUMBER_FIELDS:
+        records[name] = [value if value is not None else np.nan for value in (getattr(job, name) for job in jobs)]
+    
+    offset = 0
+    with open(os.path.join(out_dir, STRINGS_FILE), 'wb') as f:
+        for name in TEXT_FIELDS:
+            offsets, lengths = [], []
+            for job in jobs:
+                value = getattr(job, name)
+                data = value.encode('utf-8') if value is not None else b''
+                f.write(data)
+                offsets.append(offset)
+                lengths.append(len(data) if value is not None else -1)
+                offset += len(data)
+            records[name]['offset'] = offsets
+            records[name]['length'] = lengths
+    
+    for i, pref_type in enumerate(TYPE_KEYWORDS):
+        records['type_matches'][:, i] = features.type_matches[pref_type]
+    records['entry_level'] = features.entry_level
+    records['experience_required'] = features.experience_required
+    records['advanced'] = features.advanced
+    
+    records_path = os.path.join(out_dir, RECORDS_FILE)
+    np.save(records_path, records)
+    
+    archive_path = os.path.join(out_dir, ARCHIVE_FILE)
+    with open(archive_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'metadata': dict(metadata, total_jobs=len(jobs)),
+            'values': values,
+            'scoring_words': _scoring_words()
+        }, f, ensure_ascii=False, separators=(',', ':'))
+    
+    return archive_path
+
+
+class DepartmentIndex:
+    def __init__(self, codes, departments):
+        """
+        Rows per department keyword, matched against the distinct departments
+
+        Stands in for KeywordIndex's 'department' section: a keyword is
+        checked once per department name, then mapped onto the codes.
+        """
+        self.codes = codes
+        self.departments = [(department or '').lower() for department in departments]
+        self._rows = {}
+    
+    def rows(self, section, keyword):
+        if keyword not in self._rows:
+            matching = [code for code, department in enumerate(self.departments) if keyword in department]
+            self._rows[keyword] = np.flatnonzero(np.isin(self.codes, matching))
+        return self._rows[keyword]
+
+
+class ArchiveFeatures:
+    def __init__(self, archive):
+        """The JobFeatures arrays, read from the archive's record columns on first use"""
+        self.archive = archive
+        self.size = len(archive)
+    
+    @cached_property
+    def keyword_index(self):
+        return DepartmentIndex(self.archive.records['department'], self.archive.values['department'])
+    
+    @cached_property
+    def hours_valid(self):
+        return ~np.isnan(self.archive.records['weekly_hours'])
+    
+    @cached_property
+    def hours(self):
+        return np.nan_to_num(self.archive.records['weekly_hours'])
+    
+    @cached_property
+    def pay_valid(self):
+        return ~np.isnan(self.archive.records['pay_min'])
+    
+    @cached_property
+    def min_pay(self):
+        return np.nan_to_num(self.archive.records['pay_min'])
+    
+    @cached_property
+    def type_matches(self):
+        matches = self.archive.records['type_matches']
+        return {pref_type: matches[:, i].astype(np.int64) for i, pref_type in enumerate(TYPE_KEYWORDS)}
+    
+    @cached_property
+    def entry_level(self):
+        return np.array(self.archive.records['entry_level'])
+    
+    @cached_property
+    def experience_required(self):
+        return np.array(self.archive.records['experience_required'])
+    
+    @cached_property
+    def advanced(self):
+        return np.array(self.archive.records['advanced'])
+    
+    @cached_property
+    def job_departments(self):
+        names = self.keyword_index.departments
+        return [names[code] if code >= 0 else '' for code in self.archive.records['department'].tolist()]
+    
+    @cached_property
+    def posting_ids(self):
+        return [posting_id(url) for url in self.archive.column('url')]
+
+
+class JobArchive:
+    def __init__(self, path):
+        """
+        Memory-mapped job archive: records are read in place, strings on demand
+
+        Opening only reads the small value lists, so it takes about the same
+        time for any number of jobs. Indexing a row builds its Job record
+        (without full_text) the first time and keeps it, so the same row
+        always gives the same object; rows maps id(job) back to its row.
+        """
+        out_dir = os.path.dirname(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            archive = json.load(f)
+        if archive['scoring_words'] != json.loads(json.dumps(_scoring_words())):
+            raise ValueError(f"{path} was built with different scoring keywords; rebuild it with job_archive.py")
+        
+        self.metadata = archive['metadata']
+        self.values = archive['values']
+        self.records = np.load(os.path.join(out_dir, RECORDS_FILE), mmap_mode='r')
+        
+        strings_path = os.path.join(out_dir, STRINGS_FILE)
+        with open(strings_path, 'rb') as f:
+            self.strings = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(strings_path) else b''
+        
+        self._jobs = {}
+        self.rows = {}
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def _text(self, span):
+        offset, length = int(span['offset']), int(span['length'])
+        if length < 0:
+            return None
+        return self.strings[offset:offset + length].decode('utf-8')
+    
+    def _load(self, row):
+        record = self.records[row]
+        job = Job()
+        job.index = int(record['index']) if record['index'] >= 0 else None
+        for name in CODE_FIELDS:
+            code = record[name]
+            setattr(job, name, self.values[name][code] if code >= 0 else None)
+        for name in NUMBER_FIELDS:
+            value = float(record[name])
+            if not np.isnan(value):
+                setattr(job, name, int(value) if value.is_integer() else value)
+        for name in TEXT_FIELDS:
+            if name not in LAZY_FIELDS:
+                setattr(job, name, self._text(record[name]))
+        return job
+    
+    def __getitem__(self, row):
+        row = int(row)
+        if row < 0:
+            row += len(self)
+        job = self._jobs.get(row)
+        if job is None:
+            job = self._jobs[row] = self._load(row)
+            self.rows[id(job)] = row
+        return job
+    
+    def __iter__(self):
+        # Fresh records, so a full scan doesn't pin every job in memory
+        for row in range(len(self)):
+            yield self._jobs.get(row) or self._load(row)
+    
+    def full_text(self, row):
+        return self._text(self.records[row]['full_text']) or ''
+    
+    def column(self, name):
+        """Every job's value of one text field, straight from the string file"""
+        return [self._text(span) for span in self.records[name]]
+    
+    def features(self):
+        return ArchiveFeatures(self)
+
+
+def _archive_source(source):
+    """Job records with full_text from scraper output, or a job store plus its text file"""
+    data = load_records(source)
+    jobs = data['jobs']
+    text_file = os.path.join(os.path.dirname(source), TEXT_FILE)
+    if any(job.full_text is None for job in jobs) and os.path.exists(text_file):
+        texts = load_full_texts(text_file)
+        if len(texts) == len(jobs):
+            for job, text in zip(jobs, texts):
+                if job.full_text is None:
+                    job.full_text = text
+    return data['metadata'], jobs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the memory-mapped job archive the recommender can open lazily")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    parser.add_argument("--out-dir", help="where to write the archive files (default: next to source)")
+    args = parser.parse_args()
+    
+    out_dir = args.out_dir or os.path.dirname(args.source) or '.'
+    metadata, jobs = _archive_source(args.source)
+    
+    start = time.perf_counter()
+    archive_path = write_archive(jobs, metadata, out_dir)
+    build_time = time.perf_counter() - start
+    
+    # Every field should come back from the archive as it went in
+    archive = JobArchive(archive_path)
+    mismatches = 0
+    for row, job in enumerate(jobs):
+        loaded = archive[row]
+        loaded.full_text = archive.full_text(row) if job.full_text is not None else None
+        if loaded.to_dict() != {name: value for name, value in job.to_dict().items() if name in FIELDS}:
+            mismatches += 1
+    
+    from brown_job_finder import JobRecommender
+    
+    timings = {}
+    for label, path in (('store', args.source), ('archive', archive_path)):
+        start = time.perf_counter()
+        recommender = JobRecommender(path)
+        opened = time.perf_counter() - start
+        recommender.get_recommendations({'hours_range': (9, 15), 'job_type': 'research'}, 10)
+        timings[label] = (opened, time.perf_counter() - start)
+    
+    size = sum(os.path.getsize(os.path.join(out_dir, name)) for name in (ARCHIVE_FILE, RECORDS_FILE, STRINGS_FILE))
+    print(f"Archived {len(jobs)} jobs in {build_time*1000:.0f} ms -> {archive_path} ({size/1024:.0f} KB, "
+          f"{RECORD_DTYPE.itemsize} bytes per record)")
+    print(f"  {mismatches} records differ after the round trip")
+    for label, (opened, first) in timings.items():
+        print(f"  {label}: open {opened*1000:.0f} ms, first top 10 after {first*1000:.0f} ms")
@@ -0,0 +1,179 @@
+import argparse
+import json
+import re
+import time
+
+# Label line -> field that takes the line after it
+FIELD_LABELS = {
+    'Job Posting Title:': 'job_title',
+    'Job Description:': 'job_description',
+    'Recruiting Start Date:': 'recruiting_start_date',
+    'Location': 'location',
+    'Department:': 'department',
+    'Grade:': 'grade',
+    'Scheduled Weekly Hours:': 'scheduled_weekly_hours',
+    'Hourly Rate:': 'hourly_range',
+    'Submission Guidelines:': 'submission_guidelines'
+}
+
+# Location also labels the campus building further down, so it keeps its first value;
+# every other field takes the last one
+FIRST_VALUE_FIELDS = {'location'}
+
+# 'Hourly Range:' opens a block whose values sit under these labels
+RANGE_LABEL = 'Hourly Range:'
+RANGE_LABELS = {
+    'Minimum:': 'minimum',
+    'Midpoint:': 'midpoint',
+    'Maximum:': 'maximum'
+}
+RANGE_WINDOW = 6  # lines after RANGE_LABEL searched for its values
+
+# Every field extract_fields can set, the typed copies from numeric_fields included
+EXTRACTED_FIELDS = set(FIELD_LABELS.values()) | {
+    'hourly_midpoint', 'hourly_range', 'weekly_hours', 'pay_min', 'pay_mid', 'pay_max'
+}
+
+# Page text starts with MENU, the job count, then the title
+TITLE_FALLBACK_LINE = 2
+
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+PAY_PATTERN = re.compile(r'\$(\d+(?:\.\d+)?)')
+
+
+def _number(text):
+    if text is None or not NUMBER_PATTERN.fullmatch(text.strip()):
+        return None
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def numeric_fields(job_data):
+    """Typed copies of hours and pay, so readers don't re-parse the display strings"""
+    numbers = {}
+    
+    hours = _number(job_data.get('scheduled_weekly_hours'))
+    if hours is not None:
+        numbers['weekly_hours'] = hours
+    
+    pay = PAY_PATTERN.findall(job_data.get('hourly_range') or '')
+    if pay:
+        numbers['pay_min'] = _number(pay[0])
+        numbers['pay_max'] = _number(pay[-1])
+    
+    midpoint = _number(job_data.get('hourly_midpoint'))
+    if midpoint is not None:
+        numbers['pay_mid'] = midpoint
+    
+    return numbers
+
+
+class JobTextExtractor:
+    def __init__(self, field_labels=FIELD_LABELS, range_labels=RANGE_LABELS):
+        """
+        Compile the label table into one regex plus a label -> handler dict
+
+        The regex only stops on whole lines that are labels and peeks at the
+        following line without consuming it, so the text is never split into
+        a line list and back-to-back labels still match. Anchoring on the
+        newline rather than a multiline ^ lets the regex engine skip ahead
+        between lines.
+        """
+        self.actions = {label: (self._field, field) for label, field in field_labels.items()}
+        self.actions[RANGE_LABEL] = (self._range_start, None)
+        for label, part in range_labels.items():
+            self.actions[label] = (self._range_value, part)
+        
+        labels = '|'.join(re.escape(label) for label in sorted(self.actions, key=len, reverse=True))
+        self.first_line = re.compile(rf'({labels})(?=\n([^\n]*))')
+        self.pattern = re.compile(rf'\n({labels})(?=\n([^\n]*))')
+    
+    def _field(self, state, field, value, position):
+        job_data = state['job']
+        if field not in FIRST_VALUE_FIELDS or field not in job_data:
+            job_data[field] = value
+    
+    def _range_start(self, state, _, value, position):
+        state['range_start'] = position
+        state['range'] = {}
+    
+    def _range_value(self, state, part, value, position):
+        # Only inside an open Hourly Range block, which closes at Maximum
+        start = state['range_start']
+        if start is None or state['text'].count('\n', start, position) > RANGE_WINDOW:
+            return
+        state['range'][part] = value
+        if part == 'midpoint':
+            state['job']['hourly_midpoint'] = value
+        elif part == 'maximum':
+            if 'minimum' in state['range']:
+                state['job']['hourly_range'] = f"${state['range']['minimum']} - ${value}"
+            state['range_start'] = None
+    
+    def extract(self, full_text):
+        """Pull the structured fields out of a job posting's page text"""
+        state = {'job': {}, 'text': full_text, 'range_start': None, 'range': {}}
+        actions = self.actions
+        
+        match = self.first_line.match(full_text)
+        if match:
+            label, value = match.groups()
+            handler, arg = actions[label]
+            handler(state, arg, value, 0)
+        
+        # Matches start on the newline that ends the previous line
+        for match in self.pattern.finditer(full_text):
+            label, value = match.groups()
+            handler, arg = actions[label]
+            handler(state, arg, value, match.start() + 1)
+        
+        job_data = state['job']
+        if 'job_title' not in job_data:
+            lines = full_text.split('\n', TITLE_FALLBACK_LINE + 1)
+            if len(lines) > TITLE_FALLBACK_LINE + 1:
+                job_data['job_title'] = lines[TITLE_FALLBACK_LINE]
+        
+        job_data.update(numeric_fields(job_data))
+        return job_data
+
+
+_extractor = JobTextExtractor()
+
+
+def extract_fields(full_text):
+    """Pull the structured fields out of a job posting's page text"""
+    return _extractor.extract(full_text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark field extraction over stored posting text")
+    parser.add_argument("source", nargs="?", default="brown_jobs_2025_final.json", help="scraper output JSON")
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the dataset")
+    args = parser.parse_args()
+    
+    with open(args.source, 'r', encoding='utf-8') as f:
+        jobs = json.load(f)['jobs']
+    texts = [job.get('full_text', '') for job in jobs]
+    total_bytes = sum(len(text.encode('utf-8')) for text in texts)
+    
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        extracted = [extract_fields(text) for text in texts]
+    elapsed = (time.perf_counter() - start) / args.repeat
+    
+    # Fields the scraper stored at scrape time should come back unchanged
+    mismatches = 0
+    for job, fields in zip(jobs, extracted):
+        for field in set(FIELD_LABELS.values()) & set(job):
+            if fields.get(field) != job[field]:
+                mismatches += 1
+    
+    found = {field: sum(1 for fields in extracted if field in fields)
+             for field in list(FIELD_LABELS.values()) + ['hourly_midpoint']}
+    
+    print(f"Extracted {len(texts)} postings ({total_bytes/1024:.0f} KB) in {elapsed*1000:.1f} ms")
+    print(f"  {len(texts)/elapsed:,.0f} postings/s, {total_bytes/elapsed/1024/1024:.1f} MB/s, "
+          f"{elapsed/len(texts)*1e6:.0f} µs per posting")
+    print(f"  {mismatches} field mismatches against stored records")
+    for field, count in found.items():
+        print(f"  {field}: {count}/{len(texts)}")
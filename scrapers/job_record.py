@@ -0,0 +1,239 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from job_extractor import PAY_PATTERN, numeric_fields
+from job_store import STORE_FILE, posting_id
+
+# Every field a scraped job can carry, in scraper output order
+FIELDS = ('url', 'scraped_at', 'full_text', 'job_description', 'recruiting_start_date', 'job_title',
+          'department', 'hourly_range', 'scheduled_weekly_hours', 'location', 'index', 'preview',
+          'grade', 'hourly_midpoint', 'submission_guidelines', 'weekly_hours', 'pay_min', 'pay_max', 'pay_mid')
+
+# Repeated across postings, so every record shares one copy of each value
+INTERNED_FIELDS = {'department', 'location', 'hourly_range', 'scheduled_weekly_hours',
+                   'recruiting_start_date', 'grade', 'hourly_midpoint', 'submission_guidelines'}
+
+_FIELD_SET = set(FIELDS)
+_POSITIONS = {name: i for i, name in enumerate(FIELDS)}
+_INTERNED_POSITIONS = [_POSITIONS[name] for name in FIELDS if name in INTERNED_FIELDS]
+_HOURS, _PAY_MIN, _PAY_MID = _POSITIONS['weekly_hours'], _POSITIONS['pay_min'], _POSITIONS['pay_mid']
+_HOURS_TEXT, _RANGE_TEXT, _MID_TEXT = (_POSITIONS['scheduled_weekly_hours'], _POSITIONS['hourly_range'],
+                                       _POSITIONS['hourly_midpoint'])
+
+
+def job_id(url):
+    """Stable integer ID of a posting URL: the Workday '9925$32737' pair packed into one int"""
+    pid = posting_id(url)
+    if pid is None:
+        return None
+    kind, instance = pid.split('$')
+    return int(kind) << 32 | int(instance)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Typed hours and pay per (hours, range, midpoint) strings; postings share a handful of each
+_numbers = {}
+
+
+def _numeric(hours, hourly_range, midpoint):
+    """
+    Typed fields for a record saved before job_extractor emitted them
+
+    Hours and minimum pay are read the way the recommender always read the
+    display strings: hours only as a whole number (a missing value counts
+    as 0), so "37.5" stays unknown, and pay from the first dollar amount.
+    Freshly extracted records type "37.5" as 37.5 instead.
+    """
+    key = (hours, hourly_range, midpoint)
+    numbers = _numbers.get(key)
+    if numbers is None:
+        numbers = numeric_fields({'hourly_range': hourly_range, 'hourly_midpoint': midpoint})
+        try:
+            numbers['weekly_hours'] = int(hours if hours is not None else '0')
+        except (TypeError, ValueError):
+            pass
+        match = PAY_PATTERN.search(hourly_range if hourly_range is not None else '$0 - $0')
+        if match:
+            numbers['pay_min'] = float(match.group(1))
+        _numbers[key] = numbers
+    return numbers
+
+
+@dataclass(slots=True, eq=False)
+class Job:
+    """
+    One job posting with fixed slots instead of a per-record dict
+
+    Missing fields are None and are left out again by to_dict, so a
+    record round-trips the scraper JSON. Hours and pay are typed numbers
+    parsed once on load, and id is the posting's stable integer ID.
+    get/[]/in behave like the dict records, for code that still takes
+    either.
+    """
+    url: Optional[str] = None
+    scraped_at: Optional[str] = None
+    full_text: Optional[str] = None
+    job_description: Optional[str] = None
+    recruiting_start_date: Optional[str] = None
+    job_title: Optional[str] = None
+    department: Optional[str] = None
+    hourly_range: Optional[str] = None
+    scheduled_weekly_hours: Optional[str] = None
+    location: Optional[str] = None
+    index: Optional[int] = None
+    preview: Optional[str] = None
+    grade: Optional[str] = None
+    hourly_midpoint: Optional[str] = None
+    submission_guidelines: Optional[str] = None
+    weekly_hours: Optional[float] = None
+    pay_min: Optional[float] = None
+    pay_max: Optional[float] = None
+    pay_mid: Optional[float] = None
+    extra: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_dict(cls, data):
+        values = list(map(data.get, FIELDS))
+        for i in _INTERNED_POSITIONS:
+            if values[i] is not None:
+                values[i] = _intern(values[i])
+        
+        # Records saved before the typed fields existed get them parsed here, once
+        if values[_HOURS] is None and values[_PAY_MIN] is None and values[_PAY_MID] is None:
+            numbers = _numeric(values[_HOURS_TEXT], values[_RANGE_TEXT], values[_MID_TEXT])
+            for name, value in numbers.items():
+                values[_POSITIONS[name]] = value
+        
+        extra = None
+        if not _FIELD_SET.issuperset(data):
+            extra = {name: value for name, value in data.items() if name not in _FIELD_SET}
+        return cls(*values, extra)
+    
+    @property
+    def id(self):
+        return job_id(self.url)
+    
+    @classmethod
+    def coerce(cls, job):
+        return job if isinstance(job, cls) else cls.from_dict(job)
+    
+    def to_dict(self):
+        data = {}
+        for name in FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+    
+    def get(self, name, default=None):
+        value = getattr(self, name) if name in _FIELD_SET else (self.extra or {}).get(name)
+        return default if value is None else value
+    
+    def __getitem__(self, name):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+    
+    def __setitem__(self, name, value):
+        if name in _FIELD_SET:
+            setattr(self, name, _intern(value) if name in INTERNED_FIELDS else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+    
+    def __contains__(self, name):
+        return self.get(name) is not None
+    
+    def __repr__(self):
+        return f"Job(id={self.id}, job_title={self.job_title!r})"
+
+
+def jobs_from_store(store):
+    """Records straight from a columnar store, without building a dict per job first"""
+    columns = store['columns']
+    dictionaries = store['dictionaries']
+    url_prefix = store['metadata'].get('url_prefix', '')
+    total = store['metadata']['total_jobs']
+    
+    values = []
+    for name in FIELDS:
+        column = columns.get(name)
+        if column is None:
+            column = [None] * total
+        elif name in dictionaries:
+            # Decoding through the value list already shares one string per distinct value
+            lookup = [_intern(value) for value in dictionaries[name]]
+            column = [lookup[code] for code in column]
+        if name == 'url':
+            column = [url_prefix + v if v is not None else v for v in column]
+        values.append(column)
+    
+    # Stores built before the typed columns existed get them parsed here, once per distinct value
+    if not any(name in columns for name in ('weekly_hours', 'pay_min', 'pay_mid')):
+        texts = zip(values[_HOURS_TEXT], values[_RANGE_TEXT], values[_MID_TEXT])
+        for row, numbers in enumerate(_numeric(*text) for text in texts):
+            for name, value in numbers.items():
+                values[_POSITIONS[name]][row] = value
+    
+    return list(map(Job, *values))
+
+
+def load_records(path):
+    """Like job_store.load_jobs, with the jobs as Job records"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if 'columns' in data:
+        return {'metadata': data['metadata'], 'jobs': jobs_from_store(data)}
+    return dict(data, jobs=[Job.from_dict(job) for job in data['jobs']])
+
+
+def _load_stats(load, path, repeat=3):
+    """(jobs, best load time, bytes held by the loaded jobs)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(path)
+        best = min(best, time.perf_counter() - start)
+    
+    # Timed apart from the tracing, which slows allocation down
+    tracemalloc.start()
+    jobs = load(path)['jobs']
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return jobs, best, size
+
+
+if __name__ == "__main__":
+    from job_store import load_jobs
+    
+    parser = argparse.ArgumentParser(description="Compare loading jobs as dicts and as Job records")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    args = parser.parse_args()
+    
+    dicts, dict_time, dict_size = _load_stats(load_jobs, args.source)
+    records, record_time, record_size = _load_stats(load_records, args.source)
+    
+    # Everything the dicts carry should come back from the records
+    mismatches = sum(
+        1 for job, record in zip(dicts, records)
+        if any(record.get(name) != value for name, value in job.items())
+    )
+    
+    print(f"Loaded {len(records)} jobs from {args.source}")
+    print(f"  dicts:   {dict_time*1000:.0f} ms, {dict_size/1024/1024:.1f} MB ({dict_size/len(dicts):.0f} bytes/job)")
+    print(f"  records: {record_time*1000:.0f} ms, {record_size/1024/1024:.1f} MB "
+          f"({record_size/len(records):.0f} bytes/job)")
+    print(f"  {mismatches} records differ from their dicts")
@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import re
+import time
+from collections import Counter
+
+# Record fields kept as columns, in scraper output order
+COLUMNS = ['url', 'scraped_at', 'job_description', 'recruiting_start_date', 'job_title',
+           'department', 'hourly_range', 'scheduled_weekly_hours', 'location', 'index', 'preview',
+           'grade', 'hourly_midpoint', 'submission_guidelines',
+           'weekly_hours', 'pay_min', 'pay_mid', 'pay_max']
+
+# Low-cardinality columns stored as codes into a shared value list
+DICTIONARY_COLUMNS = ['department', 'location', 'hourly_range', 'scheduled_weekly_hours',
+                      'recruiting_start_date', 'grade', 'hourly_midpoint', 'submission_guidelines',
+                      'weekly_hours', 'pay_min', 'pay_mid', 'pay_max']
+
+STORE_FILE = 'jobs_store.json'
+TEXT_FILE = 'jobs_fulltext.json'
+
+POSTING_ID_PATTERN = re.compile(r'/(\d+\$\d+)\.htmld')
+
+
+def posting_id(url):
+    """Workday instance ID of a posting URL, e.g. '9925$32737'"""
+    matches = POSTING_ID_PATTERN.findall(url or '')
+    return matches[-1] if matches else None
+
+
+def _common_prefix(values):
+    values = [v for v in values if v]
+    if not values:
+        return ''
+    prefix = os.path.commonprefix(values)
+    # Keep the posting ID whole
+    return prefix[:prefix.rfind('$') + 1] if '$' in prefix else prefix
+
+
+def build_store(data):
+    """Split scraper output into a columnar store and a separate full-text table"""
+    jobs = data['jobs']
+    
+    url_prefix = _common_prefix([job.get('url', '') for job in jobs])
+    columns = {}
+    dictionaries = {}
+    
+    for name in COLUMNS:
+        values = [job.get(name) for job in jobs]
+        if name == 'url':
+            values = [v[len(url_prefix):] if v else v for v in values]
+        
+        if name in DICTIONARY_COLUMNS:
+            lookup = {}
+            codes = []
+            for value in values:
+                if value not in lookup:
+                    lookup[value] = len(lookup)
+                codes.append(lookup[value])
+            dictionaries[name] = list(lookup)
+            columns[name] = codes
+        else:
+            columns[name] = values
+    
+    store = {
+        'metadata': dict(data.get('metadata', {}), total_jobs=len(jobs), url_prefix=url_prefix),
+        'dictionaries': dictionaries,
+        'columns': columns
+    }
+    
+    # Any line shared by two or more postings (labels, EEO boilerplate...) is stored once
+    line_counts = Counter()
+    for job in jobs:
+        line_counts.update(set(job.get('full_text', '').split('\n')))
+    
+    blocks = {}
+    texts = []
+    for job in jobs:
+        parts = []
+        for line in job.get('full_text', '').split('\n'):
+            if line_counts[line] > 1:
+                if line not in blocks:
+                    blocks[line] = len(blocks)
+                parts.append(blocks[line])
+            elif parts and isinstance(parts[-1], str):
+                parts[-1] += '\n' + line
+            else:
+                parts.append(line)
+        texts.append(parts)
+    
+    full_text = {'blocks': list(blocks), 'texts': texts}
+    return store, full_text
+
+
+def write_store(data, out_dir):
+    """Build the store from scraper output and write both files to out_dir"""
+    store, full_text = build_store(data)
+    
+    store_path = os.path.join(out_dir, STORE_FILE)
+    text_path = os.path.join(out_dir, TEXT_FILE)
+    with open(store_path, 'w', encoding='utf-8') as f:
+        json.dump(store, f, ensure_ascii=False, separators=(',', ':'))
+    with open(text_path, 'w', encoding='utf-8') as f:
+        json.dump(full_text, f, ensure_ascii=False, separators=(',', ':'))
+    
+    return store_path, text_path
+
+
+def decode_store(store):
+    """Turn a columnar store back into the scraper's {'metadata', 'jobs'} layout, without full_text"""
+    columns = store['columns']
+    dictionaries = store['dictionaries']
+    url_prefix = store['metadata'].get('url_prefix', '')
+    
+    decoded = {}
+    for name, values in columns.items():
+        if name in dictionaries:
+            lookup = dictionaries[name]
+            values = [lookup[code] for code in values]
+        if name == 'url':
+            values = [url_prefix + v if v is not None else v for v in values]
+        decoded[name] = values
+    
+    jobs = []
+    for i in range(store['metadata']['total_jobs']):
+        job = {}
+        for name, values in decoded.items():
+            if values[i] is not None:
+                job[name] = values[i]
+        jobs.append(job)
+    
+    return {'metadata': store['metadata'], 'jobs': jobs}
+
+
+def load_jobs(path):
+    """Load jobs from either a compact store or a raw scraper output file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if 'columns' in data:
+        return decode_store(data)
+    return data
+
+
+def load_full_texts(path):
+    """Rebuild every posting's full_text from the lazily loaded text file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        full_text = json.load(f)
+    
+    blocks = full_text['blocks']
+    return [
+        '\n'.join(blocks[part] if isinstance(part, int) else part for part in parts)
+        for parts in full_text['texts']
+    ]
+
+
+def _parse_time(path, repeat=20):
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = f.read()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        json.loads(raw)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the compact job store from scraper output")
+    parser.add_argument("source", nargs="?", default="brown_jobs_2025_final.json", help="scraper output JSON")
+    parser.add_argument("--out-dir", default=".", help="where to write the store files")
+    args = parser.parse_args()
+    
+    with open(args.source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    store_path, text_path = write_store(data, args.out_dir)
+    
+    # Check the round trip before reporting
+    jobs = load_jobs(store_path)['jobs']
+    texts = load_full_texts(text_path)
+    for original, job, text in zip(data['jobs'], jobs, texts):
+        assert text == original.get('full_text', ''), f"full_text mismatch for job {original.get('index')}"
+        for name in COLUMNS:
+            assert job.get(name) == original.get(name), f"{name} mismatch for job {original.get('index')}"
+    
+    source_size = os.path.getsize(args.source)
+    store_size = os.path.getsize(store_path)
+    text_size = os.path.getsize(text_path)
+    
+    print(f"Built store for {len(jobs)} jobs")
+    print(f"  {args.source}: {source_size/1024:.0f} KB, parse {_parse_time(args.source):.1f} ms")
+    print(f"  {store_path}: {store_size/1024:.0f} KB, parse {_parse_time(store_path):.1f} ms (loaded up front)")
+    print(f"  {text_path}: {text_size/1024:.0f} KB (loaded on demand)")
+    print(f"  Up-front transfer cut by {100 - store_size / source_size * 100:.0f}%")
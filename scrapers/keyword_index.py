@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from job_store import STORE_FILE, load_jobs, posting_id
+
+INDEX_FILE = 'keyword_index.json'
+SECTIONS = ('type', 'department', 'experience')
+
+
+def build_keyword_index(jobs, keywords):
+    """
+    Map every scoring keyword to the rows (positions in jobs) it matches
+
+    keywords maps each section to its keyword list. 'type' keywords are
+    matched against the title or description, 'department' keywords
+    against the department and 'experience' words against description +
+    title, exactly as calculate_job_score does.
+    """
+    index = {'posting_ids': [posting_id(job.get('url')) for job in jobs]}
+    for section in SECTIONS:
+        index[section] = {keyword: [] for keyword in keywords[section]}
+    
+    for row, job in enumerate(jobs):
+        job_title = job.get('job_title', '').lower()
+        job_desc = job.get('job_description', '').lower()
+        job_dept = job.get('department', '').lower()
+        desc_text = (job.get('job_description', '') + ' ' + job.get('job_title', '')).lower()
+        
+        for keyword, rows in index['type'].items():
+            if keyword in job_title or keyword in job_desc:
+                rows.append(row)
+        for keyword, rows in index['department'].items():
+            if keyword in job_dept:
+                rows.append(row)
+        for keyword, rows in index['experience'].items():
+            if keyword in desc_text:
+                rows.append(row)
+    
+    return index
+
+
+def write_keyword_index(jobs, keywords, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(build_keyword_index(jobs, keywords), f, separators=(',', ':'))
+
+
+class KeywordIndex:
+    def __init__(self, index):
+        """Posting sets for every keyword, held as sorted arrays of rows"""
+        self.posting_ids = index['posting_ids']
+        self.size = len(self.posting_ids)
+        self.sections = {
+            section: {keyword: np.array(rows, dtype=np.int64) for keyword, rows in index[section].items()}
+            for section in SECTIONS
+        }
+    
+    @classmethod
+    def for_jobs(cls, jobs, keywords, path):
+        """Load the saved index if it matches jobs and keywords, otherwise build one in memory"""
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if (index['posting_ids'] == [posting_id(job.get('url')) for job in jobs]
+                    and all(list(index[section]) == list(keywords[section]) for section in SECTIONS)):
+                return cls(index)
+        return cls(build_keyword_index(jobs, keywords))
+    
+    def rows(self, section, keyword):
+        """Rows matching keyword, or None if the keyword isn't indexed"""
+        return self.sections[section].get(keyword)
+    
+    def bitmap(self, section, keyword):
+        """Boolean mask over all rows for one keyword"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.sections[section][keyword]] = True
+        return mask
+    
+    def any_of(self, section, keywords):
+        """Rows matching at least one of keywords"""
+        if not keywords:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([self.sections[section][keyword] for keyword in keywords]))
+    
+    def all_of(self, section, keywords):
+        """Rows matching every one of keywords"""
+        rows = None
+        for keyword in keywords:
+            keyword_rows = self.sections[section][keyword]
+            rows = keyword_rows if rows is None else np.intersect1d(rows, keyword_rows, assume_unique=True)
+        return rows if rows is not None else np.arange(self.size)
+    
+    def match_counts(self, section, keywords):
+        """Number of keywords each row matches"""
+        if not keywords:
+            return np.zeros(self.size, dtype=np.int64)
+        rows = np.concatenate([self.sections[section][keyword] for keyword in keywords])
+        return np.bincount(rows, minlength=self.size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the keyword index that sits next to the job dataset")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    parser.add_argument("--out", help=f"index path (default: {INDEX_FILE} next to source)")
+    args = parser.parse_args()
+    
+    from scoring import INDEX_KEYWORDS
+    
+    out = args.out or os.path.join(os.path.dirname(args.source), INDEX_FILE)
+    jobs = load_jobs(args.source)['jobs']
+    
+    start = time.perf_counter()
+    write_keyword_index(jobs, INDEX_KEYWORDS, out)
+    elapsed = time.perf_counter() - start
+    
+    print(f"Indexed {len(jobs)} jobs in {elapsed*1000:.0f} ms -> {out} ({os.path.getsize(out)/1024:.0f} KB)")
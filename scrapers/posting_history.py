@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from job_record import Job
+from job_store import posting_id
+
+HISTORY_FILE = 'posting_history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrapes (
+    scrape_id INTEGER PRIMARY KEY,
+    scraped_at TEXT NOT NULL UNIQUE,
+    source TEXT,
+    total_jobs INTEGER
+);
+CREATE TABLE IF NOT EXISTS postings (
+    posting_id TEXT PRIMARY KEY,
+    job_id INTEGER,
+    url TEXT,
+    job_title TEXT,
+    department TEXT,
+    recruiting_start_date TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    closed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    posting_id TEXT NOT NULL,
+    scrape_id INTEGER NOT NULL,
+    scraped_at TEXT,
+    job_title TEXT,
+    department TEXT,
+    location TEXT,
+    hourly_range TEXT,
+    weekly_hours REAL,
+    pay_min REAL,
+    pay_mid REAL,
+    pay_max REAL,
+    recruiting_start_date TEXT,
+    preview TEXT,
+    PRIMARY KEY (posting_id, scrape_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_start ON postings (recruiting_start_date);
+CREATE INDEX IF NOT EXISTS postings_first_seen ON postings (first_seen);
+CREATE INDEX IF NOT EXISTS postings_closed ON postings (closed_at);
+CREATE INDEX IF NOT EXISTS snapshots_scrape ON snapshots (scrape_id);
+CREATE INDEX IF NOT EXISTS snapshots_department ON snapshots (department, scraped_at);
+"""
+
+# A later scrape wins for the descriptive fields; the seen range only ever widens, and
+# a closed posting only reopens when a scrape after its close lists it again
+UPSERT_POSTING = """
+INSERT INTO postings (posting_id, job_id, url, job_title, department, recruiting_start_date, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (posting_id) DO UPDATE SET
+    url = CASE WHEN excluded.last_seen >= last_seen THEN excluded.url ELSE url END,
+    job_title = CASE WHEN excluded.last_seen >= last_seen THEN excluded.job_title ELSE job_title END,
+    department = CASE WHEN excluded.last_seen >= last_seen THEN excluded.department ELSE department END,
+    recruiting_start_date = coalesce(excluded.recruiting_start_date, recruiting_start_date),
+    first_seen = min(first_seen, excluded.first_seen),
+    last_seen = max(last_seen, excluded.last_seen),
+    closed_at = CASE WHEN closed_at IS NOT NULL AND excluded.last_seen > closed_at THEN NULL ELSE closed_at END
+"""
+
+UPSERT_SNAPSHOT = """
+INSERT OR REPLACE INTO snapshots (posting_id, scrape_id, scraped_at, job_title, department, location, hourly_range,
+                                  weekly_hours, pay_min, pay_mid, pay_max, recruiting_start_date, preview)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# strftime formats for median_pay periods
+PERIODS = {
+    'day': '%Y-%m-%d',
+    'week': '%Y-W%W',
+    'month': '%Y-%m'
+}
+
+
+class _Median:
+    """SQLite aggregate: median of the non-NULL values"""
+    def __init__(self):
+        self.values = []
+    
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+    
+    def finalize(self):
+        return statistics.median(self.values) if self.values else None
+
+
+class PostingHistory:
+    def __init__(self, path=HISTORY_FILE):
+        """
+        Append-only SQLite history of every scrape, keyed by Workday posting ID
+
+        postings holds one row per posting with the span it was listed for
+        (first_seen, last_seen, closed_at); snapshots keeps what each scrape
+        saw, so pay and titles can be followed over time.
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.create_aggregate('median', 1, _Median)
+    
+    def close(self):
+        self.conn.close()
+    
+    def ingest(self, data, source=None, complete=True):
+        """
+        Upsert one scraper output file in a single transaction
+
+        A complete scrape also closes every open posting it no longer lists,
+        dated by this scrape. Ingesting the same scrape again replaces its
+        snapshots instead of adding new ones. Returns (scrape_id, postings
+        upserted, postings closed).
+        """
+        jobs = [Job.coerce(job) for job in data['jobs']]
+        scraped_at = data.get('metadata', {}).get('scrape_date') or max(
+            (job.scraped_at for job in jobs if job.scraped_at), default=datetime.now().isoformat())
+        
+        postings = []
+        snapshots = []
+        for job in jobs:
+            pid = posting_id(job.url)
+            if pid is None:
+                continue
+            postings.append((pid, job.id, job.url, job.job_title, job.department, job.recruiting_start_date,
+                             scraped_at, scraped_at))
+            snapshots.append((pid, scraped_at, job.job_title, job.department, job.location,
+                              job.hourly_range, job.weekly_hours, job.pay_min, job.pay_mid, job.pay_max,
+                              job.recruiting_start_date, job.preview))
+        
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO scrapes (scraped_at, source, total_jobs) VALUES (?, ?, ?) "
+                "ON CONFLICT (scraped_at) DO UPDATE SET source = excluded.source, total_jobs = excluded.total_jobs",
+                (scraped_at, source, len(jobs)))
+            scrape_id = self.conn.execute("SELECT scrape_id FROM scrapes WHERE scraped_at = ?",
+                                          (scraped_at,)).fetchone()[0]
+            
+            self.conn.executemany(UPSERT_POSTING, postings)
+            self.conn.executemany(UPSERT_SNAPSHOT, [(pid, scrape_id, *fields) for pid, *fields in snapshots])
+            
+            closed = 0
+            latest = self.conn.execute("SELECT max(scraped_at) FROM scrapes").fetchone()[0]
+            if complete and scraped_at == latest:
+                closed = self.conn.execute(
+                    "UPDATE postings SET closed_at = ? WHERE closed_at IS NULL AND last_seen < ?",
+                    (scraped_at, scraped_at)).rowcount
+        
+        return scrape_id, len(postings), closed
+    
+    def recent(self, days=7, now=None):
+        """Postings opened in the last days days, newest first, by recruiting start (else first seen)"""
+        now = now or datetime.now()
+        since = (now - timedelta(days=days)).date().isoformat()
+        return self.conn.execute(
+            """
+            SELECT posting_id, job_title, department, coalesce(recruiting_start_date, substr(first_seen, 1, 10)) AS opened,
+                   closed_at, url
+            FROM postings
+            WHERE recruiting_start_date >= :since
+               OR (recruiting_start_date IS NULL AND first_seen >= :since)
+            ORDER BY opened DESC, posting_id
+            """, {'since': since}).fetchall()
+    
+    def median_pay(self, period='month', department=None):
+        """(department, period, postings, median hourly pay), each posting counted once per period"""
+        query = """
+            SELECT department, period, count(*), median(pay)
+            FROM (
+                SELECT posting_id, department, strftime(:format, scraped_at) AS period,
+                       coalesce(pay_mid, (pay_min + pay_max) / 2.0, pay_min) AS pay, max(scrape_id)
+                FROM snapshots
+                WHERE :department IS NULL OR department = :department
+                GROUP BY posting_id, period
+            )
+            GROUP BY department, period
+            ORDER BY department, period
+        """
+        return self.conn.execute(query, {'format': PERIODS[period], 'department': department}).fetchall()
+    
+    def time_to_close(self, department=None):
+        """(department, postings closed, median days, longest days) from opening to the first scrape without it"""
+        return self.conn.execute(
+            """
+            SELECT department, count(*), median(days), max(days)
+            FROM (
+                SELECT department,
+                       julianday(closed_at) - julianday(coalesce(recruiting_start_date, first_seen)) AS days
+                FROM postings
+                WHERE closed_at IS NOT NULL AND (:department IS NULL OR department = :department)
+            )
+            GROUP BY department
+            ORDER BY department
+            """, {'department': department}).fetchall()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep every scrape in a posting history and query it over time")
+    parser.add_argument("--db", default=HISTORY_FILE, help="history database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    ingest_parser = commands.add_parser("ingest", help="add scraper output files to the history")
+    ingest_parser.add_argument("sources", nargs="+", help="scraper output JSON, oldest first")
+    ingest_parser.add_argument("--partial", action="store_true",
+                               help="the scrape didn't cover the whole listing, so don't close missing postings")
+    
+    recent_parser = commands.add_parser("recent", help="postings opened in the last few days")
+    recent_parser.add_argument("--days", type=int, default=7)
+    
+    pay_parser = commands.add_parser("pay", help="median hourly pay by department over time")
+    pay_parser.add_argument("--period", choices=list(PERIODS), default="month")
+    pay_parser.add_argument("--department")
+    
+    close_parser = commands.add_parser("close", help="time from opening to close by department")
+    close_parser.add_argument("--department")
+    args = parser.parse_args()
+    
+    history = PostingHistory(args.db)
+    start = time.perf_counter()
+    
+    if args.command == "ingest":
+        for source in args.sources:
+            with open(source, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            scrape_start = time.perf_counter()
+            scrape_id, upserted, closed = history.ingest(data, os.path.basename(source), not args.partial)
+            print(f"Scrape {scrape_id} from {source}: {upserted} postings upserted, {closed} closed "
+                  f"in {(time.perf_counter() - scrape_start)*1000:.0f} ms")
+    
+    elif args.command == "recent":
+        rows = history.recent(args.days)
+        for pid, title, department, opened, closed_at, url in rows:
+            status = f" (closed {closed_at[:10]})" if closed_at else ""
+            print(f"{opened}  {title}{status}")
+            print(f"            {department}  {url}")
+        print(f"\n{len(rows)} postings opened in the last {args.days} days")
+    
+    elif args.command == "pay":
+        for department, period, count, median in history.median_pay(args.period, args.department):
+            pay = f"${median:.2f}" if median is not None else "n/a"
+            print(f"{period}  {pay:>7}  ({count} postings)  {department}")
+    
+    elif args.command == "close":
+        for department, count, median, longest in history.time_to_close(args.department):
+            print(f"{median:6.1f} days median, {longest:6.1f} max  ({count} closed)  {department}")
+    
+    history.close()
+    print(f"({(time.perf_counter() - start)*1000:.0f} ms)")
@@ -0,0 +1,172 @@
+import argparse
+import itertools
+import os
+import time
+
+import numpy as np
+
+from job_store import STORE_FILE, load_jobs
+from keyword_index import INDEX_FILE, KeywordIndex
+from scoring import (
+    COMPONENTS, MAX_SCORE, HOURS_OPTIONS, PAY_OPTIONS, TYPE_OPTIONS, INTEREST_OPTIONS, EXPERIENCE_OPTIONS,
+    INDEX_KEYWORDS, JobFeatures, score_jobs
+)
+
+RANKINGS_FILE = 'ranking_cache.npz'
+
+# Components summed into the cached base score; they come first in COMPONENTS so the
+# base is exactly the partial sum score_jobs builds
+BASE_COMPONENTS = ('hours', 'pay', 'type')
+
+
+def _key(hours_range, pay_range, job_type):
+    return tuple(hours_range), tuple(pay_range), job_type
+
+
+class RankingCache:
+    def __init__(self, features):
+        """
+        Base scores and best-first row orders for every (hours, pay, type) answer
+
+        A query only adds the department and experience terms and reads
+        rows in presorted base order, stopping once the unseen rows can no
+        longer reach the top k. Department matches per interest keyword come
+        from the keyword index.
+        """
+        self.features = features
+        self.combos = [
+            _key(hours[3], pay[3], job_type[3])
+            for hours, pay, job_type in itertools.product(HOURS_OPTIONS, PAY_OPTIONS, TYPE_OPTIONS)
+        ]
+        self.bases = {}
+        self.orders = {}
+        self.base_components = COMPONENTS[:len(BASE_COMPONENTS)]
+        self.rest_components = COMPONENTS[len(BASE_COMPONENTS):]
+        assert tuple(name for name, _, _, _, _, _ in self.base_components) == BASE_COMPONENTS
+    
+    def _build_base(self, key):
+        base = np.zeros(self.features.size)
+        for (_, weight, _, points, _, _), value in zip(self.base_components, key):
+            base += points(self.features, value, weight)
+        self.bases[key] = base
+        self.orders[key] = np.lexsort((np.arange(self.features.size), -base))
+    
+    def build(self):
+        """Precompute every questionnaire combination"""
+        for key in self.combos:
+            if key not in self.bases:
+                self._build_base(key)
+        return self
+    
+    def save(self, path):
+        self.build()
+        np.savez(path,
+                 posting_ids=np.array([pid or '' for pid in self.features.posting_ids]),
+                 bases=np.stack([self.bases[key] for key in self.combos]),
+                 orders=np.stack([self.orders[key] for key in self.combos]).astype(np.int32))
+    
+    def load(self, path):
+        """Use a saved cache if it was built from this exact job list"""
+        if not os.path.exists(path):
+            return False
+        
+        saved = np.load(path)
+        if saved['posting_ids'].tolist() != [pid or '' for pid in self.features.posting_ids]:
+            return False
+        if len(saved['bases']) != len(self.combos):
+            return False
+        
+        for key, base, order in zip(self.combos, saved['bases'], saved['orders']):
+            self.bases[key] = base
+            self.orders[key] = order.astype(np.int64)
+        return True
+    
+    def top_k(self, preferences, k):
+        """
+        Rows of the k best jobs plus every job's score, like score_jobs + top_k
+
+        Answers outside the questionnaire (custom ranges) are scored in full.
+        """
+        n = self.features.size
+        base_values = [preferences.get(key, default) for _, _, key, _, _, default in self.base_components]
+        try:
+            key = _key(*base_values)
+        except TypeError:
+            key = None
+        if key not in self.combos:
+            scores = score_jobs(self.features, preferences)
+            chosen = np.arange(n)
+            return chosen[np.lexsort((chosen, -scores))][:max(k, 0)], scores
+        if key not in self.bases:
+            self._build_base(key)
+        
+        base, order = self.bases[key], self.orders[key]
+        total = base.copy()
+        rest_max = []
+        for _, weight, pref_key, points, _, default in self.rest_components:
+            term = points(self.features, preferences.get(pref_key, default), weight)
+            total += term
+            rest_max.append(term.max() if n else 0.0)
+        scores = (total / MAX_SCORE) * 100
+        if k <= 0:
+            return np.arange(0), scores
+        
+        # Walk the rows in base order until no unseen row can beat the current k-th score
+        seen = min(n, max(2 * k, 64))
+        while True:
+            rows = order[:seen]
+            chosen = rows[np.lexsort((rows, -scores[rows]))][:k]
+            if seen >= n:
+                return chosen, scores
+            
+            best_unseen = base[order[seen]]
+            for term_max in rest_max:
+                best_unseen += term_max
+            if len(chosen) == k and best_unseen / MAX_SCORE * 100 < scores[chosen[-1]]:
+                return chosen, scores
+            seen = min(n, seen * 2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute base scores and rankings for every questionnaire answer")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    parser.add_argument("--out", help=f"cache path (default: {RANKINGS_FILE} next to source)")
+    args = parser.parse_args()
+    
+    out = args.out or os.path.join(os.path.dirname(args.source), RANKINGS_FILE)
+    jobs = load_jobs(args.source)['jobs']
+    index_file = os.path.join(os.path.dirname(args.source), INDEX_FILE)
+    features = JobFeatures(jobs, KeywordIndex.for_jobs(jobs, INDEX_KEYWORDS, index_file))
+    
+    start = time.perf_counter()
+    cache = RankingCache(features).build()
+    build_time = time.perf_counter() - start
+    cache.save(out)
+    
+    # Time a spread of answers both ways and check they agree
+    queries = []
+    for hours, pay, job_type, experience in itertools.product(HOURS_OPTIONS, PAY_OPTIONS, TYPE_OPTIONS,
+                                                                EXPERIENCE_OPTIONS):
+        interest = INTEREST_OPTIONS[len(queries) % len(INTEREST_OPTIONS)]
+        queries.append({
+            'hours_range': hours[3], 'pay_range': pay[3], 'job_type': job_type[3],
+            'department_keywords': interest[3], 'experience_level': experience[3]
+        })
+    
+    start = time.perf_counter()
+    full = []
+    for preferences in queries:
+        scores = score_jobs(features, preferences)
+        rows = np.arange(len(scores))
+        full.append(rows[np.lexsort((rows, -scores))][:10])
+    full_time = (time.perf_counter() - start) / len(queries)
+    
+    start = time.perf_counter()
+    cached = [cache.top_k(preferences, 10)[0] for preferences in queries]
+    cached_time = (time.perf_counter() - start) / len(queries)
+    
+    mismatches = sum(not np.array_equal(a, b) for a, b in zip(full, cached))
+    print(f"Cached {len(cache.combos)} answer combinations for {len(jobs)} jobs in {build_time*1000:.0f} ms "
+          f"-> {out} ({os.path.getsize(out)/1024:.0f} KB)")
+    print(f"Top 10: {full_time*1000:.2f} ms scoring + sorting, {cached_time*1000:.2f} ms from the cache "
+          f"({mismatches} mismatches over {len(queries)} answers)")
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from job_extractor import EXTRACTED_FIELDS, extract_fields
+
+
+def iter_journal(path):
+    """Jobs from a scrape journal, skipping torn lines"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def read_dataset(path):
+    """
+    (metadata, jobs, removed_jobs) from scraper output JSON or a scrape journal (JSONL)
+
+    Either way every job is read into memory, since the upgraded dataset is
+    written back as one JSON document.
+    """
+    if path.endswith('.jsonl'):
+        return {}, list(iter_journal(path)), []
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('metadata', {}), data['jobs'], data.get('removed_jobs', [])
+
+
+def reextract(jobs, workers=None, chunksize=64):
+    """
+    Upgraded copies of jobs, in order, with fields re-extracted from full_text
+
+    Only the text goes to the worker processes and only the fields come
+    back, which keeps the pickling cost well below the extraction work.
+    Extracted fields the current rules no longer find are dropped rather
+    than kept from the old extraction.
+    """
+    texts = [job.get('full_text') or '' for job in jobs]
+    if workers == 1:
+        extracted = [extract_fields(text) for text in texts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            extracted = list(pool.map(extract_fields, texts, chunksize=chunksize))
+    
+    upgraded = []
+    for job, text, fields in zip(jobs, texts, extracted):
+        job = dict(job)
+        if text:
+            for field in EXTRACTED_FIELDS:
+                job.pop(field, None)
+            job.update(fields)
+        upgraded.append(job)
+    return upgraded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild structured fields from the full_text of a saved scrape")
+    parser.add_argument("source", help="scraper output JSON or scrape journal JSONL")
+    parser.add_argument("--out", help="upgraded dataset path (default: overwrite source; required for JSONL)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="extraction processes (1 = inline)")
+    args = parser.parse_args()
+    
+    out = args.out or args.source
+    if out.endswith('.jsonl'):
+        parser.error("--out must be a .json path")
+    
+    start = time.perf_counter()
+    metadata, jobs, removed_jobs = read_dataset(args.source)
+    jobs_read = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    upgraded = reextract(jobs, args.workers)
+    elapsed = time.perf_counter() - start
+    
+    changed = {}
+    for job, new in zip(jobs, upgraded):
+        for field in job.keys() | new.keys():
+            if job.get(field) != new.get(field):
+                changed[field] = changed.get(field, 0) + 1
+    
+    output = {
+        'metadata': dict(metadata, total_jobs=len(upgraded), reextracted_at=datetime.now().isoformat()),
+        'jobs': upgraded
+    }
+    if removed_jobs:
+        output['removed_jobs'] = removed_jobs
+    
+    # Write beside the target first so a failed run never leaves a half-written dataset
+    tmp_path = out + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, out)
+    
+    print(f"Read {len(jobs)} jobs in {jobs_read*1000:.0f} ms")
+    print(f"Re-extracted with {args.workers} worker(s) in {elapsed*1000:.0f} ms "
+          f"({len(jobs)/max(elapsed, 1e-9):,.0f} jobs/s) -> {out}")
+    for field, count in sorted(changed.items()):
+        print(f"  {field}: {count} jobs updated")
@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import resource
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from job_store import STORE_FILE
+from workday_stub import StubWorkday, load_recorded_jobs
+
+SCRAPERS = ['batch', 'direct', 'http', 'single']
+LEVELS = ['none', 'medium', 'aggressive', 'blocked']
+
+
+class RssSampler:
+    def __init__(self, root_pid, interval=0.2):
+        """
+        Peak resident memory of a process tree, sampled from /proc
+
+        Covers chromedriver and every browser process under it. Stays at 0
+        where /proc isn't available.
+        """
+        self.root_pid = root_pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+    
+    def _tree(self):
+        children = {}
+        for name in os.listdir('/proc'):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{name}/stat') as f:
+                    # The command name is in parentheses and may contain spaces
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(name))
+        
+        pids = [self.root_pid]
+        for pid in pids:
+            pids.extend(children.get(pid, []))
+        return pids
+    
+    def sample(self):
+        total = 0
+        for pid in self._tree():
+            try:
+                with open(f'/proc/{pid}/statm') as f:
+                    total += int(f.read().split()[1]) * self._page_size
+            except (OSError, IndexError, ValueError):
+                pass
+        self.peak = max(self.peak, total)
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+    
+    def start(self):
+        if os.path.isdir('/proc'):
+            self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+def summarize(name, jobs, correct, seconds, metrics, peak_rss):
+    summary = metrics.summary()
+    return {
+        'scraper': name,
+        'jobs': jobs,
+        'correct': correct,
+        'seconds': seconds,
+        'jobs_per_second': jobs / seconds if seconds else 0.0,
+        'peak_rss_mb': peak_rss / 1024 / 1024,
+        'counters': summary['counters'],
+        'phases': {
+            phase: {'count': stats['count'], 'p50': stats['p50'], 'p95': stats['p95']}
+            for phase, stats in summary['phases'].items()
+        }
+    }
+
+
+def run_batch(stub, mode, target, connections=8):
+    """BatchWorkdayScraper end to end: 'batch' clicks through the listing, 'direct'/'http' harvest links first"""
+    from final_scraper import BatchWorkdayScraper, LISTING_SELECTOR
+    
+    scraper = BatchWorkdayScraper(headless=True, base_url=stub.base_url)
+    sampler = RssSampler(scraper.driver.service.process.pid)
+    sampler.start()
+    try:
+        scraper.driver.get(scraper.task_url)
+        scraper.waiter.element_count('listing', LISTING_SELECTOR, 2)
+        
+        start = time.time()
+        if mode == 'batch':
+            for offset in range(0, target, 40):
+                if scraper.scrape_batch(offset, min(40, target - offset)) == 0:
+                    break
+        else:
+            links = scraper.harvest_job_links(target)
+            scraper.scrape_links(links, 'http' if mode == 'http' else 'selenium', connections)
+        seconds = time.time() - start
+    finally:
+        sampler.stop()
+        scraper.cleanup()
+    
+    recorded = {urlsplit(job.url).path: job.job_title for job in stub.jobs}
+    correct = sum(1 for job in scraper.jobs_data if recorded.get(urlsplit(job.url).path) == job.job_title)
+    return summarize(mode, len(scraper.jobs_data), correct, seconds, scraper.metrics, sampler.peak)
+
+
+def run_single(stub, level, runs):
+    """OptimizedSingleJobScraper at one optimization level, its single-job test repeated runs times"""
+    from single_scraper import OptimizedSingleJobScraper
+    
+    scraper = OptimizedSingleJobScraper(level, headless=True, base_url=stub.base_url)
+    jobs = correct = 0
+    recorded = {urlsplit(job.url).path: job.job_title for job in stub.jobs}
+    sampler = RssSampler(scraper.driver.service.process.pid)
+    sampler.start()
+    try:
+        scraper.driver.get(scraper.task_url)
+        scraper.waiter.element_count('listing', "div[data-automation-id='promptOption']", 2)
+        
+        start = time.time()
+        for _ in range(runs):
+            scraper.timings = {}
+            scraper.waiter.timings = scraper.timings
+            job_data = scraper.scrape_single_job_optimized()
+            if not job_data:
+                continue
+            jobs += 1
+            correct += recorded.get(urlsplit(job_data['url']).path) == job_data.get('job_title')
+        seconds = time.time() - start
+    finally:
+        sampler.stop()
+        scraper.cleanup()
+    
+    return summarize(f'single/{level}', jobs, correct, seconds, scraper.metrics, sampler.peak)
+
+
+def print_report(results, stub):
+    print(f"\n{'='*60}")
+    print(f"REPLAY BENCHMARK ({len(stub.jobs)} recorded postings, "
+          f"{stub.latency*1000:.0f} ± {stub.jitter*1000:.0f} ms per request)")
+    print(f"{'='*60}")
+    for result in results:
+        print(f"\n{result['scraper']}: {result['jobs']} jobs ({result['correct']} match the recording) "
+              f"in {result['seconds']:.1f}s = {result['jobs_per_second']:.2f} jobs/sec, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB")
+        for phase, stats in result['phases'].items():
+            print(f"  {phase:<16} p50 {stats['p50']*1000:7.0f} ms   p95 {stats['p95']*1000:7.0f} ms   "
+                  f"({stats['count']} samples)")
+        for counter, values in result['counters'].items():
+            if counter != 'jobs':
+                print(f"  {counter}: " + ', '.join(f"{phase} {value}" for phase, value in values.items()))
+    
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"\nBenchmark process peak RSS: {usage/1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scrapers headless against a local replay of recorded Workday pages")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON to replay")
+    parser.add_argument("--scrapers", nargs="+", choices=SCRAPERS, default=SCRAPERS)
+    parser.add_argument("--target", type=int, default=40, help="jobs per BatchWorkdayScraper run")
+    parser.add_argument("--levels", nargs="+", choices=LEVELS, default=LEVELS,
+                        help="OptimizedSingleJobScraper levels to run")
+    parser.add_argument("--runs", type=int, default=5, help="single-job tests per optimization level")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="random +/- seconds on top of the latency")
+    parser.add_argument("--page-size", type=int, default=50, help="listing rows loaded per scroll")
+    parser.add_argument("--connections", type=int, default=8, help="concurrent requests for the http run")
+    parser.add_argument("--seed", type=int, default=0, help="jitter random seed")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+    
+    stub = StubWorkday(load_recorded_jobs(args.source), args.latency, args.jitter, args.page_size, args.seed)
+    stub.start()
+    print(f"Replaying {len(stub.jobs)} postings at {stub.base_url}")
+    
+    results = []
+    try:
+        for name in args.scrapers:
+            if name == 'single':
+                for level in args.levels:
+                    results.append(run_single(stub, level, args.runs))
+            else:
+                results.append(run_batch(stub, name, min(args.target, len(stub.jobs)), args.connections))
+    finally:
+        stub.stop()
+    
+    print_report(results, stub)
+    
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({
+                'benchmark_date': datetime.now().isoformat(),
+                'source': args.source,
+                'latency': args.latency,
+                'jitter': args.jitter,
+                'results': results
+            }, f, indent=2)
+        print(f"Saved to: {args.out}")
@@ -0,0 +1,78 @@
+# Blocks the requests a Workday posting doesn't need to show its text, through
+# the DevTools Network.setBlockedURLs command so it can be switched on and off
+# in a running browser. Workday renders postings with its own scripts and XHR
+# calls, so those are never blocked.
+
+from fnmatch import fnmatchcase
+
+
+def _extensions(*extensions):
+    """Patterns for URLs ending in one of the extensions, with or without a query string"""
+    return [pattern for extension in extensions for pattern in (f'*.{extension}', f'*.{extension}?*')]
+
+
+# Wildcard URL patterns per resource category
+BLOCK_PATTERNS = {
+    'images': _extensions('png', 'jpg', 'jpeg', 'gif', 'svg', 'webp', 'ico', 'bmp'),
+    'fonts': _extensions('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': _extensions('mp4', 'webm', 'mp3', 'm4a', 'ogg'),
+    'analytics': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*nr-data.net*',
+                  '*newrelic.com*', '*pendo.io*', '*hotjar.com*', '*segment.io*', '*quantummetric.com*'],
+    # Visibility decides what element.text returns, so dropping CSS can change
+    # the captured text; not blocked unless asked for
+    'stylesheets': _extensions('css'),
+}
+
+DEFAULT_BLOCK = ('images', 'fonts', 'media', 'analytics')
+
+# Counts what the current page loaded, from the Resource Timing entries
+RESOURCE_STATS_SCRIPT = """
+const entries = performance.getEntriesByType('resource');
+return [entries.length, entries.reduce((total, entry) => total + (entry.transferSize || 0), 0)];
+"""
+
+
+def blocked_patterns(categories=DEFAULT_BLOCK, allow=()):
+    """
+    URL patterns for the given categories, minus anything allowed
+
+    allow holds category names or wildcards matched against the patterns,
+    e.g. ('fonts',) or ('*.svg*',), which keeps '*.svg' and '*.svg?*'
+    loading. setBlockedURLs has no exceptions, so allowed patterns are
+    taken out of the list rather than overriding it. Raises ValueError for
+    an allow entry that matches no category or pattern, e.g. a typo.
+    """
+    known = [pattern for patterns in BLOCK_PATTERNS.values() for pattern in patterns]
+    for entry in allow:
+        if entry not in BLOCK_PATTERNS and not any(fnmatchcase(pattern, entry) for pattern in known):
+            raise ValueError(f"{entry!r} matches no resource category or blocked pattern")
+    
+    patterns = []
+    for category in categories:
+        if category not in allow:
+            patterns.extend(pattern for pattern in BLOCK_PATTERNS[category]
+                            if not any(fnmatchcase(pattern, entry) for entry in allow))
+    return patterns
+
+
+def enable_blocking(driver, categories=DEFAULT_BLOCK, allow=()):
+    """Start blocking in a Chrome driver, returns the patterns in effect"""
+    patterns = blocked_patterns(categories, allow)
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    return patterns
+
+
+def disable_blocking(driver):
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+
+
+def reset_resource_stats(driver):
+    """Start counting resources afresh, e.g. before navigating to the next posting"""
+    driver.execute_script("performance.clearResourceTimings(); performance.setResourceTimingBufferSize(1000);")
+
+
+def resource_stats(driver):
+    """(requests, bytes transferred) for the resources the current page loaded"""
+    count, size = driver.execute_script(RESOURCE_STATS_SCRIPT)
+    return {'requests': count, 'bytes': size}
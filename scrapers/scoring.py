@@ -0,0 +1,402 @@
+import argparse
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+
+from job_record import Job
+from job_store import STORE_FILE, load_jobs, posting_id
+from keyword_index import INDEX_FILE, KeywordIndex, build_keyword_index
+
+TABLES_FILE = 'scoring_tables.json'
+
+TYPE_KEYWORDS = {
+    'research': ['research', 'ra ', 'lab', 'experiment', 'data', 'analysis'],
+    'teaching': ['teaching', 'tutor', 'ta ', 'grader', 'mentor', 'peer'],
+    'administrative': ['admin', 'assistant', 'coordinator', 'clerk', 'office'],
+    'technical': ['tech', 'it', 'computer', 'web', 'software', 'digital'],
+    'creative': ['library', 'writing', 'media', 'creative', 'design', 'art']
+}
+
+INTEREST_CATEGORIES = {
+    "STEM & Sciences": {
+        'a': ['biology', 'life sciences', 'neuroscience'],
+        'b': ['chemistry', 'chemical'],
+        'c': ['physics', 'astronomy'],
+        'd': ['computer science', 'computational'],
+        'e': ['engineering', 'applied'],
+        'f': ['mathematics', 'statistics'],
+        'g': ['earth', 'environmental', 'planetary'],
+        'h': ['medicine', 'health', 'medical']
+    },
+    "Social Sciences & Humanities": {
+        'i': ['psychology', 'cognitive'],
+        'j': ['history', 'historical'],
+        'k': ['english', 'literature', 'writing'],
+        'l': ['philosophy', 'religious'],
+        'm': ['sociology', 'anthropology'],
+        'n': ['political science', 'international'],
+        'o': ['economics', 'business'],
+        'p': ['art', 'visual arts', 'studio'],
+        'q': ['music', 'theatre', 'performing']
+    },
+    "Professional & Applied": {
+        'r': ['education', 'teaching'],
+        's': ['public health', 'community'],
+        't': ['library', 'information'],
+        'u': ['athletics', 'sports', 'recreation'],
+        'v': ['administration', 'student services'],
+        'w': ['research', 'institute', 'center']
+    }
+}
+
+# Web option value and label for every interest letter
+INTEREST_NAMES = {
+    'a': ('biology', 'Biology/Life Sciences'), 'b': ('chemistry', 'Chemistry'),
+    'c': ('physics', 'Physics/Astronomy'), 'd': ('computer', 'Computer Science'),
+    'e': ('engineering', 'Engineering'), 'f': ('math', 'Math/Statistics'),
+    'g': ('earth', 'Earth/Environmental'), 'h': ('medicine', 'Medicine/Health'),
+    'i': ('psychology', 'Psychology'), 'j': ('history', 'History'),
+    'k': ('english', 'English/Literature'), 'l': ('philosophy', 'Philosophy/Religion'),
+    'm': ('sociology', 'Sociology/Anthropology'), 'n': ('political', 'Political Science'),
+    'o': ('economics', 'Economics/Business'), 'p': ('art', 'Art/Visual Arts'),
+    'q': ('music', 'Music/Theatre'), 'r': ('education', 'Education/Teaching'),
+    's': ('health', 'Public Health'), 't': ('library', 'Library/Information'),
+    'u': ('athletics', 'Athletics/Recreation'), 'v': ('administration', 'Administration'),
+    'w': ('research', 'Research Centers')
+}
+
+# Every department keyword the questionnaire can produce, in a fixed column order
+DEPARTMENT_KEYWORDS = list(dict.fromkeys(
+    keyword for category in INTEREST_CATEGORIES.values() for keywords in category.values() for keyword in keywords
+))
+
+ENTRY_LEVEL_WORDS = ['entry', 'beginner', 'training', 'learn']
+EXPERIENCE_REQUIRED_WORDS = ['experience required', 'advanced', 'expert']
+ADVANCED_WORDS = ['advanced', 'independent', 'leadership', 'manage']
+
+# Keyword lists covered by the inverted index, per matching rule
+INDEX_KEYWORDS = {
+    'type': list(dict.fromkeys(keyword for keywords in TYPE_KEYWORDS.values() for keyword in keywords)),
+    'department': DEPARTMENT_KEYWORDS,
+    'experience': list(dict.fromkeys(ENTRY_LEVEL_WORDS + EXPERIENCE_REQUIRED_WORDS + ADVANCED_WORDS))
+}
+
+# Questionnaire options as (CLI letter, web value, label, preference value)
+HOURS_OPTIONS = [
+    ('a', 'light', 'Light commitment (1-8 hours)', (1, 8)),
+    ('b', 'moderate', 'Moderate commitment (9-15 hours)', (9, 15)),
+    ('c', 'heavy', 'Heavy commitment (16+ hours)', (16, 40)),
+    ('d', 'flexible', "I'm flexible", (0, 40))
+]
+PAY_OPTIONS = [
+    ('a', 'budget', 'Budget-friendly ($15-16/hr)', (15, 16)),
+    ('b', 'fair', 'Fair wage ($16-17/hr)', (16, 17)),
+    ('c', 'premium', 'Premium pay ($17+/hr)', (17, 25)),
+    ('d', 'any', "Pay doesn't matter", (0, 25))
+]
+TYPE_OPTIONS = [
+    ('a', 'research', 'Research (labs, data analysis, experiments)', 'research'),
+    ('b', 'teaching', 'Teaching/Tutoring (helping other students)', 'teaching'),
+    ('c', 'administrative', 'Administrative (office work, organization)', 'administrative'),
+    ('d', 'technical', 'Technical/IT (computers, web, software)', 'technical'),
+    ('e', 'creative', 'Creative/Library (writing, media, books)', 'creative'),
+    ('f', 'any', "I'm open to anything", 'any')
+]
+INTEREST_OPTIONS = [
+    (letter, INTEREST_NAMES[letter][0], INTEREST_NAMES[letter][1], keywords)
+    for category in INTEREST_CATEGORIES.values() for letter, keywords in category.items()
+] + [('x', 'open', "I'm open to anything", [])]
+EXPERIENCE_OPTIONS = [
+    ('a', 'beginner', 'Beginner (new to work/research)', 'a'),
+    ('b', 'some', 'Some experience (done similar work before)', 'b'),
+    ('c', 'experienced', 'Experienced (confident in my abilities)', 'c')
+]
+
+
+class JobFeatures:
+    def __init__(self, jobs, keyword_index=None):
+        """Parse every job once into the arrays the point functions work on"""
+        if keyword_index is None:
+            keyword_index = KeywordIndex(build_keyword_index(jobs, INDEX_KEYWORDS))
+        self.size = len(jobs)
+        self.posting_ids = [posting_id(job.get('url')) for job in jobs]
+        self.keyword_index = keyword_index
+        
+        # Typed hours and pay come parsed with the record, so nothing is re-read from the display strings
+        records = [Job.coerce(job) for job in jobs]
+        hours = [job.weekly_hours for job in records]
+        min_pay = [job.pay_min for job in records]
+        
+        self.hours_valid = np.array([value is not None for value in hours], dtype=bool)
+        self.hours = np.array([value or 0 for value in hours], dtype=float)
+        self.pay_valid = np.array([value is not None for value in min_pay], dtype=bool)
+        self.min_pay = np.array([value or 0 for value in min_pay], dtype=float)
+        
+        self.type_matches = {
+            pref_type: keyword_index.match_counts('type', keywords) for pref_type, keywords in TYPE_KEYWORDS.items()
+        }
+        self.entry_level = keyword_index.match_counts('experience', ENTRY_LEVEL_WORDS) > 0
+        self.experience_required = keyword_index.match_counts('experience', EXPERIENCE_REQUIRED_WORDS) > 0
+        self.advanced = keyword_index.match_counts('experience', ADVANCED_WORDS) > 0
+        
+        # Only needed for department keywords the index doesn't cover
+        self.job_departments = [(job.department or '').lower() for job in records]
+
+
+# Point functions return each job's points for one component, out of its
+# weight. They compute in the reference scorer's order (weight minus penalty,
+# weight * share), so sums of their columns are bit-identical to it.
+
+def hours_points(features, hours_range, weight):
+    pref_min, pref_max = hours_range
+    below = np.maximum(0, weight - np.minimum(weight, (pref_min - features.hours) * 3))
+    above = np.maximum(0, weight - np.minimum(weight, (features.hours - pref_max) * 2))
+    points = np.where(features.hours < pref_min, below, above)
+    points = np.where((pref_min <= features.hours) & (features.hours <= pref_max), weight, points)
+    return np.where(features.hours_valid, points, weight * 0.5)
+
+
+def pay_points(features, pay_range, weight):
+    pref_min, pref_max = pay_range
+    distance = np.minimum(np.abs(features.min_pay - pref_min), np.abs(features.min_pay - pref_max))
+    points = np.where((pref_min <= features.min_pay) & (features.min_pay <= pref_max),
+                      weight, np.maximum(0, weight - (distance * 5)))
+    return np.where(features.pay_valid, points, weight * 0.5)
+
+
+def type_points(features, job_type, weight):
+    if job_type == 'any':
+        return np.full(features.size, weight * 0.7)
+    matches = features.type_matches.get(job_type, np.zeros(features.size, dtype=int))
+    return np.where(matches > 0, weight * np.minimum(1.0, matches * 0.4), weight * 0.2)
+
+
+def department_points(features, department_keywords, weight):
+    """Full points if the department matches any keyword, so several interests combine as a max"""
+    if not department_keywords:
+        return np.full(features.size, weight * 0.7)
+    matched = np.zeros(features.size, dtype=bool)
+    for keyword in department_keywords:
+        rows = features.keyword_index.rows('department', keyword)
+        if rows is not None:
+            matched[rows] = True
+        else:
+            matched |= np.array([keyword in dept for dept in features.job_departments], dtype=bool)
+    return np.where(matched, float(weight), weight * 0.3)
+
+
+def experience_points(features, experience_level, weight):
+    if experience_level == 'a':
+        return np.where(features.entry_level, float(weight),
+                        np.where(features.experience_required, weight * 0.3, weight * 0.7))
+    if experience_level == 'c':
+        return np.where(features.advanced, float(weight), weight * 0.8)
+    return np.full(features.size, weight * 0.8)
+
+
+# The scoring spec: (component, weight, preference key, point function, options, default)
+COMPONENTS = [
+    ('hours', 25, 'hours_range', hours_points, HOURS_OPTIONS, (0, 40)),
+    ('pay', 20, 'pay_range', pay_points, PAY_OPTIONS, (0, 25)),
+    ('type', 30, 'job_type', type_points, TYPE_OPTIONS, 'any'),
+    ('department', 15, 'department_keywords', department_points, INTEREST_OPTIONS, []),
+    ('experience', 10, 'experience_level', experience_points, EXPERIENCE_OPTIONS, 'b')
+]
+MAX_SCORE = sum(weight for _, weight, _, _, _, _ in COMPONENTS)
+
+
+def score_jobs(features, preferences):
+    """Match percentage of every job for one set of preferences"""
+    score = np.zeros(features.size)
+    for _, weight, key, points, _, default in COMPONENTS:
+        score += points(features, preferences.get(key, default), weight)
+    return (score / MAX_SCORE) * 100
+
+
+def score_job(job, preferences):
+    """
+    Match percentage of a single job, without touching the others
+
+    The scalar form of score_jobs, component for component, with the
+    keyword rules of keyword_index.build_keyword_index.
+    """
+    job = Job.coerce(job)
+    weights = {name: weight for name, weight, _, _, _, _ in COMPONENTS}
+    score = 0
+    
+    weight = weights['hours']
+    pref_min, pref_max = preferences.get('hours_range', (0, 40))
+    if job.weekly_hours is None:
+        score += weight * 0.5
+    elif pref_min <= job.weekly_hours <= pref_max:
+        score += weight
+    elif job.weekly_hours < pref_min:
+        score += max(0, weight - min(weight, (pref_min - job.weekly_hours) * 3))
+    else:
+        score += max(0, weight - min(weight, (job.weekly_hours - pref_max) * 2))
+    
+    weight = weights['pay']
+    pref_min, pref_max = preferences.get('pay_range', (0, 25))
+    if job.pay_min is None:
+        score += weight * 0.5
+    elif pref_min <= job.pay_min <= pref_max:
+        score += weight
+    else:
+        distance = min(abs(job.pay_min - pref_min), abs(job.pay_min - pref_max))
+        score += max(0, weight - (distance * 5))
+    
+    weight = weights['type']
+    job_title = job.get('job_title', '').lower()
+    job_desc = job.get('job_description', '').lower()
+    job_type = preferences.get('job_type', 'any')
+    if job_type == 'any':
+        score += weight * 0.7
+    else:
+        matches = sum(1 for keyword in TYPE_KEYWORDS.get(job_type, []) if keyword in job_title or keyword in job_desc)
+        score += weight * min(1.0, matches * 0.4) if matches > 0 else weight * 0.2
+    
+    weight = weights['department']
+    job_dept = job.get('department', '').lower()
+    department_keywords = preferences.get('department_keywords', [])
+    if not department_keywords:
+        score += weight * 0.7
+    else:
+        score += weight if any(keyword in job_dept for keyword in department_keywords) else weight * 0.3
+    
+    weight = weights['experience']
+    desc_text = (job.get('job_description', '') + ' ' + job.get('job_title', '')).lower()
+    experience_level = preferences.get('experience_level', 'b')
+    if experience_level == 'a':
+        if any(word in desc_text for word in ENTRY_LEVEL_WORDS):
+            score += weight
+        elif any(word in desc_text for word in EXPERIENCE_REQUIRED_WORDS):
+            score += weight * 0.3
+        else:
+            score += weight * 0.7
+    elif experience_level == 'c':
+        score += weight if any(word in desc_text for word in ADVANCED_WORDS) else weight * 0.8
+    else:
+        score += weight * 0.8
+    
+    return (score / MAX_SCORE) * 100
+
+
+def build_tables(features):
+    """
+    Evaluate every point function at every questionnaire option
+
+    The browser scores a job by adding one column per component in
+    COMPONENTS order, taking the best of the selected interest columns,
+    then dividing by max_score, which reproduces score_jobs exactly.
+    """
+    components = {}
+    columns = {}
+    for name, weight, _, points, options, default in COMPONENTS:
+        components[name] = {
+            'weight': weight,
+            'options': [value for _, value, _, _ in options],
+            'default': next(value for _, value, _, param in options if param == default)
+        }
+        for _, value, _, param in options:
+            columns[f"{name}:{value}"] = points(features, param, weight).tolist()
+    
+    return {
+        'posting_ids': features.posting_ids,
+        'max_score': MAX_SCORE,
+        'components': components,
+        'columns': columns
+    }
+
+
+def write_tables(features, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(build_tables(features), f, separators=(',', ':'))
+
+
+def table_scores(tables, choices):
+    """Score the way script.js does, from the exported tables only"""
+    columns = tables['columns']
+    score = np.zeros(len(tables['posting_ids']))
+    for name, component in tables['components'].items():
+        chosen = choices.get(name) or [component['default']]
+        if isinstance(chosen, str):
+            chosen = [chosen]
+        picked = np.array([columns[f"{name}:{value}"] for value in chosen])
+        score += picked.max(axis=0)
+    return (score / tables['max_score']) * 100
+
+
+def preference_combinations():
+    """
+    Every questionnaire answer as (CLI preferences, web choices)
+
+    All hours, pay, type and experience options, each with no interests,
+    every single interest and every pair of interests.
+    """
+    interests = [option for option in INTEREST_OPTIONS if option[0] != 'x']
+    interest_choices = [[]] + [[option] for option in interests] + [
+        list(pair) for pair in itertools.combinations(interests, 2)
+    ]
+    
+    for hours, pay, job_type, experience, selected in itertools.product(
+            HOURS_OPTIONS, PAY_OPTIONS, TYPE_OPTIONS, EXPERIENCE_OPTIONS, interest_choices):
+        preferences = {
+            'hours_range': hours[3], 'pay_range': pay[3], 'job_type': job_type[3],
+            'department_keywords': [keyword for option in selected for keyword in option[3]],
+            'experience_level': experience[3]
+        }
+        choices = {
+            'hours': hours[1], 'pay': pay[1], 'type': job_type[1], 'experience': experience[1],
+            'department': [option[1] for option in selected]
+        }
+        yield preferences, choices
+
+
+def verify_tables(features, tables):
+    """Check the exported tables give the CLI scorer's exact scores and rankings for every answer"""
+    if tables['posting_ids'] != features.posting_ids:
+        return ["tables were built from a different job list"]
+    
+    problems = []
+    for preferences, choices in preference_combinations():
+        expected = score_jobs(features, preferences)
+        got = table_scores(tables, choices)
+        if not np.array_equal(expected, got):
+            problems.append(f"score mismatch for {choices}")
+        elif not np.array_equal(np.argsort(-expected, kind='stable'), np.argsort(-got, kind='stable')):
+            problems.append(f"ranking mismatch for {choices}")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the scoring tables the web frontend ranks jobs with")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    parser.add_argument("--out", help=f"tables path (default: {TABLES_FILE} next to source)")
+    parser.add_argument("--verify", action="store_true", help="check existing tables against the CLI scorer")
+    args = parser.parse_args()
+    
+    out = args.out or os.path.join(os.path.dirname(args.source), TABLES_FILE)
+    jobs = load_jobs(args.source)['jobs']
+    index_file = os.path.join(os.path.dirname(args.source), INDEX_FILE)
+    features = JobFeatures(jobs, KeywordIndex.for_jobs(jobs, INDEX_KEYWORDS, index_file))
+    
+    if args.verify:
+        with open(out, 'r', encoding='utf-8') as f:
+            tables = json.load(f)
+        start = time.perf_counter()
+        problems = verify_tables(features, tables)
+        elapsed = time.perf_counter() - start
+        for problem in problems[:10]:
+            print(f"❌ {problem}")
+        if problems:
+            raise SystemExit(f"{len(problems)} preference combinations disagree")
+        print(f"✅ {out} matches the CLI scorer for every preference combination ({elapsed:.1f} s)")
+    else:
+        start = time.perf_counter()
+        write_tables(features, out)
+        elapsed = time.perf_counter() - start
+        print(f"Exported scoring tables for {len(jobs)} jobs in {elapsed*1000:.0f} ms -> {out} "
+              f"({os.path.getsize(out)/1024:.0f} KB)")
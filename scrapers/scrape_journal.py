@@ -0,0 +1,94 @@
+import json
+import os
+from datetime import datetime
+
+
+class ScrapeJournal:
+    def __init__(self, path, fsync_every=10):
+        """
+        Append-only JSONL log of scraped jobs, one line per job
+
+        Args:
+            path: journal file location
+            fsync_every: number of appended jobs between fsync calls
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self._file = None
+        self._pending = 0
+    
+    def _scan(self):
+        """(jobs, byte offset just past the last complete job line)"""
+        jobs = []
+        good_end = 0
+        if not os.path.exists(self.path):
+            return jobs, good_end
+        
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                offset += len(line)
+                # A crash mid-write leaves a torn line, skip it and keep going
+                if not line.endswith(b'\n'):
+                    continue
+                try:
+                    jobs.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                good_end = offset
+        return jobs, good_end
+    
+    def replay(self):
+        """Read back every complete job in the journal"""
+        return self._scan()[0]
+    
+    def open(self, resume=False, fresh=False):
+        """
+        Open for appending
+
+        A journal that already holds jobs belongs to an interrupted run, so
+        it is only continued with resume=True, or moved aside to
+        <path>.<timestamp> with fresh=True. Otherwise FileExistsError is
+        raised rather than losing it.
+        """
+        if resume:
+            # Cut a torn tail so new lines start on a clean boundary
+            good_end = self._scan()[1]
+            if os.path.exists(self.path) and os.path.getsize(self.path) > good_end:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(good_end)
+        elif os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            if not fresh:
+                raise FileExistsError(f"{self.path} holds an interrupted run; use --resume, or --fresh to set it aside")
+            rotated = f"{self.path}.{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            os.replace(self.path, rotated)
+            print(f"Moved the previous journal to {rotated}")
+        
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+    
+    def append(self, job):
+        """Write one job, fsyncing every fsync_every jobs"""
+        self._file.write(json.dumps(job, ensure_ascii=False) + '\n')
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+    
+    def sync(self):
+        """Force everything written so far onto disk"""
+        if self._file and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+    
+    def close(self):
+        self.sync()
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def discard(self):
+        """Close and delete the journal once the final dataset is saved"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket bounds in seconds, Prometheus' defaults stretched for page loads
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Scraper phases in the order reports list them; others follow alphabetically
+PHASES = ('find', 'scroll', 'click', 'page_wait', 'extract', 'back', 'journal', 'save', 'fetch', 'job')
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class ScrapeMetrics:
+    def __init__(self, prometheus_path=None, flush_interval=5):
+        """
+        Run-wide latency histograms and counters shared by the scrapers
+
+        Every observation is kept, so percentiles cover the whole run rather
+        than the last job. Safe to share between worker threads. With
+        prometheus_path set, the Prometheus text format is rewritten there
+        at most every flush_interval seconds while the run goes on.
+        """
+        self.started = time.time()
+        self.samples = {}
+        self.buckets = {}
+        self.counters = {}
+        self.prometheus_path = prometheus_path
+        self.flush_interval = flush_interval
+        self._flushed = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._server = None
+    
+    def observe(self, phase, seconds):
+        """Record one duration of a phase"""
+        with self._lock:
+            self.samples.setdefault(phase, []).append(seconds)
+            counts = self.buckets.get(phase)
+            if counts is None:
+                counts = self.buckets[phase] = [0] * len(BUCKETS)
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    counts[i] += 1
+        self._maybe_flush()
+    
+    @contextmanager
+    def time(self, phase):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.time() - start)
+    
+    def count(self, name, phase=None, n=1):
+        """Bump a counter such as 'jobs', 'failures', 'retries' or 'timeouts', optionally per phase"""
+        with self._lock:
+            key = (name, phase)
+            self.counters[key] = self.counters.get(key, 0) + n
+    
+    def total(self, name):
+        return sum(value for (counter, _), value in self.counters.items() if counter == name)
+    
+    def _counter_items(self):
+        return sorted(self.counters.items(), key=lambda item: (item[0][0], item[0][1] or ''))
+    
+    def _phases(self):
+        order = {phase: i for i, phase in enumerate(PHASES)}
+        return sorted(self.samples, key=lambda phase: (order.get(phase, len(order)), phase))
+    
+    def summary(self):
+        """Counters plus count, sum, mean, p50, p95 and max per phase"""
+        with self._lock:
+            phases = {}
+            for phase in self._phases():
+                values = self.samples[phase]
+                phases[phase] = {
+                    'count': len(values),
+                    'sum': sum(values),
+                    'mean': sum(values) / len(values),
+                    'p50': percentile(values, 0.5),
+                    'p95': percentile(values, 0.95),
+                    'max': max(values),
+                    'buckets': dict(zip(map(str, BUCKETS), self.buckets[phase]))
+                }
+            counters = {}
+            for (name, phase), value in self._counter_items():
+                counters.setdefault(name, {})[phase or 'all'] = value
+        
+        elapsed = time.time() - self.started
+        jobs = self.total('jobs')
+        return {
+            'started_at': datetime.fromtimestamp(self.started).isoformat(),
+            'elapsed': elapsed,
+            'jobs': jobs,
+            'jobs_per_second': jobs / elapsed if elapsed else 0.0,
+            'counters': counters,
+            'phases': phases
+        }
+    
+    def to_prometheus(self):
+        """The metrics in Prometheus text exposition format"""
+        lines = [
+            '# HELP scrape_phase_seconds Time spent per scraper phase',
+            '# TYPE scrape_phase_seconds histogram'
+        ]
+        with self._lock:
+            for phase in self._phases():
+                values = self.samples[phase]
+                for bound, count in zip(BUCKETS, self.buckets[phase]):
+                    lines.append(f'scrape_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {count}')
+                lines.append(f'scrape_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {len(values)}')
+                lines.append(f'scrape_phase_seconds_sum{{phase="{phase}"}} {sum(values)}')
+                lines.append(f'scrape_phase_seconds_count{{phase="{phase}"}} {len(values)}')
+            
+            typed = set()
+            for (name, phase), value in self._counter_items():
+                if name not in typed:
+                    lines.append(f'# TYPE scrape_{name}_total counter')
+                    typed.add(name)
+                labels = f'{{phase="{phase}"}}' if phase else ''
+                lines.append(f'scrape_{name}_total{labels} {value}')
+        
+        lines.append('# TYPE scrape_elapsed_seconds gauge')
+        lines.append(f'scrape_elapsed_seconds {time.time() - self.started}')
+        return '\n'.join(lines) + '\n'
+    
+    def write_prometheus(self, path=None):
+        """Rewrite the Prometheus text file in one step, so a reader never sees half of it"""
+        path = path or self.prometheus_path
+        tmp_path = path + '.tmp'
+        with self._flush_lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+            self._flushed = time.time()
+    
+    def _maybe_flush(self):
+        if self.prometheus_path and time.time() - self._flushed >= self.flush_interval:
+            self._flushed = time.time()
+            self.write_prometheus()
+    
+    def serve(self, port):
+        """Serve the Prometheus text at http://127.0.0.1:port/metrics from a background thread"""
+        metrics = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+    
+    def save(self, path):
+        """Write the run summary as JSON, and the final Prometheus file if there is one"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        if self.prometheus_path:
+            self.write_prometheus()
+    
+    def close(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def print_report(self):
+        summary = self.summary()
+        print(f"\n{'='*50}")
+        print(f"METRICS: {summary['jobs']} jobs in {summary['elapsed']/60:.1f} minutes "
+              f"({summary['jobs_per_second']*60:.1f} jobs/min)")
+        print(f"{'='*50}")
+        for phase, stats in summary['phases'].items():
+            print(f"  {phase:<10} p50 {stats['p50']:6.2f}s  p95 {stats['p95']:6.2f}s  "
+                  f"total {stats['sum']/60:5.1f} min  ({stats['count']})")
+        for name, values in summary['counters'].items():
+            if name == 'jobs':
+                continue
+            detail = ', '.join(f"{phase} {value}" for phase, value in values.items())
+            print(f"  {name}: {detail}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show a saved scrape metrics file")
+    parser.add_argument("path", help="metrics JSON written by a scraper run")
+    args = parser.parse_args()
+    
+    with open(args.path, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    
+    print(f"Run started {saved['started_at']}: {saved['jobs']} jobs in {saved['elapsed']/60:.1f} minutes")
+    for phase, stats in saved['phases'].items():
+        print(f"  {phase:<10} p50 {stats['p50']:6.2f}s  p95 {stats['p95']:6.2f}s  max {stats['max']:6.2f}s  "
+              f"total {stats['sum']/60:5.1f} min  ({stats['count']})")
+    for name, values in saved['counters'].items():
+        detail = ', '.join(f"{phase} {value}" for phase, value in values.items())
+        print(f"  {name}: {detail}")
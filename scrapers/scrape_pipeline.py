@@ -0,0 +1,70 @@
+import queue
+import threading
+import time
+
+# Put on the queue once per worker to make it exit
+_STOP = object()
+
+
+class ScrapePipeline:
+    def __init__(self, handle, workers=2, max_pending=16, metrics=None):
+        """
+        Bounded queue between the browser-driving thread and page processing
+
+        The browser thread only submit()s raw pages; worker threads call
+        handle(page) on each one (extract, deduplicate, store). When
+        max_pending pages are waiting, submit() blocks until a worker
+        catches up, so a slow consumer holds the browser back instead of
+        memory growing without bound. Pages that handle() raised on are kept
+        for the caller to collect with take_failed().
+        """
+        self.handle = handle
+        self.metrics = metrics
+        self.pages = queue.Queue(maxsize=max_pending)
+        self.errors = 0
+        self.failed = []
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+    
+    def _work(self):
+        while True:
+            page = self.pages.get()
+            try:
+                if page is _STOP:
+                    return
+                self.handle(page)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                    self.failed.append(page)
+                if self.metrics:
+                    self.metrics.count('failures', 'extract')
+                print(f"    ✗ Could not process {page.get('url')}: {e}")
+            finally:
+                self.pages.task_done()
+    
+    def submit(self, page):
+        """Queue a raw page, waiting while the queue is full"""
+        start = time.time()
+        self.pages.put(page)
+        if self.metrics:
+            self.metrics.observe('queue_wait', time.time() - start)
+    
+    def take_failed(self):
+        """The pages that failed since the last call, e.g. to capture them again"""
+        with self._lock:
+            failed, self.failed = self.failed, []
+        return failed
+    
+    def flush(self):
+        """Wait until every page submitted so far has been handled"""
+        self.pages.join()
+    
+    def close(self):
+        """Handle what is still queued, then stop the workers"""
+        for _ in self._threads:
+            self.pages.put(_STOP)
+        for thread in self._threads:
+            thread.join()
@@ -0,0 +1,307 @@
+import argparse
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+
+import numpy as np
+
+from job_record import load_records
+from job_store import STORE_FILE, TEXT_FILE, load_full_texts, posting_id
+
+SEARCH_FILE = 'search_index.json'
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it', 'its',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'will', 'with', 'you', 'your', 'we', 'our', 'all',
+    'any', 'may', 'other', 'their', 'they', 'who', 'which', 'not', 'can', 'per', 'also', 'must', 'such'
+}
+
+# Page lines shared by at least this share of postings (EEO statement, labels,
+# navigation) are boilerplate and never indexed
+BOILERPLATE_SHARE = 0.5
+
+# Term frequency weight of each field; full_text also repeats title and description
+FIELD_WEIGHTS = (('job_title', 3.0), ('job_description', 1.5), ('full_text', 1.0))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Longest suffix first; a stem keeps at least MIN_STEM letters
+SUFFIXES = ('ational', 'ization', 'fulness', 'ousness', 'iveness', 'ations', 'ation', 'ments', 'ment',
+            'ingly', 'ings', 'ing', 'edly', 'ies', 'ied', 'ers', 'er', 'ed', 'ly', 'es', 's')
+MIN_STEM = 3
+
+_stems = {}
+
+
+def stem(word):
+    """Strip one common English suffix, so 'tutoring', 'tutors' and 'tutor' share a term"""
+    cached = _stems.get(word)
+    if cached is not None:
+        return cached
+    result = word
+    if not word.isdigit():
+        for suffix in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+                result = word[:-len(suffix)]
+                if suffix in ('ies', 'ied'):
+                    result += 'y'
+                elif suffix == 's' and result.endswith(('s', 'u')):
+                    result = word  # 'class', 'campus'
+                break
+    _stems[word] = result
+    return result
+
+
+def tokenize(text):
+    """Lowercase, split, drop stop words and stem"""
+    return [stem(token) for token in TOKEN_PATTERN.findall((text or '').lower()) if token not in STOP_WORDS]
+
+
+def find_boilerplate(texts):
+    """Lines repeated across at least BOILERPLATE_SHARE of the texts"""
+    line_counts = Counter()
+    for text in texts:
+        line_counts.update(set((text or '').split('\n')))
+    threshold = max(2, BOILERPLATE_SHARE * len(texts))
+    return {line for line, count in line_counts.items() if count >= threshold}
+
+
+class SearchIndex:
+    def __init__(self, boilerplate=()):
+        """
+        Inverted index with BM25 ranking over title, description and full text
+
+        Documents are keyed by Workday posting ID, so the index can be kept
+        up to date with add/remove as scrapes come in instead of rebuilt.
+        Each term keeps parallel lists of document numbers and weighted term
+        frequencies; removed documents leave holes until the next compact().
+        """
+        self.boilerplate = set(boilerplate)
+        self.posting_ids = []
+        self.scraped_at = []
+        self.lengths = []
+        self.terms = {}
+        self.docs = {}
+        self.live = 0
+        self.total_length = 0.0
+        self._arrays = None
+        self._lengths = None
+    
+    def _fields(self, job, full_text):
+        text = '\n'.join(line for line in (full_text or '').split('\n') if line not in self.boilerplate)
+        return {'job_title': job.get('job_title'), 'job_description': job.get('job_description'),
+                'full_text': text}
+    
+    def add(self, job, full_text=None):
+        """Index one job, replacing an earlier version of the same posting"""
+        pid = posting_id(job.get('url'))
+        if pid in self.docs:
+            self.remove(pid)
+        
+        fields = self._fields(job, full_text if full_text is not None else job.get('full_text'))
+        frequencies = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            for term in tokenize(fields[field]):
+                frequencies[term] += weight
+        
+        doc = len(self.posting_ids)
+        length = sum(frequencies.values())
+        self.posting_ids.append(pid)
+        self.scraped_at.append(job.get('scraped_at'))
+        self.lengths.append(length)
+        self.docs[pid] = doc
+        self.live += 1
+        self.total_length += length
+        
+        for term, frequency in frequencies.items():
+            postings = self.terms.get(term)
+            if postings is None:
+                postings = self.terms[term] = ([], [])
+            postings[0].append(doc)
+            postings[1].append(frequency)
+        self._arrays = None
+    
+    def remove(self, pid):
+        doc = self.docs.pop(pid, None)
+        if doc is None:
+            return
+        self.live -= 1
+        self.total_length -= self.lengths[doc]
+        self.posting_ids[doc] = None
+        self.lengths[doc] = 0.0
+        self._arrays = None
+    
+    def update(self, jobs, full_text=None):
+        """
+        Bring the index in line with a new job list; returns (added, removed)
+
+        Only postings that are new or were scraped again get tokenized.
+        full_text(job) supplies text for jobs that don't carry it.
+        """
+        current = {}
+        for job in jobs:
+            current[posting_id(job.get('url'))] = job
+        
+        removed = [pid for pid in self.docs if pid not in current]
+        for pid in removed:
+            self.remove(pid)
+        
+        added = 0
+        for pid, job in current.items():
+            doc = self.docs.get(pid)
+            if doc is None or self.scraped_at[doc] != job.get('scraped_at'):
+                text = job.get('full_text')
+                if text is None and full_text is not None:
+                    text = full_text(job)
+                self.add(job, text)
+                added += 1
+        return added, len(removed)
+    
+    def compact(self):
+        """Renumber documents to drop the holes removed postings left"""
+        keep = [doc for doc, pid in enumerate(self.posting_ids) if pid is not None]
+        if len(keep) == len(self.posting_ids):
+            return
+        renumber = {doc: i for i, doc in enumerate(keep)}
+        
+        terms = {}
+        for term, (docs, frequencies) in self.terms.items():
+            kept = [(renumber[doc], frequency) for doc, frequency in zip(docs, frequencies) if doc in renumber]
+            if kept:
+                terms[term] = ([doc for doc, _ in kept], [frequency for _, frequency in kept])
+        
+        self.terms = terms
+        self.posting_ids = [self.posting_ids[doc] for doc in keep]
+        self.scraped_at = [self.scraped_at[doc] for doc in keep]
+        self.lengths = [self.lengths[doc] for doc in keep]
+        self.docs = {pid: doc for doc, pid in enumerate(self.posting_ids)}
+        self._arrays = None
+    
+    def _term_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None and term in self.terms:
+            docs, frequencies = self.terms[term]
+            arrays = self._arrays[term] = (np.array(docs, dtype=np.int64), np.array(frequencies))
+        return arrays
+    
+    def search(self, query, k=10):
+        """[(posting_id, score)] of the k best BM25 matches for a free-text query"""
+        if not self.live:
+            return []
+        if self._arrays is None:
+            # Postings become arrays as terms are first searched, until the index changes
+            self._arrays = {}
+            self._lengths = np.array(self.lengths)
+        average = self.total_length / self.live
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths / average)
+        
+        scores = np.zeros(len(self.posting_ids))
+        for term in set(tokenize(query)):
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            docs, frequencies = arrays
+            # Removed documents stay in the postings until compact(), with zero length
+            live = self._lengths[docs] > 0
+            docs, frequencies = docs[live], frequencies[live]
+            if not len(docs):
+                continue
+            idf = math.log(1 + (self.live - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * frequencies * (BM25_K1 + 1) / (frequencies + norm[docs])
+        
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.lexsort((matched, -scores[matched]))]
+        return [(self.posting_ids[doc], float(scores[doc])) for doc in matched]
+    
+    def save(self, path):
+        self.compact()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'boilerplate': sorted(self.boilerplate),
+                'posting_ids': self.posting_ids,
+                'scraped_at': self.scraped_at,
+                'lengths': self.lengths,
+                'terms': self.terms
+            }, f, ensure_ascii=False, separators=(',', ':'))
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        index = cls(saved['boilerplate'])
+        index.posting_ids = saved['posting_ids']
+        index.scraped_at = saved['scraped_at']
+        index.lengths = saved['lengths']
+        index.terms = {term: tuple(postings) for term, postings in saved['terms'].items()}
+        index.docs = {pid: doc for doc, pid in enumerate(index.posting_ids)}
+        index.live = len(index.posting_ids)
+        index.total_length = float(sum(index.lengths))
+        return index
+    
+    @classmethod
+    def build(cls, jobs, texts):
+        """Index jobs with full texts, taking the boilerplate from these texts"""
+        index = cls(find_boilerplate(texts))
+        for job, text in zip(jobs, texts):
+            index.add(job, text)
+        return index
+    
+    @classmethod
+    def for_jobs(cls, jobs, path, full_text):
+        """The saved index brought up to date with jobs, or a fresh one if there is none"""
+        if os.path.exists(path):
+            index = cls.load(path)
+            index.update(jobs, full_text)
+            return index
+        return cls.build(jobs, [full_text(job) for job in jobs])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or update the full-text search index for the job dataset")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    parser.add_argument("--out", help=f"index path (default: {SEARCH_FILE} next to source)")
+    parser.add_argument("--rebuild", action="store_true", help="start over instead of updating the saved index")
+    parser.add_argument("--query", action="append", default=[], help="search to run and time after indexing")
+    args = parser.parse_args()
+    
+    out = args.out or os.path.join(os.path.dirname(args.source), SEARCH_FILE)
+    jobs = load_records(args.source)['jobs']
+    text_file = os.path.join(os.path.dirname(args.source), TEXT_FILE)
+    if any(job.full_text is None for job in jobs) and os.path.exists(text_file):
+        for job, text in zip(jobs, load_full_texts(text_file)):
+            job.full_text = text
+    
+    start = time.perf_counter()
+    if os.path.exists(out) and not args.rebuild:
+        index = SearchIndex.load(out)
+        added, removed = index.update(jobs)
+        action = f"Updated ({added} indexed, {removed} removed)"
+    else:
+        index = SearchIndex.build(jobs, [job.full_text or '' for job in jobs])
+        action = "Built"
+    elapsed = time.perf_counter() - start
+    index.save(out)
+    
+    print(f"{action} search index for {index.live} jobs in {elapsed*1000:.0f} ms -> {out} "
+          f"({os.path.getsize(out)/1024:.0f} KB, {len(index.terms)} terms, "
+          f"{len(index.boilerplate)} boilerplate lines skipped)")
+    
+    titles = {posting_id(job.url): job.job_title for job in jobs}
+    for query in args.query or ['research assistant', 'tutoring math', 'library']:
+        index.search(query)
+        start = time.perf_counter()
+        repeat = 20
+        for _ in range(repeat):
+            results = index.search(query)
+        latency = (time.perf_counter() - start) / repeat
+        print(f"\n'{query}': {latency*1000:.2f} ms")
+        for pid, score in results[:5]:
+            print(f"  {score:5.2f}  {titles.get(pid)}")
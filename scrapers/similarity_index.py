@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from job_record import Job
+from job_store import STORE_FILE, load_jobs, posting_id
+
+NEIGHBORS_FILE = 'similar_jobs.json'
+
+SAME_DEPARTMENT_POINTS = 40
+COMMON_WORD_POINTS = 10
+MIN_SIMILARITY = 20
+
+
+class SimilarJobsIndex:
+    def __init__(self, jobs):
+        """
+        Precomputed title tokens, department IDs and hours for find_similar_jobs
+
+        Scores match JobRecommender.find_similar_jobs: 40 for the same
+        department, 10 per shared title word and 20/10 for hours within 2/5.
+        """
+        self.jobs = jobs
+        self.size = len(jobs)
+        
+        token_ids = {}
+        department_ids = {}
+        postings = []
+        self.title_tokens = []
+        departments = []
+        hours = []
+        hours_valid = []
+        
+        for row, job in enumerate(map(Job.coerce, jobs)):
+            tokens = []
+            for word in set((job.job_title or '').lower().split()):
+                if word not in token_ids:
+                    token_ids[word] = len(token_ids)
+                    postings.append([])
+                postings[token_ids[word]].append(row)
+                tokens.append(token_ids[word])
+            self.title_tokens.append(tokens)
+            
+            departments.append(department_ids.setdefault(job.department or '', len(department_ids)))
+            hours.append(job.weekly_hours or 0)
+            hours_valid.append(job.weekly_hours is not None)
+        
+        self.token_ids = token_ids
+        self.postings = [np.array(rows, dtype=np.int64) for rows in postings]
+        self.departments = np.array(departments, dtype=np.int64)
+        self.hours = np.array(hours, dtype=float)
+        self.hours_valid = np.array(hours_valid, dtype=bool)
+        self.neighbors = None
+        self.neighbors_k = 0
+    
+    def scores(self, row):
+        """Similarity of every job to the job at row"""
+        common = np.zeros(self.size, dtype=np.int64)
+        for token in self.title_tokens[row]:
+            common[self.postings[token]] += 1
+        
+        score = common * COMMON_WORD_POINTS
+        score += np.where(self.departments == self.departments[row], SAME_DEPARTMENT_POINTS, 0)
+        
+        if self.hours_valid[row]:
+            diff = np.abs(self.hours - self.hours[row])
+            bonus = np.where(diff <= 2, 20, np.where(diff <= 5, 10, 0))
+            score += np.where(self.hours_valid, bonus, 0)
+        
+        return score
+    
+    def query(self, row, k=5):
+        """Rows of the k most similar jobs, best first, ties in job order"""
+        # Shorter top-k lists are prefixes of the precomputed ones
+        if self.neighbors is not None and k <= self.neighbors_k:
+            return self.neighbors[row][:k]
+        
+        score = self.scores(row)
+        score[row] = 0
+        candidates = np.flatnonzero(score > MIN_SIMILARITY)
+        
+        # Cut down to the k best before sorting, keeping the earliest rows on a tie
+        if len(candidates) > k:
+            candidate_scores = score[candidates]
+            kth = np.partition(candidate_scores, len(candidates) - k)[len(candidates) - k]
+            above = candidates[candidate_scores > kth]
+            ties = candidates[candidate_scores == kth][:k - len(above)]
+            candidates = np.concatenate([above, ties])
+        
+        order = candidates[np.lexsort((candidates, -score[candidates]))]
+        return order[:k].tolist()
+    
+    def precompute(self, k=10):
+        """Answer every query once so later lookups are a list index"""
+        self.neighbors = None
+        neighbors = [self.query(row, k) for row in range(self.size)]
+        self.neighbors = neighbors
+        self.neighbors_k = k
+        return neighbors
+    
+    def save_neighbors(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'posting_ids': [posting_id(job.get('url')) for job in self.jobs],
+                'k': self.neighbors_k,
+                'neighbors': self.neighbors
+            }, f, separators=(',', ':'))
+    
+    def load_neighbors(self, path):
+        """Use saved neighbor lists if they were built from this exact job list"""
+        if not os.path.exists(path):
+            return False
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved['posting_ids'] != [posting_id(job.get('url')) for job in self.jobs]:
+            return False
+        
+        self.neighbors = saved['neighbors']
+        self.neighbors_k = saved['k']
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute top-k similar jobs for every posting")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    parser.add_argument("-k", type=int, default=10, help="neighbors kept per job")
+    parser.add_argument("--out", help=f"output path (default: {NEIGHBORS_FILE} next to source)")
+    args = parser.parse_args()
+    
+    out = args.out or os.path.join(os.path.dirname(args.source), NEIGHBORS_FILE)
+    jobs = load_jobs(args.source)['jobs']
+    
+    start = time.perf_counter()
+    index = SimilarJobsIndex(jobs)
+    build_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    index.precompute(args.k)
+    precompute_time = time.perf_counter() - start
+    index.save_neighbors(out)
+    
+    print(f"Indexed {len(jobs)} jobs in {build_time*1000:.0f} ms")
+    print(f"Precomputed top-{args.k} neighbors in {precompute_time*1000:.0f} ms "
+          f"({precompute_time/max(len(jobs),1)*1000:.2f} ms per query) -> {out}")
@@ -8,21 +8,49 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
 
+from job_extractor import extract_fields
+from resource_blocking import DEFAULT_BLOCK, disable_blocking, enable_blocking, reset_resource_stats, resource_stats
+from scrape_metrics import ScrapeMetrics
+from workday_waits import AdaptiveWaiter
+
+LEVELS = ["none", "medium", "aggressive", "blocked"]
+
+# Wait timeouts based on optimization level
+WAIT_TIMEOUTS = {
+    "none": {"short": 2, "medium": 3, "long": 5},
+    "medium": {"short": 1, "medium": 2, "long": 3},
+    "aggressive": {"short": 0.5, "medium": 1, "long": 2},
+    "blocked": {"short": 0.5, "medium": 1, "long": 2}
+}
+
 class OptimizedSingleJobScraper:
-    def __init__(self, optimization_level="medium"):
+    def __init__(self, optimization_level="medium", headless=False, base_url="https://wd5.myworkday.com/brown",
+                 metrics=None, block=DEFAULT_BLOCK, allow=()):
         """
         Initialize scraper with different optimization levels
         
         Args:
-            optimization_level: "none", "medium", "aggressive"
+            optimization_level: "none", "medium", "aggressive", "blocked" (aggressive plus request blocking)
+            headless: run Chrome without a window
+            base_url: Workday tenant URL, e.g. a local replay server for benchmarks
+            metrics: ScrapeMetrics that keeps every job's timings, not just the last one
+            block: resource_blocking categories the "blocked" level stops loading
+            allow: categories or URL patterns to keep loading anyway
         """
         self.optimization_level = optimization_level
+        self.block = block
+        self.allow = allow
+        self.login_url = base_url + "/login.flex"
+        self.task_url = base_url + "/d/task/1422$7750.htmld"
         
         chrome_options = Options()
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
+        if headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
         
-        if optimization_level in ["medium", "aggressive"]:
+        if optimization_level in ["medium", "aggressive", "blocked"]:
             # Performance optimizations
             chrome_options.add_argument("--disable-blink-features=AutomationControlled")
             chrome_options.add_experimental_option('prefs', {
@@ -33,7 +61,7 @@ class OptimizedSingleJobScraper:
                 }
             })
         
-        if optimization_level == "aggressive":
+        if optimization_level in ["aggressive", "blocked"]:
             # More aggressive optimizations
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--disable-extensions")
@@ -44,25 +72,27 @@ class OptimizedSingleJobScraper:
         self.driver.maximize_window()
         
         # Set implicit wait
-        if optimization_level == "aggressive":
+        if optimization_level in ["aggressive", "blocked"]:
             self.driver.implicitly_wait(0.5)
         else:
             self.driver.implicitly_wait(1)
         
-        # Wait timeouts based on optimization level
-        self.wait_timeouts = {
-            "none": {"short": 2, "medium": 3, "long": 5},
-            "medium": {"short": 1, "medium": 2, "long": 3},
-            "aggressive": {"short": 0.5, "medium": 1, "long": 2}
-        }[optimization_level]
+        if optimization_level == "blocked":
+            enable_blocking(self.driver, self.block, self.allow)
+        
+        self.wait_timeouts = WAIT_TIMEOUTS[optimization_level]
         
         self.wait = WebDriverWait(self.driver, self.wait_timeouts["long"])
         self.timings = {}
+        self.metrics = metrics if metrics is not None else ScrapeMetrics()
+        self.listing_size = 0
+        self.waiter = AdaptiveWaiter(self.driver, self.timings, max_timeout=self.wait_timeouts["long"],
+                                     metrics=self.metrics)
     
     def login_and_navigate(self):
         """Handle login and navigation"""
         print("Opening Brown Workday login page...")
-        self.driver.get("https://wd5.myworkday.com/brown/login.flex")
+        self.driver.get(self.login_url)
         
         print("\n" + "="*50)
         print("MANUAL LOGIN REQUIRED")
@@ -71,7 +101,7 @@ class OptimizedSingleJobScraper:
         
         if "1422$7750" not in self.driver.current_url:
             print("Navigating to job listings...")
-            self.driver.get("https://wd5.myworkday.com/brown/d/task/1422$7750.htmld")
+            self.driver.get(self.task_url)
             
             # Wait for job listings to appear
             try:
@@ -99,63 +129,8 @@ class OptimizedSingleJobScraper:
             'hourly_range': None
         }
         
-        # Split once and iterate once
-        lines = full_text.split('\n')
-        lines_len = len(lines)
-        
-        i = 0
-        while i < lines_len - 1:  # -1 because we look ahead
-            line = lines[i]
-            next_line = lines[i + 1] if i + 1 < lines_len else ""
-            
-            # Use simple string comparisons first (faster than 'in')
-            if line == 'Job Posting Title:':
-                job_data['job_title'] = next_line
-                i += 2
-                continue
-            elif line == 'Job Description:':
-                job_data['job_description'] = next_line
-                i += 2
-                continue
-            elif line == 'Recruiting Start Date:':
-                job_data['recruiting_start_date'] = next_line
-                i += 2
-                continue
-            elif line == 'Location':
-                if not job_data['location']:  # Only first occurrence
-                    job_data['location'] = next_line
-                i += 2
-                continue
-            elif line == 'Department:':
-                job_data['department'] = next_line
-                i += 2
-                continue
-            elif line == 'Scheduled Weekly Hours:':
-                job_data['scheduled_weekly_hours'] = next_line
-                i += 2
-                continue
-            elif line == 'Hourly Rate:':
-                job_data['hourly_range'] = next_line
-                i += 2
-                continue
-            elif line == 'Hourly Range:':
-                # Look for min/max in next 6 lines max
-                for j in range(i+1, min(i+7, lines_len-1)):
-                    if lines[j] == 'Minimum:' and j + 1 < lines_len:
-                        min_val = lines[j + 1]
-                    elif lines[j] == 'Maximum:' and j + 1 < lines_len:
-                        max_val = lines[j + 1]
-                        job_data['hourly_range'] = f"${min_val} - ${max_val}"
-                        break
-                i += 7
-                continue
-            
-            i += 1
-        
-        # Quick fallback for title
-        if not job_data['job_title'] and lines_len > 3:
-            job_data['job_title'] = lines[2]
-        
+        # Single pass over the text with the shared extractor
+        job_data.update(extract_fields(full_text))
         return job_data
     
     def scrape_single_job_optimized(self):
@@ -168,6 +143,7 @@ class OptimizedSingleJobScraper:
         start = time.time()
         elements = self.driver.find_elements(By.CSS_SELECTOR, "div[data-automation-id='promptOption']")
         self.timings['find_elements'] = time.time() - start
+        self.listing_size = max(len(elements) - 1, 0)
         
         if len(elements) < 2:
             print("ERROR: Need at least 2 elements")
@@ -178,6 +154,8 @@ class OptimizedSingleJobScraper:
         preview = target_job.text[:60] if target_job.text else ""
         print(f"Target job: {preview}")
         
+        reset_resource_stats(self.driver)
+        
         # Click
         start = time.time()
         target_job.click()
@@ -189,18 +167,12 @@ class OptimizedSingleJobScraper:
             # Fixed wait
             time.sleep(2)
         elif self.optimization_level == "medium":
-            # Wait for URL change
-            try:
-                self.wait.until(lambda driver: "1422$7750" not in driver.current_url)
-            except TimeoutException:
+            # Wait for URL change, timeout learned from earlier page loads
+            if not self.waiter.url_leaves('wait_for_page', "1422$7750"):
                 time.sleep(1)
         else:  # aggressive
             # Minimal wait - just for URL change
-            try:
-                WebDriverWait(self.driver, self.wait_timeouts["short"]).until(
-                    lambda driver: "1422$7750" not in driver.current_url
-                )
-            except TimeoutException:
+            if not self.waiter.url_leaves('wait_for_page', "1422$7750", timeout=self.wait_timeouts["short"]):
                 time.sleep(0.5)
         self.timings['wait_for_page'] = time.time() - start
         
@@ -211,6 +183,7 @@ class OptimizedSingleJobScraper:
         job_data['optimization_level'] = self.optimization_level
         job_data['extraction_time'] = time.time() - start
         self.timings['extract_data'] = job_data['extraction_time']
+        job_data['resources'] = resource_stats(self.driver)
         
         # Go back
         start = time.time()
@@ -222,56 +195,64 @@ class OptimizedSingleJobScraper:
         if self.optimization_level == "none":
             time.sleep(1.5)
         elif self.optimization_level == "medium":
-            try:
-                self.wait.until(EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "div[data-automation-id='promptOption']")
-                ))
-            except TimeoutException:
+            if not self.waiter.element_count('wait_after_back', "div[data-automation-id='promptOption']", 1):
                 time.sleep(0.5)
         else:  # aggressive
-            # Minimal wait
-            try:
-                WebDriverWait(self.driver, self.wait_timeouts["short"]).until(
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "div[data-automation-id='promptOption']")
-                    )
-                )
-            except TimeoutException:
-                pass  # Continue anyway
+            # Minimal wait, continue anyway on timeout
+            self.waiter.element_count('wait_after_back', "div[data-automation-id='promptOption']", 1,
+                                      timeout=self.wait_timeouts["short"])
         self.timings['wait_after_back'] = time.time() - start
         
         # Calculate total
         self.timings['total'] = sum(self.timings.values())
+        self.record_metrics()
         
         # Add timings to job data
         job_data['timings'] = self.timings
         
         return job_data
     
+    def record_metrics(self):
+        """Add this job's timings to the run-wide metrics"""
+        self.metrics.observe('find', self.timings['find_elements'])
+        self.metrics.observe('click', self.timings['click'])
+        self.metrics.observe('page_wait', self.timings['wait_for_page'])
+        self.metrics.observe('extract', self.timings['extract_data'])
+        self.metrics.observe('back', self.timings['go_back'] + self.timings['wait_after_back'])
+        self.metrics.observe('job', self.timings['total'])
+        self.metrics.count('jobs')
+    
     def run_comparison_test(self):
-        """Run tests with all optimization levels"""
+        """Run tests with all optimization levels, then compare aggressive before/after request blocking"""
         results = {}
         
-        for level in ["none", "medium", "aggressive"]:
+        for level in LEVELS:
             print(f"\n{'='*50}")
             print(f"Testing with optimization: {level}")
             print(f"{'='*50}")
             
             # Change optimization level
             self.optimization_level = level
-            self.wait_timeouts = {
-                "none": {"short": 2, "medium": 3, "long": 5},
-                "medium": {"short": 1, "medium": 2, "long": 3},
-                "aggressive": {"short": 0.5, "medium": 1, "long": 2}
-            }[level]
+            self.wait_timeouts = WAIT_TIMEOUTS[level]
             
-            # Reset timings
+            # Blocking can be switched in the running browser; launch options can't
+            if level == "blocked":
+                enable_blocking(self.driver, self.block, self.allow)
+            else:
+                disable_blocking(self.driver)
+            
+            # Reset timings, each level gets its own metrics
             self.timings = {}
+            self.metrics = ScrapeMetrics()
+            self.waiter.timings = self.timings
+            self.waiter.metrics = self.metrics
+            self.waiter.max_timeout = self.wait_timeouts["long"]
             
             # Run test
             job_data = self.scrape_single_job_optimized()
             
             if job_data:
+                job_data['metrics'] = self.metrics.summary()
                 results[level] = job_data
                 print(f"\nTiming breakdown:")
                 print(f"  Find elements:    {self.timings['find_elements']:.3f}s")
@@ -282,14 +263,51 @@ class OptimizedSingleJobScraper:
                 print(f"  Wait after back: {self.timings['wait_after_back']:.3f}s")
                 print(f"  ─────────────────────────")
                 print(f"  TOTAL:           {self.timings['total']:.2f}s")
+                print(f"  Resources:       {job_data['resources']['requests']} requests, "
+                      f"{job_data['resources']['bytes']/1024:.0f} KB")
             
             # Small delay between tests
             time.sleep(1)
         
+        if "aggressive" in results and "blocked" in results:
+            self.print_blocking_comparison(results["aggressive"], results["blocked"])
+        
         return results
     
-    def save_results(self, job_data, filename="optimized_job_data.json"):
-        """Save job data and timing results to JSON"""
+    def print_blocking_comparison(self, before, after):
+        """Side by side of the same job without and with request blocking"""
+        print(f"\n{'='*50}")
+        print("REQUEST BLOCKING: aggressive -> blocked")
+        print(f"{'='*50}")
+        for name, key in [("Wait for page", 'wait_for_page'), ("Wait after back", 'wait_after_back'),
+                          ("Total", 'total')]:
+            old, new = before['timings'][key], after['timings'][key]
+            change = (new - old) / old * 100 if old else 0
+            print(f"  {name:<16} {old:6.3f}s -> {new:6.3f}s ({change:+.0f}%)")
+        old, new = before['resources'], after['resources']
+        print(f"  {'Requests':<16} {old['requests']:6d}  -> {new['requests']:6d}")
+        print(f"  {'Transferred':<16} {old['bytes']/1024:5.0f}KB -> {new['bytes']/1024:5.0f}KB")
+        
+        # Blocking must not change what gets extracted
+        fields = ['job_title', 'job_description', 'recruiting_start_date', 'location', 'department',
+                  'scheduled_weekly_hours', 'hourly_range']
+        differing = [field for field in fields if before.get(field) != after.get(field)]
+        if before.get('url') == after.get('url') and differing:
+            print(f"  WARNING: fields differ with blocking on: {', '.join(differing)}")
+    
+    def save_results(self, job_data, filename="optimized_job_data.json", total_jobs=None):
+        """
+        Save job data and timing results to JSON
+        
+        The projection for total_jobs (default: the rows seen on the listing)
+        uses the mean and p95 time per job over every job scraped so far.
+        """
+        summary = self.metrics.summary()
+        per_job = summary['phases'].get('job', {})
+        mean = per_job.get('mean', self.timings.get('total', 0))
+        p95 = per_job.get('p95', mean)
+        total_jobs = total_jobs or self.listing_size
+        
         # Create comprehensive output
         output = {
             "metadata": {
@@ -299,11 +317,16 @@ class OptimizedSingleJobScraper:
                 "url": job_data.get('url', '')
             },
             "timings": self.timings,
+            "metrics": summary,
             "job_data": job_data,
             "projections": {
-                "time_per_job": self.timings.get('total', 0),
-                "estimated_time_517_jobs_minutes": (517 * self.timings.get('total', 0)) / 60,
-                "estimated_time_517_jobs_hours": (517 * self.timings.get('total', 0)) / 3600
+                "jobs_measured": per_job.get('count', 1),
+                "time_per_job": mean,
+                "time_per_job_p95": p95,
+                "total_jobs": total_jobs,
+                "estimated_time_minutes": (total_jobs * mean) / 60,
+                "estimated_time_minutes_p95": (total_jobs * p95) / 60,
+                "estimated_time_hours": (total_jobs * mean) / 3600
             }
         }
         
@@ -345,11 +368,12 @@ if __name__ == "__main__":
     print("1. None (baseline - fixed waits)")
     print("2. Medium (smart waits)")
     print("3. Aggressive (minimal waits)")
-    print("4. Compare all three")
+    print("4. Blocked (aggressive plus blocking images, fonts, media and analytics)")
+    print("5. Compare all four")
     
-    choice = input("\nChoice (1-4): ").strip()
+    choice = input("\nChoice (1-5): ").strip()
     
-    if choice == "4":
+    if choice == "5":
         # Compare all levels
         scraper = OptimizedSingleJobScraper("none")
         
@@ -372,19 +396,19 @@ if __name__ == "__main__":
             
             for level, data in results.items():
                 total_time = data['timings']['total']
-                est_minutes = (517 * total_time) / 60
+                est_minutes = (scraper.listing_size * total_time) / 60
                 print(f"\n{level.upper()}:")
                 print(f"  Time per job: {total_time:.2f}s")
-                print(f"  Est. for 517 jobs: {est_minutes:.1f} minutes")
+                print(f"  Est. for {scraper.listing_size} listed jobs: {est_minutes:.1f} minutes")
             
             print(f"\n✅ Comparison saved to: optimization_comparison.json")
-            
+        
         finally:
             scraper.cleanup()
     
     else:
         # Single test
-        level_map = {"1": "none", "2": "medium", "3": "aggressive"}
+        level_map = {"1": "none", "2": "medium", "3": "aggressive", "4": "blocked"}
         level = level_map.get(choice, "medium")
         
         scraper = OptimizedSingleJobScraper(level)
@@ -406,9 +430,12 @@ if __name__ == "__main__":
                 print(f"\n{'='*50}")
                 print("TIME PROJECTIONS")
                 print(f"{'='*50}")
+                projections = output['projections']
                 print(f"Time for this job: {scraper.timings['total']:.2f}s")
-                print(f"Estimated for 517 jobs: {output['projections']['estimated_time_517_jobs_minutes']:.1f} minutes")
-            
+                print(f"Estimated for {projections['total_jobs']} listed jobs: "
+                      f"{projections['estimated_time_minutes']:.1f} minutes "
+                      f"(p95 {projections['estimated_time_minutes_p95']:.1f})")
+        
         except Exception as e:
             print(f"\nError: {e}")
             import traceback
@@ -0,0 +1,234 @@
+import argparse
+import html
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from job_record import load_records
+from job_store import STORE_FILE, TEXT_FILE, load_full_texts
+
+TASK_PATH = "/brown/d/task/1422$7750.htmld"
+LOGIN_PATH = "/brown/login.flex"
+ROWS_PATH = "/brown/listing"
+
+# Listing rows come in pages as the list is scrolled, like Workday's prompt list.
+# The loaded count is kept in sessionStorage so back() returns to a full list.
+LISTING_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Find Jobs</title>
+<style>
+body {{ font-family: sans-serif; margin: 0; }}
+a {{ display: block; color: inherit; text-decoration: none; }}
+div[data-automation-id='promptOption'] {{ padding: 10px 16px; border-bottom: 1px solid #ddd; }}
+</style>
+</head>
+<body>
+<input data-automation-id="searchBox" type="text" value="">
+<div id="list"><div data-automation-id="promptOption">Jobs</div></div>
+<script>
+const pageSize = {page_size};
+const list = document.getElementById('list');
+const search = document.querySelector("input[data-automation-id='searchBox']");
+let query = sessionStorage.getItem('stubQuery') || '';
+let loaded = 0, loading = false, done = false;
+search.value = query;
+
+function append(rows) {{
+    for (const row of rows) {{
+        const link = document.createElement('a');
+        link.href = row.path;
+        const option = document.createElement('div');
+        option.setAttribute('data-automation-id', 'promptOption');
+        option.textContent = row.preview;
+        link.appendChild(option);
+        list.appendChild(link);
+    }}
+}}
+
+async function loadMore(until) {{
+    if (loading || done) return;
+    loading = true;
+    while (!done && loaded < until) {{
+        const response = await fetch('{rows_path}?offset=' + loaded + '&limit=' + pageSize
+                                     + '&q=' + encodeURIComponent(query));
+        const page = await response.json();
+        append(page.rows);
+        loaded += page.rows.length;
+        done = page.rows.length < pageSize;
+    }}
+    sessionStorage.setItem('stubLoaded', loaded);
+    loading = false;
+}}
+
+window.addEventListener('scroll', () => {{
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) loadMore(loaded + pageSize);
+}});
+
+search.addEventListener('keydown', event => {{
+    if (event.key !== 'Enter') return;
+    query = search.value;
+    sessionStorage.setItem('stubQuery', query);
+    list.querySelectorAll('a').forEach(link => link.remove());
+    loaded = 0;
+    done = false;
+    loadMore(pageSize);
+}});
+
+loadMore(Math.max(pageSize, Number(sessionStorage.getItem('stubLoaded') || 0)));
+</script>
+</body>
+</html>
+"""
+
+POSTING_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"></head>
+<body>
+<main>
+{lines}
+</main>
+</body>
+</html>
+"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Sign In</title></head>
+<body><a href="{task_path}">Find Jobs</a></body>
+</html>
+"""
+
+
+def load_recorded_jobs(source):
+    """Job records with full_text from scraper output, or a job store plus its text file"""
+    jobs = load_records(source)['jobs']
+    text_file = os.path.join(os.path.dirname(source), TEXT_FILE)
+    if any(job.full_text is None for job in jobs) and os.path.exists(text_file):
+        for job, text in zip(jobs, load_full_texts(text_file)):
+            if job.full_text is None:
+                job.full_text = text
+    return [job for job in jobs if job.url and job.full_text]
+
+
+class StubWorkday:
+    def __init__(self, jobs, latency=0.05, jitter=0.02, page_size=50, seed=None, expire_after=None):
+        """
+        Local HTTP server that replays recorded postings in Workday's page layout
+
+        The listing has the promptOption rows and the search box, each posting
+        page is its recorded full text under the original URL path, so both
+        scrapers run against it unchanged. Every request waits latency seconds
+        plus or minus up to jitter before it is answered. With expire_after
+        set, postings after that many redirect to the login page, like an
+        expired Workday session.
+        """
+        self.jobs = jobs
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.random = random.Random(seed)
+        self.postings = {urlsplit(job.url).path: job for job in jobs}
+        self.expire_after = expire_after
+        self.requests = 0
+        self.postings_served = 0
+        self.server = None
+        self._lock = threading.Lock()
+    
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/brown"
+    
+    def delay(self):
+        with self._lock:
+            self.requests += 1
+            wait = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if wait > 0:
+            time.sleep(wait)
+    
+    def rows(self, query, offset, limit):
+        query = query.lower()
+        matching = [job for job in self.jobs if not query or query in job.full_text.lower()]
+        return [{'preview': job.preview or job.job_title or '', 'path': urlsplit(job.url).path}
+                for job in matching[offset:offset + limit]]
+    
+    def page(self, path, query):
+        """(status, content type, body) for a request path, body is the Location of a redirect"""
+        if path == TASK_PATH:
+            return 200, 'text/html', LISTING_PAGE.format(page_size=self.page_size, rows_path=ROWS_PATH)
+        if path == ROWS_PATH:
+            params = parse_qs(query)
+            offset = int(params.get('offset', ['0'])[0])
+            limit = int(params.get('limit', [str(self.page_size)])[0])
+            rows = self.rows(params.get('q', [''])[0], offset, limit)
+            return 200, 'application/json', json.dumps({'rows': rows})
+        if path == LOGIN_PATH:
+            return 200, 'text/html', LOGIN_PAGE.format(task_path=TASK_PATH)
+        
+        job = self.postings.get(path)
+        if job is None:
+            return 404, 'text/plain', 'Not found'
+        with self._lock:
+            self.postings_served += 1
+            expired = self.expire_after is not None and self.postings_served > self.expire_after
+        if expired:
+            return 302, 'text/plain', LOGIN_PATH
+        lines = '\n'.join(f"<div>{html.escape(line)}</div>" for line in job.full_text.split('\n'))
+        return 200, 'text/html', POSTING_PAGE.format(lines=lines)
+    
+    def start(self, port=0):
+        """Serve on 127.0.0.1 in a background thread, returns the base URL"""
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                stub.delay()
+                parts = urlsplit(self.path)
+                status, content_type, body = stub.page(parts.path, parts.query)
+                self.send_response(status)
+                if status in (301, 302, 303):
+                    self.send_header('Location', body)
+                    body = ''
+                data = body.encode('utf-8')
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.base_url
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded job postings as a local stub of Workday")
+    parser.add_argument("source", nargs="?", default=STORE_FILE, help="job store or scraper output JSON")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="random +/- seconds on top of the latency")
+    args = parser.parse_args()
+    
+    stub = StubWorkday(load_recorded_jobs(args.source), args.latency, args.jitter)
+    base_url = stub.start(args.port)
+    print(f"Serving {len(stub.jobs)} recorded postings at {base_url}/d/task/1422$7750.htmld (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
@@ -0,0 +1,129 @@
+import time
+from collections import defaultdict, deque
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# Installs a MutationObserver once per page and reports ms since the last DOM change
+DOM_QUIET_SCRIPT = """
+if (!window.__bearhuntObserver) {
+    window.__bearhuntLastMutation = Date.now();
+    window.__bearhuntObserver = new MutationObserver(() => {
+        window.__bearhuntLastMutation = Date.now();
+    });
+    window.__bearhuntObserver.observe(document.documentElement, {
+        childList: true, subtree: true, characterData: true, attributes: true
+    });
+}
+return Date.now() - window.__bearhuntLastMutation;
+"""
+
+# Lowest learned timeout per phase. A Workday navigation can take seconds
+# even after a run of fast ones, so page loads never get a tight timeout.
+PHASE_FLOORS = {'page_load': 5, 'render': 5, 'wait_for_page': 5}
+
+
+class AdaptiveWaiter:
+    def __init__(self, driver, timings=None, min_timeout=0.5, max_timeout=10, poll_frequency=0.05, history=50, metrics=None,
+                 floors=PHASE_FLOORS):
+        """
+        Condition waits whose timeouts are learned from how long each phase usually takes
+
+        Args:
+            driver: Selenium WebDriver to wait on
+            timings: dict that receives the duration of every wait, keyed by phase
+            min_timeout: lower bound for learned timeouts, in seconds
+            max_timeout: upper bound, also used until a phase has enough samples
+            poll_frequency: how often conditions are re-checked, in seconds
+            history: number of recent samples kept per phase
+            metrics: optional ScrapeMetrics that counts timeouts and retries per phase
+            floors: per-phase lower bounds above min_timeout, e.g. for page loads
+        """
+        self.driver = driver
+        self.timings = timings if timings is not None else {}
+        self.min_timeout = min_timeout
+        self.floors = floors
+        self.max_timeout = max_timeout
+        self.poll_frequency = poll_frequency
+        self.latencies = defaultdict(lambda: deque(maxlen=history))
+        self.metrics = metrics
+    
+    def timeout_for(self, phase):
+        """Three times the recent p95 latency of a phase, clamped to the configured range"""
+        samples = self.latencies[phase]
+        if len(samples) < 5:
+            return self.max_timeout
+        
+        ordered = sorted(samples)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        floor = max(self.min_timeout, self.floors.get(phase, 0))
+        return min(self.max_timeout, max(floor, p95 * 3))
+    
+    def _wait(self, condition, timeout):
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+            return True
+        except TimeoutException:
+            return False
+    
+    def until(self, phase, condition, timeout=None):
+        """
+        Wait for condition(driver) to be truthy, returns False on timeout
+
+        A learned timeout that runs out gets one more try at max_timeout,
+        so a single slow page isn't given up on. Only successful waits
+        become latency samples; a timeout says nothing about how long the
+        phase really takes.
+        """
+        learned = timeout is None
+        if learned:
+            timeout = self.timeout_for(phase)
+        
+        start = time.time()
+        ok = self._wait(condition, timeout)
+        if not ok and learned and timeout < self.max_timeout:
+            if self.metrics is not None:
+                self.metrics.count('retries', phase)
+            ok = self._wait(condition, self.max_timeout)
+        elapsed = time.time() - start
+        
+        self.timings[phase] = elapsed
+        if ok:
+            self.latencies[phase].append(elapsed)
+        elif self.metrics is not None:
+            self.metrics.count('timeouts', phase)
+        return ok
+    
+    def url_leaves(self, phase, marker, timeout=None):
+        """Wait until the current URL no longer contains marker"""
+        return self.until(phase, lambda driver: marker not in driver.current_url, timeout)
+    
+    def url_contains(self, phase, marker, timeout=None):
+        """Wait until the current URL contains marker"""
+        return self.until(phase, lambda driver: marker in driver.current_url, timeout)
+    
+    def element_count(self, phase, selector, min_count, timeout=None):
+        """Wait until at least min_count elements match selector"""
+        return self.until(
+            phase,
+            lambda driver: len(driver.find_elements(By.CSS_SELECTOR, selector)) >= min_count,
+            timeout
+        )
+    
+    def text_present(self, phase, text, timeout=None):
+        """Wait until the page body contains text"""
+        return self.until(
+            phase,
+            lambda driver: text in driver.find_element(By.TAG_NAME, "body").text,
+            timeout
+        )
+    
+    def dom_quiet(self, phase, quiet_time=0.3, timeout=None):
+        """Wait until the DOM has gone quiet_time seconds without a mutation"""
+        quiet_ms = quiet_time * 1000
+        return self.until(
+            phase,
+            lambda driver: driver.execute_script(DOM_QUIET_SCRIPT) >= quiet_ms,
+            timeout
+        )
@@ -4,17 +4,94 @@ let userPreferences = {};
 let currentPage = 0;
 let currentStep = 1;
 const jobsPerPage = 10;
+let scoringTables = null;
+let similarJobs = null;
 
-fetch('data/brown_jobs_2025_final.json')
+// Recent rankings by preferences, so going back and resubmitting never rescores
+const rankingCache = new Map();
+const RANKING_CACHE_SIZE = 16;
+
+// Turns the columnar store built by scrapers/job_store.py back into job objects
+function decodeStore(store) {
+    const total = store.metadata.total_jobs;
+    const urlPrefix = store.metadata.url_prefix || '';
+    const decoded = [];
+
+    for (let i = 0; i < total; i++) {
+        decoded.push({});
+    }
+
+    Object.entries(store.columns).forEach(([name, values]) => {
+        const lookup = store.dictionaries[name];
+        values.forEach((value, i) => {
+            if (lookup) value = lookup[value];
+            if (value === null || value === undefined) return;
+            decoded[i][name] = name === 'url' ? urlPrefix + value : value;
+        });
+    });
+
+    return decoded;
+}
+
+fetch('data/jobs_store.json')
     .then(response => response.json())
-    .then(data => {
-        jobs = data.jobs;
+    .then(store => {
+        jobs = decodeStore(store);
     })
     .catch(error => {
         console.error('Error loading jobs:', error);
-        alert('Error loading job data. Please make sure brown_jobs_2025_final.json is available.');
+        alert('Error loading job data. Please make sure jobs_store.json is available.');
     });
 
+// Per-job points for every questionnaire option, exported by scrapers/scoring.py
+fetch('data/scoring_tables.json')
+    .then(response => response.json())
+    .then(tables => {
+        scoringTables = tables;
+    })
+    .catch(error => console.error('Error loading scoring tables:', error));
+
+// Top-k similar jobs per row, precomputed by scrapers/similarity_index.py
+fetch('data/similar_jobs.json')
+    .then(response => response.json())
+    .then(neighbors => {
+        similarJobs = neighbors;
+    })
+    .catch(error => console.warn('Similar jobs unavailable, comparing on the fly:', error));
+
+function postingId(url) {
+    const matches = [...(url || '').matchAll(/\/(\d+\$\d+)\.htmld/g)];
+    return matches.length ? matches[matches.length - 1][1] : null;
+}
+
+function matchesJobs(table) {
+    return table && table.posting_ids.length === jobs.length &&
+        table.posting_ids.every((id, row) => id === postingId(jobs[row].url));
+}
+
+// Sum of one table column of points per component, in table order, the best selected
+// column for interests; adds and divides in the same order as scrapers/scoring.py
+function scoreJobs(preferences) {
+    const scores = new Float64Array(jobs.length);
+
+    Object.entries(scoringTables.components).forEach(([name, component]) => {
+        let chosen = preferences[name];
+        if (!chosen || chosen.length === 0) chosen = [component.default];
+        if (!Array.isArray(chosen)) chosen = [chosen];
+
+        const picked = chosen.map(value => scoringTables.columns[`${name}:${value}`]);
+        for (let row = 0; row < scores.length; row++) {
+            let points = picked[0][row];
+            for (let i = 1; i < picked.length; i++) {
+                points = Math.max(points, picked[i][row]);
+            }
+            scores[row] += points;
+        }
+    });
+
+    return scores.map(score => (score / scoringTables.max_score) * 100);
+}
+
 document.addEventListener('click', function(e) {
     if (e.target.classList.contains('option')) {
         const question = e.target.closest('.options').dataset.question;
@@ -70,177 +147,48 @@ function nextQuestion() {
     }
 }
 
+// Option values from index.html, which are the option names in scoring_tables.json
 function getPreferences() {
     const preferences = {};
-    
+
     const hoursSelected = document.querySelector('[data-question="hours"] .selected');
     if (hoursSelected) {
-        const hoursMap = {
-            'light': [1, 8],
-            'moderate': [9, 15],
-            'heavy': [16, 40],
-            'flexible': [0, 40]
-        };
-        preferences.hoursRange = hoursMap[hoursSelected.dataset.value] || [0, 40];
+        preferences.hours = hoursSelected.dataset.value;
     }
 
     const paySelected = document.querySelector('[data-question="pay"] .selected');
     if (paySelected) {
-        const payMap = {
-            'budget': [15, 16],
-            'fair': [16, 17],
-            'premium': [17, 25],
-            'any': [0, 25]
-        };
-        preferences.payRange = payMap[paySelected.dataset.value] || [0, 25];
+        preferences.pay = paySelected.dataset.value;
     }
 
     const workTypeSelected = document.querySelector('[data-question="workType"] .selected');
     if (workTypeSelected) {
-        preferences.jobType = workTypeSelected.dataset.value;
+        preferences.type = workTypeSelected.dataset.value;
     }
 
-    const interestsSelected = document.querySelectorAll('[data-question="interests"] .selected');
-    preferences.departmentKeywords = [];
-    
-    const interestKeywords = {
-        'biology': ['biology', 'life sciences', 'neuroscience'],
-        'chemistry': ['chemistry', 'chemical'],
-        'physics': ['physics', 'astronomy'],
-        'computer': ['computer science', 'computational'],
-        'engineering': ['engineering', 'applied'],
-        'math': ['mathematics', 'statistics'],
-        'earth': ['earth', 'environmental', 'planetary'],
-        'medicine': ['medicine', 'health', 'medical'],
-        'psychology': ['psychology', 'cognitive'],
-        'history': ['history', 'historical'],
-        'english': ['english', 'literature', 'writing'],
-        'philosophy': ['philosophy', 'religious'],
-        'sociology': ['sociology', 'anthropology'],
-        'political': ['political science', 'international'],
-        'economics': ['economics', 'business'],
-        'art': ['art', 'visual arts', 'studio'],
-        'music': ['music', 'theatre', 'performing'],
-        'education': ['education', 'teaching'],
-        'health': ['public health', 'community'],
-        'library': ['library', 'information'],
-        'athletics': ['athletics', 'sports', 'recreation'],
-        'administration': ['administration', 'student services'],
-        'research': ['research', 'institute', 'center']
-    };
-
-    interestsSelected.forEach(option => {
+    preferences.department = [];
+    document.querySelectorAll('[data-question="interests"] .selected').forEach(option => {
         if (option.dataset.value !== 'open') {
-            const keywords = interestKeywords[option.dataset.value] || [];
-            preferences.departmentKeywords.push(...keywords);
+            preferences.department.push(option.dataset.value);
         }
     });
 
-
     return preferences;
 }
 
-function calculateJobScore(job, preferences) {
-    let score = 0;
-    let maxScore = 0;
-
-    const hoursWeight = 30;
-    maxScore += hoursWeight;
-    try {
-        const jobHours = parseInt(job.scheduled_weekly_hours || '0');
-        const [prefMin, prefMax] = preferences.hoursRange || [0, 40];
-        if (prefMin <= jobHours && jobHours <= prefMax) {
-            score += hoursWeight;
-        } else if (jobHours < prefMin) {
-            const penalty = Math.min(hoursWeight, (prefMin - jobHours) * 3);
-            score += Math.max(0, hoursWeight - penalty);
-        } else {
-            const penalty = Math.min(hoursWeight, (jobHours - prefMax) * 2);
-            score += Math.max(0, hoursWeight - penalty);
-        }
-    } catch {
-        score += hoursWeight * 0.5;
-    }
-
-    const payWeight = 25;
-    maxScore += payWeight;
-    const hourlyRange = job.hourly_range || '$0 - $0';
-    const match = hourlyRange.match(/\$(\d+(?:\.\d+)?)/);
-    if (match) {
-        const jobMinPay = parseFloat(match[1]);
-        const [prefMinPay, prefMaxPay] = preferences.payRange || [0, 25];
-        if (prefMinPay <= jobMinPay && jobMinPay <= prefMaxPay) {
-            score += payWeight;
-        } else {
-            const distance = Math.min(Math.abs(jobMinPay - prefMinPay), Math.abs(jobMinPay - prefMaxPay));
-            score += Math.max(0, payWeight - (distance * 5));
-        }
-    } else {
-        score += payWeight * 0.5;
-    }
-
-    const typeWeight = 35;
-    maxScore += typeWeight;
-    const jobTitle = (job.job_title || '').toLowerCase();
-    const jobDesc = (job.job_description || '').toLowerCase();
-    const prefType = preferences.jobType;
-
-    if (prefType === 'any') {
-        score += typeWeight * 0.7;
-    } else {
-        const typeKeywords = {
-            'research': ['research', 'ra ', 'lab', 'experiment', 'data', 'analysis'],
-            'teaching': ['teaching', 'tutor', 'ta ', 'grader', 'mentor', 'peer'],
-            'administrative': ['admin', 'assistant', 'coordinator', 'clerk', 'office'],
-            'technical': ['tech', 'it', 'computer', 'web', 'software', 'digital'],
-            'creative': ['library', 'writing', 'media', 'creative', 'design', 'art']
-        };
-
-        const keywords = typeKeywords[prefType] || [];
-        const matches = keywords.filter(keyword => jobTitle.includes(keyword) || jobDesc.includes(keyword)).length;
-        if (matches > 0) {
-            score += typeWeight * Math.min(1.0, matches * 0.4);
-        } else {
-            score += typeWeight * 0.2;
-        }
-    }
-
-    const deptWeight = 10;
-    maxScore += deptWeight;
-    const jobDept = (job.department || '').toLowerCase();
-    const deptKeywords = preferences.departmentKeywords || [];
-
-    if (deptKeywords.length === 0) {
-        score += deptWeight * 0.7;
-    } else {
-        const matches = deptKeywords.filter(keyword => jobDept.includes(keyword)).length;
-        if (matches > 0) {
-            score += deptWeight;
-        } else {
-            score += deptWeight * 0.3;
-        }
-    }
-
-
-    return maxScore > 0 ? (score / maxScore) * 100 : 0;
-}
-
 function findJobs() {
     userPreferences = getPreferences();
     
-    if (jobs.length === 0) {
+    if (jobs.length === 0 || !scoringTables) {
         alert('Job data is still loading. Please try again in a moment.');
         return;
     }
+    if (!matchesJobs(scoringTables)) {
+        alert('Scoring tables are out of date. Rebuild them with scrapers/scoring.py.');
+        return;
+    }
 
-    const scoredJobs = jobs.map(job => ({
-        job: job,
-        score: calculateJobScore(job, userPreferences)
-    }));
-
-    scoredJobs.sort((a, b) => b.score - a.score);
-    
-    currentRecommendations = scoredJobs;
+    currentRecommendations = rankJobs(userPreferences);
     currentPage = 0;
     
     document.getElementById('questionnaire').classList.add('hidden');
@@ -249,6 +197,29 @@ function findJobs() {
     displayJobs();
 }
 
+function rankJobs(preferences) {
+    const key = JSON.stringify(preferences);
+    let ranked = rankingCache.get(key);
+
+    if (ranked) {
+        rankingCache.delete(key);
+    } else {
+        const scores = scoreJobs(preferences);
+        ranked = jobs.map((job, row) => ({
+            job: job,
+            row: row,
+            score: scores[row]
+        }));
+        ranked.sort((a, b) => b.score - a.score);
+    }
+
+    rankingCache.set(key, ranked);
+    if (rankingCache.size > RANKING_CACHE_SIZE) {
+        rankingCache.delete(rankingCache.keys().next().value);
+    }
+    return ranked;
+}
+
 function displayJobs() {
     const startIndex = currentPage * jobsPerPage;
     const endIndex = startIndex + jobsPerPage;
@@ -281,7 +252,7 @@ function displayJobs() {
             <div>
                 <a href="${job.url || '#'}" target="_blank">View Job Posting</a>
             </div>
-            <button class="similar-btn" onclick="findSimilarJobs(${job.index})">Find Similar Jobs</button>
+            <button class="similar-btn" onclick="findSimilarJobs(${rec.row})">Find Similar Jobs</button>
         `;
         jobList.appendChild(jobCard);
     });
@@ -292,32 +263,60 @@ function showMore() {
     displayJobs();
 }
 
-function findSimilarJobs(jobIndex) {
-    const selectedJob = jobs.find(job => job.index === jobIndex);
-    if (!selectedJob) return;
+// Typed hours from scrapers/job_extractor.py; older stores only have the display string,
+// parsed the way its numeric_fields does
+function weeklyHours(job) {
+    if (typeof job.weekly_hours === 'number') return job.weekly_hours;
+    const value = (job.scheduled_weekly_hours || '').trim();
+    return /^\d+(\.\d+)?$/.test(value) ? parseFloat(value) : NaN;
+}
+
+// Same scoring as SimilarJobsIndex in scrapers/similarity_index.py, for when similar_jobs.json is stale
+function compareSimilarJobs(row, count) {
+    const selectedJob = jobs[row];
+    const selectedWords = new Set((selectedJob.job_title || '').toLowerCase().split(/\s+/).filter(Boolean));
+    const selectedHours = weeklyHours(selectedJob);
+
+    const candidates = [];
+    jobs.forEach((job, other) => {
+        if (other === row) return;
 
-    const similarJobs = jobs.filter(job => {
-        if (job.index === jobIndex) return false;
-        
         let similarity = 0;
-        
         if (job.department === selectedJob.department) {
             similarity += 40;
         }
-        
-        const selectedWords = new Set((selectedJob.job_title || '').toLowerCase().split(' '));
-        const jobWords = new Set((job.job_title || '').toLowerCase().split(' '));
-        const commonWords = [...selectedWords].filter(word => jobWords.has(word));
-        similarity += commonWords.length * 10;
-        
-        return similarity > 20;
-    }).slice(0, 5);
 
-    if (similarJobs.length > 0) {
+        const jobWords = new Set((job.job_title || '').toLowerCase().split(/\s+/).filter(Boolean));
+        similarity += [...selectedWords].filter(word => jobWords.has(word)).length * 10;
+
+        const jobHours = weeklyHours(job);
+        if (!isNaN(selectedHours) && !isNaN(jobHours)) {
+            const diff = Math.abs(jobHours - selectedHours);
+            if (diff <= 2) similarity += 20;
+            else if (diff <= 5) similarity += 10;
+        }
+
+        if (similarity > 20) candidates.push({ row: other, similarity: similarity });
+    });
+
+    candidates.sort((a, b) => b.similarity - a.similarity);
+    return candidates.slice(0, count).map(candidate => candidate.row);
+}
+
+function findSimilarJobs(row) {
+    const selectedJob = jobs[row];
+    if (!selectedJob) return;
+
+    const rows = matchesJobs(similarJobs) && similarJobs.k >= 5
+        ? similarJobs.neighbors[row].slice(0, 5)
+        : compareSimilarJobs(row, 5);
+    const similarJobsFound = rows.map(other => jobs[other]);
+
+    if (similarJobsFound.length > 0) {
         const similarSection = document.createElement('div');
         similarSection.innerHTML = `
             <h3>Jobs similar to: ${selectedJob.job_title}</h3>
-            ${similarJobs.map(job => `
+            ${similarJobsFound.map(job => `
                 <div style="margin: 1rem 0; padding: 1rem; background: #f9f9f9; border-radius: 4px;">
                     <strong>${job.job_title}</strong><br>
                     ${job.department}<br>
@@ -328,7 +327,7 @@ function findSimilarJobs(jobIndex) {
         
         const allCards = document.querySelectorAll('.job-card');
         const targetCard = Array.from(allCards).find(card => 
-            card.innerHTML.includes(`onclick="findSimilarJobs(${jobIndex})`)
+            card.innerHTML.includes(`onclick="findSimilarJobs(${row})`)
         );
         if (targetCard) {
             targetCard.insertAdjacentElement('afterend', similarSection);
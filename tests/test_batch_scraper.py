@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from final_scraper import HARVEST_SCRIPT, ROW_SCRIPT, BatchWorkdayScraper
+from scrape_metrics import ScrapeMetrics
+
+TASK_URL = 'https://example.test/d/task/1422$7750.htmld'
+
+
+class FakeRow:
+    def __init__(self, listing, url):
+        self.listing = listing
+        self.url = url
+
+    def click(self):
+        self.listing.clicks += 1
+        self.listing.current_url = self.url
+
+
+class FakeListing:
+    """A browser on a Workday listing of postings, one of which closes before the next reload"""
+    def __init__(self, size, close, close_after, links=True):
+        self.postings = [f'https://example.test/d/inst/1$1/9925${n}.htmld' for n in range(size)]
+        self.close = close
+        self.close_after = close_after
+        self.links = links
+        self.clicks = 0
+        self.current_url = TASK_URL
+
+    def get(self, url):
+        if url == TASK_URL and self.clicks >= self.close_after and self.close in self.postings:
+            self.postings.remove(self.close)
+        self.current_url = url
+
+    def back(self):
+        self.current_url = TASK_URL
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        return ''
+
+    def execute_async_script(self, script, *args):
+        if script == HARVEST_SCRIPT:
+            target = args[1]
+            return [{'key': f'pos:{i}', 'position': i, 'preview': f'Posting {url[-8:]}',
+                     'url': url if self.links else None}
+                    for i, url in enumerate(self.postings[:target])]
+        if script == ROW_SCRIPT:
+            position = int(args[1].split(':')[1])
+            if position >= len(self.postings):
+                return None
+            return [FakeRow(self, self.postings[position]), 'Posting']
+        raise AssertionError('unexpected script')
+
+    def find_element(self, by, value):
+        listing = self
+
+        class Main:
+            text = f"MENU\n1 Result\nPosting\nJob Posting Title:\n{listing.current_url}\n"
+        return Main()
+
+
+class FakeWaiter:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: True
+
+
+def scraper_on(listing):
+    scraper = BatchWorkdayScraper.__new__(BatchWorkdayScraper)
+    scraper.jobs_data = []
+    scraper.removed_jobs = []
+    scraper.journal = None
+    scraper.extract_workers = 2
+    scraper.queue_size = 4
+    scraper.pipeline = None
+    scraper.listing_size = None
+    scraper.listing_rows = []
+    scraper.row_indices = {}
+    scraper.failed = {}
+    scraper._processed = set()
+    scraper._indices = {}
+    scraper._record_lock = threading.Lock()
+    scraper.task_url = TASK_URL
+    scraper.driver = listing
+    scraper.waiter = FakeWaiter()
+    scraper.timings = {}
+    scraper.metrics = ScrapeMetrics()
+    return scraper
+
+
+@pytest.mark.parametrize('links', [True, False])
+def test_listing_that_shrinks_mid_run(links):
+    listing = FakeListing(100, close='https://example.test/d/inst/1$1/9925$10.htmld', close_after=50, links=links)
+    original = list(listing.postings)
+    scraper = scraper_on(listing)
+
+    scraper.scrape_all_in_batches(100, search_term=None)
+
+    indices = [job.index for job in scraper.jobs_data]
+    assert len(indices) == len(set(indices))
+    assert sorted(job.url for job in scraper.jobs_data) == sorted(original)
+    assert not scraper.failed
+    if links:
+        # Every posting keeps its position from the first harvest, and none is opened twice
+        assert all(original[job.index - 1] == job.url for job in scraper.jobs_data)
+        assert listing.clicks == 100
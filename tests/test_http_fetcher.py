@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from http_fetcher import HttpJobFetcher, SessionExpired
+from workday_stub import StubWorkday, load_recorded_jobs
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'brown_jobs_2025_final.json')
+
+
+@pytest.fixture(scope='module')
+def recorded_jobs():
+    return load_recorded_jobs(DATA_FILE)[:40]
+
+
+def serve(jobs, **kwargs):
+    stub = StubWorkday(jobs, latency=0, jitter=0, **kwargs)
+    base_url = stub.start()
+    links = [{'index': i + 1, 'preview': job.preview or '', 'url': base_url + job.url.split('/brown', 1)[1]}
+             for i, job in enumerate(jobs)]
+    return stub, links
+
+
+def test_fetch_all_matches_recorded_postings(recorded_jobs):
+    stub, links = serve(recorded_jobs)
+    fetcher = HttpJobFetcher([{'name': 'session', 'value': 'stub'}], max_workers=4)
+    try:
+        jobs = list(fetcher.fetch_all(links))
+    finally:
+        fetcher.close()
+        stub.stop()
+    
+    assert sorted(job['index'] for job in jobs) == list(range(1, len(links) + 1))
+    for job in jobs:
+        recorded = recorded_jobs[job['index'] - 1]
+        assert job['job_title'] == recorded.job_title
+        assert job['url'] == links[job['index'] - 1]['url']
+
+
+def test_fetch_all_keeps_postings_fetched_before_the_session_expires(recorded_jobs):
+    stub, links = serve(recorded_jobs, expire_after=10)
+    fetcher = HttpJobFetcher([{'name': 'session', 'value': 'stub'}], max_workers=2)
+    jobs = []
+    try:
+        with pytest.raises(SessionExpired):
+            for job in fetcher.fetch_all(links):
+                jobs.append(job)
+    finally:
+        fetcher.close()
+        stub.stop()
+    
+    assert len(jobs) == 10
+    assert all(job['job_title'] == recorded_jobs[job['index'] - 1].job_title for job in jobs)
+    # Nothing new is submitted after the redirect to the login page
+    assert stub.postings_served < len(links)
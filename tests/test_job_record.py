@@ -0,0 +1,16 @@
+from job_record import Job
+
+
+def test_untyped_records_read_hours_and_pay_like_the_display_strings_always_were():
+    job = Job.from_dict({'scheduled_weekly_hours': '37.5', 'hourly_range': '$15.00 - $16.50'})
+    assert job.weekly_hours is None
+    assert job.pay_min == 15.0
+    
+    assert Job.from_dict({'scheduled_weekly_hours': '10'}).weekly_hours == 10
+    assert Job.from_dict({}).weekly_hours == 0
+
+
+def test_typed_records_keep_fractional_hours():
+    job = Job.from_dict({'scheduled_weekly_hours': '37.5', 'weekly_hours': 37.5, 'pay_min': 15.0})
+    assert job.weekly_hours == 37.5
+    assert Job.from_dict(job.to_dict()).weekly_hours == 37.5
@@ -0,0 +1,49 @@
+import json
+import os
+
+import pytest
+
+from posting_history import PostingHistory
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'brown_jobs_2025_final.json')
+
+
+@pytest.fixture(scope='module')
+def scrapes():
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        jobs = json.load(f)['jobs']
+    older = {'metadata': {'scrape_date': '2025-09-01T08:00:00'}, 'jobs': jobs}
+    newer = {'metadata': {'scrape_date': '2025-09-08T08:00:00'}, 'jobs': jobs[12:]}
+    return older, newer
+
+
+def closed_postings(history):
+    return history.conn.execute("SELECT count(*) FROM postings WHERE closed_at IS NOT NULL").fetchone()[0]
+
+
+def test_ingesting_an_older_scrape_again_keeps_postings_closed(tmp_path, scrapes):
+    older, newer = scrapes
+    history = PostingHistory(str(tmp_path / 'history.db'))
+    try:
+        history.ingest(older)
+        _, _, closed = history.ingest(newer)
+        assert closed > 0
+        
+        history.ingest(older)
+        assert closed_postings(history) == closed
+        assert sum(count for _, count, _, _ in history.time_to_close()) == closed
+    finally:
+        history.close()
+
+
+def test_a_later_scrape_reopens_a_closed_posting(tmp_path, scrapes):
+    older, newer = scrapes
+    history = PostingHistory(str(tmp_path / 'history.db'))
+    try:
+        history.ingest(older)
+        history.ingest(newer)
+        history.ingest(dict(older, metadata={'scrape_date': '2025-09-15T08:00:00'}))
+        assert closed_postings(history) == 0
+    finally:
+        history.close()
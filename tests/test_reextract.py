@@ -0,0 +1,20 @@
+from reextract import reextract
+
+FULL_TEXT = "MENU\n312 Results\nLab Assistant\nJob Posting Title:\nLab Assistant\nScheduled Weekly Hours:\n10\n"
+
+
+def test_fields_the_extractor_no_longer_finds_are_dropped():
+    job = {'index': 1, 'url': '/job/1', 'full_text': FULL_TEXT, 'job_title': 'Old title',
+           'grade': 'Stale grade', 'pay_min': 15, 'hourly_range': '$15 - $17'}
+    
+    upgraded, = reextract([job], workers=1)
+    
+    assert upgraded['job_title'] == 'Lab Assistant'
+    assert upgraded['weekly_hours'] == 10
+    assert 'grade' not in upgraded and 'pay_min' not in upgraded and 'hourly_range' not in upgraded
+    assert upgraded['url'] == '/job/1' and job['grade'] == 'Stale grade'
+
+
+def test_jobs_without_text_are_kept_as_they_are():
+    job = {'index': 2, 'job_title': 'Kept', 'grade': 'A'}
+    assert reextract([job], workers=1) == [job]
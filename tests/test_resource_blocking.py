@@ -0,0 +1,19 @@
+import pytest
+
+from resource_blocking import BLOCK_PATTERNS, blocked_patterns
+
+
+def test_allow_wildcard_keeps_every_matching_pattern():
+    patterns = blocked_patterns(allow=('*.svg*',))
+    assert '*.svg' not in patterns and '*.svg?*' not in patterns
+    assert '*.png' in patterns
+
+
+def test_allow_category_keeps_it_loading():
+    assert not set(BLOCK_PATTERNS['fonts']) & set(blocked_patterns(allow=('fonts',)))
+
+
+@pytest.mark.parametrize('entry', ['font', '*.tiff'])
+def test_allow_entry_matching_nothing_is_an_error(entry):
+    with pytest.raises(ValueError):
+        blocked_patterns(allow=(entry,))
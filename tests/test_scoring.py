@@ -0,0 +1,86 @@
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from job_store import load_jobs
+from keyword_index import INDEX_FILE, KeywordIndex
+from scoring import (
+    EXPERIENCE_OPTIONS, HOURS_OPTIONS, INDEX_KEYWORDS, INTEREST_OPTIONS, PAY_OPTIONS, TABLES_FILE, TYPE_OPTIONS,
+    JobFeatures, build_tables, preference_combinations, score_job, score_jobs
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, 'data')
+
+# Runs script.js's own scoreJobs in node over a list of web choices, printing a digest of each score array
+PARITY_HARNESS = """
+const fs = require('fs'), vm = require('vm'), crypto = require('crypto');
+const [scriptPath, tablesPath, choicesPath] = process.argv.slice(2);
+const context = {fetch: () => new Promise(() => {}), document: {addEventListener() {}}, console: console};
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(scriptPath, 'utf8') +
+    '\\n;globalThis.parity = {scoreJobs, load(size, tables) { jobs = new Array(size).fill({}); scoringTables = tables; }};',
+    context);
+const tables = JSON.parse(fs.readFileSync(tablesPath, 'utf8'));
+context.parity.load(tables.posting_ids.length, tables);
+const digests = JSON.parse(fs.readFileSync(choicesPath, 'utf8')).map(choices => {
+    const scores = context.parity.scoreJobs(choices);
+    return crypto.createHash('sha1').update(Buffer.from(scores.buffer)).digest('hex');
+});
+process.stdout.write(JSON.stringify(digests));
+"""
+
+
+@pytest.fixture(scope='module')
+def jobs():
+    return load_jobs(os.path.join(DATA_DIR, 'jobs_store.json'))['jobs']
+
+
+@pytest.fixture(scope='module')
+def features(jobs):
+    return JobFeatures(jobs, KeywordIndex.for_jobs(jobs, INDEX_KEYWORDS, os.path.join(DATA_DIR, INDEX_FILE)))
+
+
+def test_single_job_scores_match_the_vectorized_scorer(jobs, features):
+    interests = [[]] + [option[3] for option in INTEREST_OPTIONS if option[0] != 'x']
+    for hours, pay, job_type, experience, keywords in itertools.product(
+            HOURS_OPTIONS, PAY_OPTIONS, TYPE_OPTIONS, EXPERIENCE_OPTIONS, interests[::4]):
+        preferences = {
+            'hours_range': hours[3], 'pay_range': pay[3], 'job_type': job_type[3],
+            'department_keywords': keywords, 'experience_level': experience[3]
+        }
+        expected = score_jobs(features, preferences)
+        assert np.array_equal(expected, [score_job(job, preferences) for job in jobs])
+
+
+def test_bundled_tables_are_current(features):
+    with open(os.path.join(DATA_DIR, TABLES_FILE), 'r', encoding='utf-8') as f:
+        assert json.load(f) == json.loads(json.dumps(build_tables(features)))
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs node to run script.js")
+def test_script_js_scores_every_answer_like_the_cli(features, tmp_path):
+    combinations = list(preference_combinations())
+    harness = tmp_path / 'parity.js'
+    harness.write_text(PARITY_HARNESS)
+    choices_path = tmp_path / 'choices.json'
+    choices_path.write_text(json.dumps([choices for _, choices in combinations]))
+    
+    output = subprocess.run(
+        ['node', str(harness), os.path.join(ROOT, 'script.js'), os.path.join(DATA_DIR, TABLES_FILE),
+         str(choices_path)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    got = json.loads(output)
+    
+    expected = [hashlib.sha1(score_jobs(features, preferences).tobytes()).hexdigest()
+                for preferences, _ in combinations]
+    mismatches = [choices for (_, choices), a, b in zip(combinations, expected, got) if a != b]
+    assert len(got) == len(combinations)
+    assert mismatches == []
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from scrape_journal import ScrapeJournal
+
+
+def write_journal(path, *jobs, tail=b''):
+    journal = ScrapeJournal(str(path)).open()
+    for job in jobs:
+        journal.append(job)
+    journal.close()
+    with open(path, 'ab') as f:
+        f.write(tail)
+
+
+def test_resume_truncates_a_torn_tail_and_appends(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    write_journal(path, {'index': 1}, {'index': 2}, tail=b'{"index": 3, "job_ti')
+    
+    journal = ScrapeJournal(str(path))
+    assert journal.replay() == [{'index': 1}, {'index': 2}]
+    journal.open(resume=True)
+    journal.append({'index': 3})
+    journal.close()
+    
+    assert journal.replay() == [{'index': 1}, {'index': 2}, {'index': 3}]
+
+
+def test_replay_skips_a_bad_line_in_the_middle(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    write_journal(path, {'index': 1}, tail=b'not json\n{"index": 2}\n')
+    
+    assert ScrapeJournal(str(path)).replay() == [{'index': 1}, {'index': 2}]
+
+
+def test_open_refuses_to_overwrite_an_interrupted_run(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    write_journal(path, {'index': 1})
+    
+    with pytest.raises(FileExistsError):
+        ScrapeJournal(str(path)).open()
+    assert ScrapeJournal(str(path)).replay() == [{'index': 1}]
+
+
+def test_fresh_sets_the_old_journal_aside(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    write_journal(path, {'index': 1})
+    
+    journal = ScrapeJournal(str(path)).open(fresh=True)
+    journal.close()
+    
+    assert journal.replay() == []
+    rotated = [name for name in os.listdir(tmp_path) if name != 'journal.jsonl']
+    assert len(rotated) == 1
+    assert ScrapeJournal(str(tmp_path / rotated[0])).replay() == [{'index': 1}]
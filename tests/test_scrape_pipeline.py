@@ -0,0 +1,27 @@
+import threading
+
+from scrape_pipeline import ScrapePipeline
+
+
+def test_failed_pages_are_handed_back():
+    stored = []
+    lock = threading.Lock()
+
+    def handle(page):
+        if page['index'] % 3 == 0:
+            raise ValueError('no title')
+        with lock:
+            stored.append(page['index'])
+
+    pipeline = ScrapePipeline(handle, workers=4, max_pending=2)
+    for index in range(1, 31):
+        pipeline.submit({'index': index, 'url': f'/job/{index}'})
+    pipeline.flush()
+
+    failed = pipeline.take_failed()
+    assert sorted(page['index'] for page in failed) == list(range(3, 31, 3))
+    assert pipeline.errors == 10
+    assert pipeline.take_failed() == []
+
+    pipeline.close()
+    assert sorted(stored) == [index for index in range(1, 31) if index % 3]